@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from script._util import get_project_root
+from src.Typhon.Grammar.parser import parse_file
+from src.Typhon.Transform.visitor import TyphonASTTransformer, TyphonASTVisitor
+from .parse_large_file import generate_large_typhon_source
+
+_ANNOTATION_PREFIX = "_typh_"
+
+
+def _measure_memory(module: ast.Module) -> dict[str, int]:
+    # Fields and Typhon annotations are both in the __dict__ of the node.
+    nodes = 0
+    annotated_nodes = 0
+    annotations = 0
+    dict_bytes = 0
+    for node in ast.walk(module):
+        nodes += 1
+        count = sum(1 for key in vars(node) if key.startswith(_ANNOTATION_PREFIX))
+        if count:
+            annotated_nodes += 1
+            annotations += count
+        dict_bytes += sys.getsizeof(vars(node))
+    return {
+        "nodes": nodes,
+        "annotated_nodes": annotated_nodes,
+        "annotations": annotations,
+        "dict_bytes": dict_bytes,
+    }
+
+
+def _measure_visit_ms(module: ast.Module, iterations: int) -> dict[str, float]:
+    # No-op visitors. Only the dispatch including the Typhon extended nodes.
+    visit_ms: list[float] = []
+    transform_ms: list[float] = []
+    for _ in range(iterations):
+        begin = perf_counter()
+        TyphonASTVisitor(module).run()
+        visit_ms.append((perf_counter() - begin) * 1000)
+        begin = perf_counter()
+        TyphonASTTransformer(module).run()
+        transform_ms.append((perf_counter() - begin) * 1000)
+    return {"visit_ms": min(visit_ms), "transform_ms": min(transform_ms)}
+
+
+def run_benchmark(line_counts: list[int], iterations: int, output_dir: Path) -> int:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(
+        f"{'lines':>8} {'nodes':>9} {'annotated':>10} {'annotations':>12} "
+        f"{'dict(KiB)':>10} {'visit(ms)':>10} {'transform(ms)':>14}"
+    )
+    for line_count in line_counts:
+        source_file = output_dir / f"generated_{line_count}_lines.typh"
+        source_file.write_text(
+            generate_large_typhon_source(line_count), encoding="utf-8"
+        )
+        module = parse_file(source_file.as_posix())
+        memory = _measure_memory(module)
+        times = _measure_visit_ms(module, iterations)
+        print(
+            f"{line_count:>8} {memory['nodes']:>9} {memory['annotated_nodes']:>10} "
+            f"{memory['annotations']:>12} {memory['dict_bytes'] / 1024:>10.1f} "
+            f"{times['visit_ms']:>10.2f} {times['transform_ms']:>14.2f}",
+            flush=True,
+        )
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure the memory of Typhon annotations on the parsed nodes and the "
+            "visit time of the Typhon visitors on generated Typhon sources."
+        )
+    )
+    parser.add_argument(
+        "--lines",
+        type=int,
+        nargs="+",
+        default=[2_000, 10_000],
+        help="Line counts of the generated Typhon sources.",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Number of measured visits. The best is reported.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(get_project_root()) / "temp" / "benchmark",
+        help="Directory to place generated benchmark inputs.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if any(lines <= 0 for lines in args.lines) or args.iterations <= 0:
+        print("--lines and --iterations must be > 0")
+        return 2
+    return run_benchmark(args.lines, args.iterations, args.output_dir)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
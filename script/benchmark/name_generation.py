@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import ast
+from time import perf_counter
+
+from src.Typhon.Transform.name_generator import NameKind, UniqueNameGenerator
+
+
+def _generate_module(function_count: int) -> ast.Module:
+    return ast.parse(
+        "\n".join(
+            f"def bench_func_{idx}(x, seed):\n    pass" for idx in range(function_count)
+        )
+    )
+
+
+def _generate_names(module: ast.Module, names_per_function: int) -> int:
+    # Function literals, control comprehensions and renamed lets in each function.
+    generator = UniqueNameGenerator(module)
+    count = 0
+    with generator.name_scope(module):
+        for func in module.body:
+            assert isinstance(func, ast.FunctionDef)
+            with generator.name_scope(func):
+                for idx in range(names_per_function):
+                    kind = idx % 3
+                    if kind == 0:
+                        generator.new_name_anonymous(NameKind.FUNCTION_LITERAL)
+                    elif kind == 1:
+                        generator.new_name_anonymous(NameKind.CONTROL_COMPREHENSION)
+                    else:
+                        generator.new_name_decl(
+                            NameKind.CONST,
+                            original_name=f"value_{idx % 7}",
+                        )
+                    count += 1
+    return count
+
+
+def run_benchmark(function_count: int, names_per_function: int, iterations: int) -> int:
+    rates: list[float] = []
+    for idx in range(iterations):
+        # Fresh module, since the generator keeps its counters in the module.
+        module = _generate_module(function_count)
+        begin = perf_counter()
+        count = _generate_names(module, names_per_function)
+        elapsed = perf_counter() - begin
+        rates.append(count / elapsed)
+        print(f"Run {idx + 1}/{iterations}: {count} names in {elapsed * 1000:.2f} ms")
+    print(f"names/sec: best={max(rates):,.0f} worst={min(rates):,.0f}")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Count mangled names generated per second."
+    )
+    parser.add_argument(
+        "--functions",
+        type=int,
+        default=1_000,
+        help="Number of function scopes to generate names in.",
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=30,
+        help="Number of names generated per function scope.",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Number of measured benchmark iterations.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.functions <= 0 or args.names <= 0 or args.iterations <= 0:
+        print("--functions, --names and --iterations must be > 0")
+        return 2
+    return run_benchmark(args.functions, args.names, args.iterations)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,6 +10,7 @@ import ast
 
 from script._util import get_project_root
 from src.Typhon.Grammar.parser import parse_file
+from src.Typhon.Grammar.rule_profile import RuleProfiler
 from src.Typhon.Grammar.unparse_custom import unparse_custom
 from src.Typhon.SourceMap.ast_match_based_map import map_from_translated
 from src.Typhon.Transform.transform import transform
@@ -32,8 +33,10 @@ def _prepare_source(
     return source_file, source_text
 
 
-def _run_parse(source_file: Path):
-    return parse_file(source_file.as_posix(), verbose=False)
+def _run_parse(source_file: Path, rule_profiler: RuleProfiler | None = None):
+    return parse_file(
+        source_file.as_posix(), verbose=False, rule_profiler=rule_profiler
+    )
 
 
 def _run_transform(module: ast.Module) -> None:
@@ -131,6 +134,22 @@ def parse_args() -> argparse.Namespace:
         default=50,
         help="Number of functions to display.",
     )
+    parser.add_argument(
+        "--rules",
+        action="store_true",
+        help="Profile per grammar rule instead of per function. Only parse phase.",
+    )
+    parser.add_argument(
+        "--rule-sort",
+        choices=["calls", "memo_hits", "backtracks", "cumulative_sec", "self_sec"],
+        default="self_sec",
+        help="Sort key for the grammar rule report.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the grammar rule report as JSON.",
+    )
     parser.add_argument(
         "--warmup",
         type=int,
@@ -166,6 +185,16 @@ def main() -> int:
     for _ in range(args.warmup):
         _run_phase(args.phase, source_file, source_text)
 
+    if args.rules:
+        rule_profiler = RuleProfiler()
+        _run_parse(source_file, rule_profiler)
+        if args.json:
+            print(rule_profiler.to_json(args.rule_sort))
+        else:
+            print(f"\n=== Grammar rules (sort by {args.rule_sort}) ===")
+            print(rule_profiler.format_report(args.rule_sort, args.limit))
+        return 0
+
     profile = cProfile.Profile()
     profile.enable()
     _run_phase(args.phase, source_file, source_text)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from script._util import get_project_root
+from .parse_large_file import generate_large_typhon_source
+
+
+def _max_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def _run_child(source_file: Path, streaming: bool) -> int:
+    # Imported here to exclude the generated source from the measurement.
+    from src.Typhon.Grammar.parser import parse_file
+
+    before = _max_rss_mib()
+    begin = perf_counter()
+    module = parse_file(source_file.as_posix(), streaming=streaming)
+    elapsed = perf_counter() - begin
+    print(
+        json.dumps(
+            {
+                "statements": len(module.body),
+                "parse_sec": elapsed,
+                "rss_before_mib": before,
+                "peak_rss_mib": _max_rss_mib(),
+            }
+        )
+    )
+    return 0
+
+
+def _measure(source_file: Path, streaming: bool) -> dict[str, float]:
+    # Separate process per measurement, since peak RSS never goes down.
+    args = [
+        sys.executable,
+        "-m",
+        "script.benchmark.streaming_parse",
+        "--child-file",
+        source_file.as_posix(),
+    ]
+    if streaming:
+        args.append("--streaming")
+    output = subprocess.run(
+        args, check=True, capture_output=True, text=True, cwd=get_project_root()
+    )
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def run_benchmark(line_counts: list[int], output_dir: Path) -> int:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(
+        f"{'lines':>8} {'mode':>9} {'parse(s)':>9} {'peak RSS(MiB)':>14} "
+        f"{'growth(MiB)':>12}"
+    )
+    for line_count in line_counts:
+        source_file = output_dir / f"generated_{line_count}_lines.typh"
+        source_file.write_text(
+            generate_large_typhon_source(line_count), encoding="utf-8"
+        )
+        for streaming in (False, True):
+            result = _measure(source_file, streaming)
+            growth = result["peak_rss_mib"] - result["rss_before_mib"]
+            print(
+                f"{line_count:>8} {'streaming' if streaming else 'normal':>9} "
+                f"{result['parse_sec']:>9.2f} {result['peak_rss_mib']:>14.1f} "
+                f"{growth:>12.1f}",
+                flush=True,
+            )
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare peak RSS of normal and streaming parse on generated Typhon sources."
+        )
+    )
+    parser.add_argument(
+        "--lines",
+        type=int,
+        nargs="+",
+        default=[10_000, 30_000, 100_000],
+        help="Line counts of the generated Typhon sources.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(get_project_root()) / "temp" / "benchmark",
+        help="Directory to place generated benchmark inputs.",
+    )
+    parser.add_argument("--child-file", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--streaming", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.child_file is not None:
+        return _run_child(args.child_file, args.streaming)
+    if any(lines <= 0 for lines in args.lines):
+        print("--lines must be > 0")
+        return 2
+    return run_benchmark(args.lines, args.output_dir)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
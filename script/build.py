@@ -10,12 +10,13 @@ def build_grammar():
         [
             sys.executable,
             "-m",
-            "pegen",
+            "script.parser_generator",
             f"{get_project_root()}/src/Typhon/Grammar/typhon.gram",
             "-o",
             f"{get_project_root()}/src/Typhon/Grammar/_typhon_parser.py",
         ],
         capture_output=True,
+        cwd=get_project_root(),
     )
     if output.returncode != 0:
         print("Error building grammar:", output.stderr.decode())
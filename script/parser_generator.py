@@ -0,0 +1,298 @@
+import argparse
+import ast
+import sys
+import token
+from typing import IO, Callable, Literal, Sequence
+
+from pegen.build import build_parser
+from pegen.grammar import (
+    Alt,
+    Cut,
+    Forced,
+    Gather,
+    Grammar,
+    Group,
+    Leaf,
+    NamedItem,
+    NameLeaf,
+    NegativeLookahead,
+    Opt,
+    PositiveLookahead,
+    Repeat0,
+    Repeat1,
+    Rhs,
+    Rule,
+    StringLeaf,
+)
+from pegen.python_generator import PythonCallMakerVisitor, PythonParserGenerator
+from pegen.tokenizer import exact_token_types
+from pegen.validator import validate_grammar
+
+# pegen parser generator extended with FIRST set lookahead dispatch.
+# Each alternative is guarded by the set of tokens it can start with, so the
+# generated parser skips it without calling the rules when the next token is
+# not in the set.
+
+# Token strings and token types a grammar element can start with.
+# None means any token, when it can not be decided from the next token.
+type TokenSet = frozenset[str | int] | None
+# Condition of the next token for the element to match without consuming
+# tokens. False if it never matches empty.
+type EmptySet = TokenSet | Literal[False]
+
+# Tokens matched by the token type.
+_TYPE_TOKENS = {
+    "NAME": token.NAME,
+    "NUMBER": token.NUMBER,
+    "STRING": token.STRING,
+    "OP": token.OP,
+    "TYPE_COMMENT": token.TYPE_COMMENT,
+    "SOFT_KEYWORD": token.NAME,
+    "FSTRING_START": token.FSTRING_START,
+    "FSTRING_MIDDLE": token.FSTRING_MIDDLE,
+    "FSTRING_END": token.FSTRING_END,
+}
+# Tokens matched by Parser.expect with the token name.
+_EXPECT_TOKENS = ("NEWLINE", "DEDENT", "INDENT", "ENDMARKER", "ASYNC", "AWAIT")
+
+
+def _union(a: TokenSet, b: TokenSet) -> TokenSet:
+    if a is None or b is None:
+        return None
+    return a | b
+
+
+def _intersection(a: EmptySet, b: EmptySet) -> EmptySet:
+    if a is False or b is False:
+        return False
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if not a or not b:
+        return frozenset()
+    # Token types also match token strings of that type, so the intersection
+    # is only exact for the same kind of keys. Otherwise keep the superset.
+    a_types = any(isinstance(key, int) for key in a)
+    b_types = any(isinstance(key, int) for key in b)
+    if a_types == b_types:
+        return a & b
+    return a
+
+
+def _expect_keys(value: str) -> frozenset[str | int]:
+    # Same matching as Parser.expect.
+    keys: set[str | int] = {value}
+    if value in exact_token_types:
+        keys.add(exact_token_types[value])
+    if isinstance(token.__dict__.get(value), int):
+        keys.add(token.__dict__[value])
+    return frozenset(keys)
+
+
+class FirstSetCalculator:
+    """
+    FIRST sets of the rules and alternatives. Over-approximated where the
+    token kinds can not be compared, so that skipping never changes the result.
+    """
+
+    def __init__(
+        self, rules: dict[str, Rule], artificial_rule: Callable[[str], Rule | None]
+    ):
+        self._rules = rules
+        self._artificial_rule = artificial_rule
+        self._rule_first: dict[str, tuple[TokenSet, EmptySet]] = {}
+        self._compute_rules()
+
+    def _compute_rules(self) -> None:
+        # Fixed point from the empty sets, to handle the (left) recursions.
+        for name in self._rules:
+            self._rule_first[name] = (frozenset(), False)
+        changed = True
+        while changed:
+            changed = False
+            for name, rule in self._rules.items():
+                first = self.of_rhs(rule.rhs)
+                if first != self._rule_first[name]:
+                    self._rule_first[name] = first
+                    changed = True
+
+    def alt_guard(self, alt: Alt) -> TokenSet:
+        tokens, empty = self.of_alt(alt)
+        if empty is False:
+            return tokens
+        return _union(tokens, empty)
+
+    def of_rhs(self, rhs: Rhs) -> tuple[TokenSet, EmptySet]:
+        tokens: TokenSet = frozenset()
+        empty: EmptySet = False
+        for alt in rhs.alts:
+            alt_tokens, alt_empty = self.of_alt(alt)
+            tokens = _union(tokens, alt_tokens)
+            if empty is False:
+                empty = alt_empty
+            elif alt_empty is not False:
+                empty = _union(empty, alt_empty)
+        return tokens, empty
+
+    def of_alt(self, alt: Alt) -> tuple[TokenSet, EmptySet]:
+        tokens: TokenSet = frozenset()
+        empty: EmptySet = None
+        for named_item in alt.items:
+            item_tokens, item_empty = self.of_item(named_item.item)
+            # The item consumes the first token only after the preceding
+            # items matched empty.
+            consume = _intersection(empty, item_tokens)
+            assert consume is not False
+            tokens = _union(tokens, consume)
+            empty = _intersection(empty, item_empty)
+            if empty is False:
+                break
+        return tokens, empty
+
+    def of_item(self, item: object) -> tuple[TokenSet, EmptySet]:
+        match item:
+            case StringLeaf(value=value):
+                return _expect_keys(ast.literal_eval(value)), False
+            case NameLeaf(value=name):
+                return self._of_name(name)
+            case Opt(node=node) | Repeat0(node=node):
+                return self.of_item(node)[0], None
+            case Repeat1(node=node) | Gather(node=node):
+                return self.of_item(node)
+            case Group(rhs=rhs):
+                return self.of_rhs(rhs)
+            case Rhs():
+                return self.of_rhs(item)
+            case PositiveLookahead(node=node):
+                tokens, empty = self.of_item(node)
+                if empty is False:
+                    return frozenset(), tokens
+                return frozenset(), _union(tokens, empty)
+            case NegativeLookahead():
+                return frozenset(), None
+            case Cut() | Forced():
+                # Skipping changes the result of cut and raising of forced.
+                return None, None
+            case _:
+                return None, None
+
+    def _of_name(self, name: str) -> tuple[TokenSet, EmptySet]:
+        if name in self._rule_first:
+            return self._rule_first[name]
+        if name in _TYPE_TOKENS:
+            return frozenset({_TYPE_TOKENS[name]}), False
+        if name in _EXPECT_TOKENS:
+            return _expect_keys(name), False
+        rule = self._artificial_rule(name)
+        if rule is None:
+            return None, None
+        return self.of_rhs(rule.rhs)
+
+
+class FirstSetGuard(Leaf):
+    """Pseudo item checking the next token against a FIRST set."""
+
+    def __init__(self, value: str, is_gather: bool):
+        super().__init__(value)
+        # Items of gathers are checked with "is not None".
+        self.is_gather = is_gather
+
+    def __str__(self) -> str:
+        return f"<first set {self.value}>"
+
+    def initial_names(self) -> frozenset[str]:
+        return frozenset()
+
+
+class _CallMakerVisitor(PythonCallMakerVisitor):
+    def visit_FirstSetGuard(self, node: FirstSetGuard) -> tuple[None, str]:
+        check = f"tok.type in {node.value} or tok.string in {node.value}"
+        if node.is_gather:
+            return None, f"{check} or None"
+        return None, check
+
+
+class FirstSetParserGenerator(PythonParserGenerator):
+    def __init__(self, grammar: Grammar, file: IO[str] | None):
+        super().__init__(grammar, file)
+        self.callmakervisitor = _CallMakerVisitor(self)
+        self.first_sets = FirstSetCalculator(self.rules, self._find_rule)
+        self._first_set_names: dict[frozenset[str | int], str] = {}
+        self._in_loop_rule = False
+        self._rule_has_guard = False
+
+    def _find_rule(self, name: str) -> Rule | None:
+        return self.todo.get(name) or self.all_rules.get(name)
+
+    def _guard_name(self, alt: Alt) -> str | None:
+        if self._in_loop_rule:
+            return None
+        tokens = self.first_sets.alt_guard(alt)
+        if tokens is None:
+            return None
+        name = self._first_set_names.get(tokens)
+        if name is None:
+            name = f"_FIRST_SET_{len(self._first_set_names)}"
+            self._first_set_names[tokens] = name
+        return name
+
+    def generate(self, filename: str) -> None:
+        super().generate(filename)
+        self.print()
+        self.print("# FIRST sets of the alternatives, by token type and string.")
+        # Typed with both kinds, so that both checks of the guards type-check.
+        for tokens, name in self._first_set_names.items():
+            keys = sorted(tokens, key=lambda key: (isinstance(key, str), key))
+            self.print(
+                f"{name}: frozenset[int | str] = "
+                f"frozenset({{{', '.join(map(repr, keys))}}})"
+            )
+
+    def visit_Rule(self, node: Rule) -> None:
+        self._in_loop_rule = node.is_loop()
+        self._rule_has_guard = any(
+            self._guard_name(alt) is not None for alt in node.flatten().alts
+        )
+        super().visit_Rule(node)
+
+    # The guards use the first token peeked for the locations.
+    def alts_uses_locations(self, alts: Sequence[Alt]) -> bool:
+        return self._rule_has_guard or super().alts_uses_locations(alts)
+
+    def visit_Alt(self, node: Alt, is_loop: bool, is_gather: bool) -> None:
+        guard = self._guard_name(node)
+        if guard is None:
+            super().visit_Alt(node, is_loop, is_gather)
+            return
+        node.items.insert(0, NamedItem(None, FirstSetGuard(guard, is_gather)))
+        try:
+            super().visit_Alt(node, is_loop, is_gather)
+        finally:
+            del node.items[0]
+
+
+def generate_parser(grammar_file: str, output_file: str) -> None:
+    grammar, _, _ = build_parser(grammar_file)
+    with open(output_file, "w") as file:
+        FirstSetParserGenerator(grammar, file).generate(grammar_file)
+    validate_grammar(grammar)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a pegen parser with FIRST set lookahead dispatch."
+    )
+    parser.add_argument("grammar_file", help="Grammar file.")
+    parser.add_argument("-o", "--output", required=True, help="Output parser file.")
+    args = parser.parse_args()
+    try:
+        generate_parser(args.grammar_file, args.output)
+    except Exception as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -32,6 +32,10 @@ def gather_sourcemap_tests() -> list[str]:
     return gather_test_in_grammar_test_dir(["SourceMap"])
 
 
+def gather_transform_tests() -> list[str]:
+    return gather_test_in_grammar_test_dir(["Transform"])
+
+
 def run_all_tests() -> int:
     # First of all run tokenizer tests.
     if (
@@ -49,6 +53,7 @@ def run_all_tests() -> int:
         + gather_scope_tests()
         + gather_utils_tests()
         + gather_sourcemap_tests()
+        + gather_transform_tests()
     )
     if not test_files:
         print("No tests were found to run.")
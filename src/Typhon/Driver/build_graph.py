@@ -0,0 +1,156 @@
+import ast
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from ..Typing.result_diagnostic import Diagnostic
+from ..Utils.path import TYPHON_CACHE_DIR, TYPHON_EXT, canonicalize_path
+from .configs import is_translate_cache_enabled
+from .debugging import debug_print
+from .translate_cache import toolchain_key as current_toolchain_key
+
+# Import graph of a translated directory, kept between runs to rebuild and
+# type check only the changed modules and the modules importing them.
+
+_BUILD_GRAPH_FILE = "build_graph.pickle"
+
+
+@dataclass
+class ModuleNode:
+    # Translate cache key of the source at the last build.
+    key: str
+    # Fully qualified names of the modules imported, including parent packages.
+    imports: set[str]
+    # Translation and type check diagnostics of this module at the last build.
+    diagnostics: list[Diagnostic]
+
+
+@dataclass
+class BuildGraph:
+    toolchain_key: str = field(default_factory=current_toolchain_key)
+    # Canonical source path to node.
+    nodes: dict[str, ModuleNode] = field(default_factory=dict)
+    # Canonical source path to the fully qualified module name.
+    module_names: dict[str, str] = field(default_factory=dict)
+
+    def affected_sources(
+        self, keys: dict[str, str], module_names: dict[str, str]
+    ) -> set[str]:
+        """
+        Sources to rebuild, given the current translate cache keys and module names
+        of all sources.
+        """
+        changed = {source for source in keys if source not in self.nodes}
+        changed |= {
+            source
+            for source, node in self.nodes.items()
+            if keys.get(source) != node.key
+        }
+        # Removed sources are only in the previous module names.
+        all_module_names = {**self.module_names, **module_names}
+        changed_modules = {all_module_names[source] for source in changed}
+        affected = {source for source in changed if source in keys}
+        # Reverse dependents, transitively.
+        while changed_modules:
+            dependents = {
+                source
+                for source, node in self.nodes.items()
+                if source in keys
+                and source not in affected
+                and not node.imports.isdisjoint(changed_modules)
+            }
+            affected |= dependents
+            changed_modules = {all_module_names[source] for source in dependents}
+        return affected
+
+
+def module_name_of(source: Path, source_dir: Path, package_name: str) -> str:
+    parts = [package_name, *source.relative_to(source_dir).with_suffix("").parts]
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _with_parents(module_name: str) -> set[str]:
+    parts = module_name.split(".")
+    return {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+
+
+def extract_imports(module: ast.Module, module_name: str, is_package: bool) -> set[str]:
+    package = module_name if is_package else module_name.rpartition(".")[0]
+    imports: set[str] = set()
+    for node in ast.walk(module):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports |= _with_parents(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level > 0:
+                base_parts = package.split(".")
+                base_parts = base_parts[: len(base_parts) - (node.level - 1)]
+                base = ".".join(base_parts)
+                name = f"{base}.{node.module}" if node.module else base
+            else:
+                name = node.module or ""
+            if not name:
+                continue
+            imports |= _with_parents(name)
+            # `from package import module` imports the submodule.
+            for alias in node.names:
+                if alias.name != "*":
+                    imports.add(f"{name}.{alias.name}")
+    return imports
+
+
+def is_package_source(source: Path) -> bool:
+    return source.name == f"__init__{TYPHON_EXT}"
+
+
+def build_graph_file(module_output_dir: Path) -> Path:
+    return module_output_dir / TYPHON_CACHE_DIR / _BUILD_GRAPH_FILE
+
+
+def load_build_graph(module_output_dir: Path) -> BuildGraph | None:
+    if not is_translate_cache_enabled():
+        return None
+    graph_file = build_graph_file(module_output_dir)
+    try:
+        with graph_file.open("rb") as f:
+            graph = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        debug_print(lambda: f"Failed to load build graph {graph_file}: {e}")
+        return None
+    if (
+        not isinstance(graph, BuildGraph)
+        or graph.toolchain_key != current_toolchain_key()
+    ):
+        debug_print(lambda: f"Build graph is stale: {graph_file}")
+        return None
+    return graph
+
+
+def store_build_graph(module_output_dir: Path, graph: BuildGraph) -> None:
+    if not is_translate_cache_enabled():
+        return
+    graph_file = build_graph_file(module_output_dir)
+    temp_file = graph_file.with_name(f"{graph_file.name}.{os.getpid()}.tmp")
+    try:
+        graph_file.parent.mkdir(parents=True, exist_ok=True)
+        with temp_file.open("wb") as f:
+            pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, graph_file)
+    except Exception as e:
+        debug_print(lambda: f"Failed to store build graph {graph_file}: {e}")
+        temp_file.unlink(missing_ok=True)
+
+
+def diagnostics_by_source(
+    diagnostics: list[Diagnostic], output_to_source: dict[str, str]
+) -> dict[str, list[Diagnostic]]:
+    # Demangled diagnostics are in the source, the others are in the output.
+    result: dict[str, list[Diagnostic]] = {}
+    for diag in diagnostics:
+        path = canonicalize_path(Path(diag.file_path))
+        result.setdefault(output_to_source.get(path, path), []).append(diag)
+    return result
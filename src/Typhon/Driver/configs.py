@@ -12,3 +12,53 @@ def set_language_backend(backend: Literal["pyrefly", "pyright"]):
 
 def get_language_backend() -> Literal["pyrefly", "pyright"]:
     return _language_backend
+
+
+_translate_cache_enabled = True
+
+
+def set_translate_cache_enabled(enabled: bool):
+    global _translate_cache_enabled
+    _translate_cache_enabled = enabled
+
+
+def is_translate_cache_enabled() -> bool:
+    return _translate_cache_enabled
+
+
+_type_check_daemon_enabled = False
+
+
+def set_type_check_daemon_enabled(enabled: bool):
+    global _type_check_daemon_enabled
+    _type_check_daemon_enabled = enabled
+
+
+def is_type_check_daemon_enabled() -> bool:
+    return _type_check_daemon_enabled
+
+
+# Reuse of the transformed top level functions across the builds in process.
+_transform_memo_enabled = False
+
+
+def set_transform_memo_enabled(enabled: bool):
+    global _transform_memo_enabled
+    _transform_memo_enabled = enabled
+
+
+def is_transform_memo_enabled() -> bool:
+    return _transform_memo_enabled
+
+
+_profile_format: Literal["text", "json"] | None = None
+
+
+def set_profile_format(profile_format: Literal["text", "json"] | None):
+    global _profile_format
+    _profile_format = profile_format
+
+
+# None when profiling is disabled.
+def get_profile_format() -> Literal["text", "json"] | None:
+    return _profile_format
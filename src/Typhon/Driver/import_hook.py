@@ -0,0 +1,167 @@
+import ast
+import marshal
+import os
+import sys
+from collections.abc import Sequence
+from importlib.abc import MetaPathFinder
+from importlib.machinery import (
+    BYTECODE_SUFFIXES,
+    EXTENSION_SUFFIXES,
+    SOURCE_SUFFIXES,
+    ExtensionFileLoader,
+    FileFinder,
+    ModuleSpec,
+    PathFinder,
+    SourceFileLoader,
+    SourcelessFileLoader,
+)
+from importlib.util import MAGIC_NUMBER, cache_from_source, source_hash
+from pathlib import Path
+from types import CodeType, ModuleType
+from ..Grammar.parser import parse_file
+from ..Grammar.syntax_errors import TyphonSyntaxErrorList, diag_errors
+from ..Transform.transform import transform
+from ..Utils.path import TYPHON_EXT
+from ..Utils.source_text import SourceText
+from .debugging import debug_print, is_debug_verbose
+from .translate_cache import toolchain_key
+
+# Import `.typh` modules directly from sys.path, as `.py` modules are.
+#
+#   from Typhon.Driver.import_hook import install_import_hook
+#   install_import_hook()
+#   import my_typhon_module  # my_typhon_module.typh
+
+# Flags of PEP 552 hash-based pyc, checked against the source on every import.
+_HASH_BASED_CHECKED_PYC_FLAGS = 0b11
+
+
+def typhon_cache_from_source(source_path: str) -> str:
+    # Distinct from the pyc of the `.py` module of the same name.
+    pyc = cache_from_source(source_path)
+    return pyc[: -len(".pyc")] + ".typh.pyc"
+
+
+def _source_hash(source_bytes: bytes) -> bytes:
+    # Bytecode must be invalidated also by the change of Typhon itself.
+    return source_hash(toolchain_key().encode() + source_bytes)
+
+
+def _code_from_pyc(data: bytes, expected_hash: bytes) -> CodeType | None:
+    if len(data) < 16 or data[:4] != MAGIC_NUMBER:
+        return None
+    flags = int.from_bytes(data[4:8], "little")
+    if flags != _HASH_BASED_CHECKED_PYC_FLAGS or data[8:16] != expected_hash:
+        return None
+    code = marshal.loads(data[16:])
+    return code if isinstance(code, CodeType) else None
+
+
+def _code_to_pyc(code: CodeType, digest: bytes) -> bytes:
+    return (
+        MAGIC_NUMBER
+        + _HASH_BASED_CHECKED_PYC_FLAGS.to_bytes(4, "little")
+        + digest
+        + marshal.dumps(code)
+    )
+
+
+class TyphonLoader(SourceFileLoader):
+    def source_to_code(  # type: ignore[override]
+        self, data: bytes, path: str, *, _optimize: int = -1
+    ) -> CodeType:
+        debug_print(lambda: f"Translating imported module: {path}")
+        source_text = SourceText.from_bytes(data, path)
+        try:
+            module = parse_file(
+                path, verbose=is_debug_verbose(), source_text=source_text
+            )
+            transform(module)
+        except (SyntaxError, TyphonSyntaxErrorList) as error:
+            raise SyntaxError(diag_errors(error, Path(path), source_text)) from error
+        # Positions in the module are the ones in Typhon source.
+        return compile(
+            ast.fix_missing_locations(module), path, "exec", optimize=_optimize
+        )
+
+    def get_code(self, fullname: str) -> CodeType:
+        source_path = self.get_filename(fullname)
+        source_bytes = self.get_data(source_path)
+        digest = _source_hash(source_bytes)
+        try:
+            bytecode_path = typhon_cache_from_source(source_path)
+        except NotImplementedError:  # No cache_tag in this implementation.
+            bytecode_path = None
+        if bytecode_path is not None:
+            try:
+                code = _code_from_pyc(self.get_data(bytecode_path), digest)
+            except (OSError, ValueError, EOFError, TypeError):
+                code = None
+            if code is not None:
+                debug_print(lambda: f"Bytecode cache hit: {bytecode_path}")
+                return code
+        code = self.source_to_code(source_bytes, source_path)
+        if bytecode_path is not None and not sys.dont_write_bytecode:
+            self.set_data(bytecode_path, _code_to_pyc(code, digest))
+        return code
+
+
+class TyphonFinder(MetaPathFinder):
+    def __init__(self):
+        self._finders: dict[str, FileFinder] = {}
+
+    def _finder(self, entry: str) -> FileFinder:
+        if entry not in self._finders:
+            # Regular modules precede Typhon modules in the same directory.
+            self._finders[entry] = FileFinder(
+                entry,
+                (ExtensionFileLoader, EXTENSION_SUFFIXES),
+                (SourceFileLoader, SOURCE_SUFFIXES),
+                (SourcelessFileLoader, BYTECODE_SUFFIXES),
+                (TyphonLoader, [TYPHON_EXT]),
+            )
+        return self._finders[entry]
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        for entry in sys.path if path is None else path:
+            if not isinstance(entry, str) or not os.path.isdir(entry or "."):
+                continue
+            spec = self._finder(entry).find_spec(fullname, target)
+            if spec is None or spec.loader is None:
+                # Not found, or namespace package portion.
+                continue
+            if isinstance(spec.loader, TyphonLoader):
+                return spec
+            # Leave regular modules to PathFinder.
+            return None
+        return None
+
+    def invalidate_caches(self) -> None:
+        self._finders.clear()
+
+
+def install_import_hook() -> TyphonFinder:
+    """
+    Enable importing `.typh` modules on sys.path. Calling twice is no-op.
+    """
+    for finder in sys.meta_path:
+        if isinstance(finder, TyphonFinder):
+            return finder
+    finder = TyphonFinder()
+    # Before PathFinder, so that the directory with `__init__.typh` is not taken
+    # as namespace package.
+    index = next(
+        (i for i, f in enumerate(sys.meta_path) if f is PathFinder),
+        len(sys.meta_path),
+    )
+    sys.meta_path.insert(index, finder)
+    return finder
+
+
+def uninstall_import_hook() -> None:
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, TyphonFinder)]
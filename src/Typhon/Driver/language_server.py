@@ -11,6 +11,7 @@ from ..Driver.debugging import (
     set_debug_verbose,
     debug_setup_logging,
 )
+from .configs import set_transform_memo_enabled
 import sys
 import logging
 
@@ -21,6 +22,8 @@ def language_server():
     """
     if is_debug_verbose():
         debug_setup_logging(verbose=is_debug_verbose())
+    # Each edit transforms the buffer again, reusing unchanged top level functions.
+    set_transform_memo_enabled(True)
     server.start_io(
         stdin=BinaryIOLogger(sys.stdin.buffer),
         stdout=BinaryIOLogger(sys.stdout.buffer),
@@ -0,0 +1,148 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from collections.abc import Generator
+from .configs import get_profile_format
+
+# Phase level profile of the driver enabled by --profile.
+
+
+@dataclass
+class PhaseProfile:
+    phase: str
+    # Source or output file the phase worked on. None for the whole build.
+    file: str | None
+    wall_sec: float
+    # CPU time of this process. Child processes such as the type checker are not included.
+    cpu_sec: float
+    # Peak traced allocation above the traced allocation at the phase start.
+    peak_bytes: int
+    # Steps skipped in the phase, such as transform passes without the syntax.
+    skipped: list[str] = field(default_factory=list)
+
+
+_records: list[PhaseProfile] = []
+# [traced memory at start, peak so far] of the running phases, outermost first.
+_running: list[list[int]] = []
+# Skipped steps of the running phases, outermost first.
+_running_skipped: list[list[str]] = []
+
+
+def start_profiling() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def is_profiling() -> bool:
+    return get_profile_format() is not None
+
+
+def note_skipped(step: str) -> None:
+    """Record a step skipped in the innermost running phase."""
+    if _running_skipped:
+        _running_skipped[-1].append(step)
+
+
+@contextmanager
+def profile_phase(phase: str, file: Path | str | None = None) -> Generator[None]:
+    if not is_profiling():
+        yield
+        return
+    start_profiling()
+    current, peak = tracemalloc.get_traced_memory()
+    # Resetting the peak below loses it for the outer phase, so keep it there.
+    if _running:
+        _running[-1][1] = max(_running[-1][1], peak)
+    tracemalloc.reset_peak()
+    _running.append([current, current])
+    _running_skipped.append([])
+    wall_begin = time.perf_counter()
+    cpu_begin = time.process_time()
+    try:
+        yield
+    finally:
+        wall_sec = time.perf_counter() - wall_begin
+        cpu_sec = time.process_time() - cpu_begin
+        start, peak = _running.pop()
+        skipped = _running_skipped.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if _running:
+            _running[-1][1] = max(_running[-1][1], peak)
+        _records.append(
+            PhaseProfile(
+                phase=phase,
+                file=Path(file).as_posix() if file is not None else None,
+                wall_sec=wall_sec,
+                cpu_sec=cpu_sec,
+                peak_bytes=peak - start,
+                skipped=skipped,
+            )
+        )
+
+
+def take_profile_records() -> list[PhaseProfile]:
+    records = list(_records)
+    _records.clear()
+    return records
+
+
+# Records measured in the worker processes.
+def add_profile_records(records: list[PhaseProfile]) -> None:
+    _records.extend(records)
+
+
+def _phase_totals(records: list[PhaseProfile]) -> dict[str, PhaseProfile]:
+    totals: dict[str, PhaseProfile] = {}
+    for record in records:
+        total = totals.setdefault(
+            record.phase, PhaseProfile(record.phase, None, 0, 0, 0)
+        )
+        total.wall_sec += record.wall_sec
+        total.cpu_sec += record.cpu_sec
+        total.peak_bytes = max(total.peak_bytes, record.peak_bytes)
+    return totals
+
+
+def _format_row(record: PhaseProfile) -> str:
+    row = (
+        f"{record.phase:<12} {record.wall_sec:>9.4f} {record.cpu_sec:>9.4f} "
+        f"{record.peak_bytes / 1024:>11.1f}  {record.file or '-'}"
+    )
+    if record.skipped:
+        row += f"  skipped: {', '.join(record.skipped)}"
+    return row
+
+
+def format_profile_report(
+    records: list[PhaseProfile], profile_format: str = "text"
+) -> str:
+    totals = _phase_totals(records)
+    if profile_format == "json":
+        return json.dumps(
+            {
+                "phases": [asdict(record) for record in records],
+                "totals": {phase: asdict(total) for phase, total in totals.items()},
+            },
+            indent=2,
+        )
+    header = f"{'phase':<12} {'wall(s)':>9} {'cpu(s)':>9} {'peak(KiB)':>11}  file"
+    lines = ["[profile] per file", header]
+    lines.extend(_format_row(record) for record in records)
+    lines.extend(["[profile] total per phase", header])
+    lines.extend(_format_row(total) for total in totals.values())
+    return "\n".join(lines)
+
+
+def print_profile_report() -> None:
+    profile_format = get_profile_format()
+    if profile_format is None:
+        return
+    print(
+        format_profile_report(take_profile_records(), profile_format),
+        file=sys.stderr,
+        flush=True,
+    )
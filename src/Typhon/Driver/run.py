@@ -1,5 +1,14 @@
 import sys
 import os
+import ast
+import builtins
+import contextlib
+import copy
+import io
+import runpy
+import traceback
+import types
+from collections.abc import Callable, Generator
 from pathlib import Path
 import subprocess
 from dataclasses import dataclass
@@ -16,12 +25,16 @@ from ._utils import (
 from ..Transform.transform import transform
 from .debugging import is_debug_mode, debug_print, is_debug_verbose
 from .translate import (
+    TranslateResult,
     translate_directory,
     translate_file,
-    translate_and_run_type_check_file,
+    run_type_check_translated_file,
+    translate_and_run_type_check_files,
     translate_and_run_type_check_directory,
 )
 from ..Driver.type_check import run_type_check
+from .translate_cache import load_code_cache, store_code_cache
+from .profiling import profile_phase
 
 
 @dataclass
@@ -41,43 +54,220 @@ class RunResult:
         )
 
 
+def _exit_code(code: object) -> int:
+    # Same as the interpreter handles SystemExit.
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+@contextlib.contextmanager
+def _in_process_environment(
+    path_entry: Path, argv: list[str], capture_output: bool
+) -> Generator[tuple[io.StringIO, io.StringIO]]:
+    saved_argv = sys.argv
+    saved_path = sys.path[:]
+    saved_main = sys.modules.get("__main__")
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.argv = argv
+    # Same as sys.path[0] of the subprocess.
+    sys.path.insert(0, str(path_entry))
+    try:
+        with contextlib.ExitStack() as stack:
+            if capture_output:
+                stack.enter_context(contextlib.redirect_stdout(stdout))
+                stack.enter_context(contextlib.redirect_stderr(stderr))
+            yield stdout, stderr
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        if saved_main is not None:
+            sys.modules["__main__"] = saved_main
+
+
+def _run_code_in_process(body: Callable[[], object]) -> int:
+    try:
+        body()
+    except SystemExit as e:
+        return _exit_code(e.code)
+    except Exception as e:
+        # Hide the frames of the driver as the subprocess does not have them.
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename == __file__:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        return 1
+    finally:
+        sys.stdout.flush()
+    return 0
+
+
+# Compile the translated module, or load the marshalled code cached beside it.
+# The code is cached by the key of the source translated, not read again here.
+def _compile_translated_file(
+    source: Path, output_file: Path, translate_result: TranslateResult
+) -> types.CodeType:
+    cache_key = translate_result.cache_key
+    if cache_key is not None and (
+        code := load_code_cache(output_file, cache_key)
+    ) is not None:
+        return code
+    translated = translate_result.module
+    if translated is None:
+        raise RuntimeError(f"Translation of {source} has no module to run.")
+    # Do not modify the module shared with the translate cache.
+    module = ast.fix_missing_locations(copy.deepcopy(translated))
+    # Positions in the module are the ones in Typhon source.
+    with profile_phase("compile", source):
+        code = compile(module, source.as_posix(), "exec")
+    if cache_key is not None:
+        store_code_cache(output_file, cache_key, code)
+    return code
+
+
+def _run_file_in_process(
+    code: types.CodeType, output_file: Path, capture_output: bool, *args: str
+) -> RunResult:
+    main_module = types.ModuleType("__main__")
+    main_module.__file__ = str(output_file)
+    vars(main_module)["__builtins__"] = builtins
+    with _in_process_environment(
+        output_file.parent, [str(output_file), *args], capture_output
+    ) as (stdout, stderr):
+        sys.modules["__main__"] = main_module
+        returncode = _run_code_in_process(lambda: exec(code, main_module.__dict__))
+    return RunResult(
+        stdout=stdout.getvalue(), stderr=stderr.getvalue(), returncode=returncode
+    )
+
+
 # Run source file as script.
 # Return RunResult containing stdout, stderr only if capture_output is True.
-def run_file(source: Path, capture_output: bool, *args: str) -> RunResult:
+def run_file(
+    source: Path, capture_output: bool, *args: str, in_process: bool = False
+) -> RunResult:
     output_file = prepare_default_output_file(source)
     # Translate source file to temp output file.
-    type_check_result = translate_and_run_type_check_file(source, output_file)
+    translate_result = translate_file(source, output_file)
+    type_check_result = run_type_check_translated_file(
+        translate_result, source, output_file
+    )
     if not type_check_result.is_successful():
         return RunResult(
             stdout="",
             stderr=type_check_result.make_output_message(),
             returncode=1,
         )
-    # Run translated output file as script once type checking is successful.
+    return _run_translated_file(
+        source,
+        output_file,
+        translate_result,
+        capture_output,
+        *args,
+        in_process=in_process,
+    )
+
+
+# Run the translated file once type checking is successful.
+def _run_translated_file(
+    source: Path,
+    output_file: Path,
+    translate_result: TranslateResult,
+    capture_output: bool,
+    *args: str,
+    in_process: bool,
+) -> RunResult:
+    if in_process:
+        code = _compile_translated_file(source, output_file, translate_result)
+        with profile_phase("execute", source):
+            return _run_file_in_process(code, output_file, capture_output, *args)
     subprocess_args = [
         sys.executable,
         str(output_file),
     ] + list(args)
-    if capture_output:
-        result = subprocess.run(
-            subprocess_args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+    with profile_phase("execute", source):
+        if capture_output:
+            result = subprocess.run(
+                subprocess_args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        else:
+            result = subprocess.run(
+                subprocess_args,
+            )
+    return RunResult.from_subprocess_result(result)
+
+
+# Run source files as scripts, after type checking all of them in one checker run.
+# Return RunResult of each source. Scripts failed in type checking are not run.
+def run_files(
+    sources: list[Path],
+    capture_output: bool,
+    *,
+    jobs: int = 1,
+    in_process: bool = False,
+) -> dict[Path, RunResult]:
+    targets = [(source, prepare_default_output_file(source)) for source in sources]
+    type_check_results = translate_and_run_type_check_files(targets, jobs=jobs)
+    results: dict[Path, RunResult] = {}
+    for source, output_file in targets:
+        translate_result, type_check_result = type_check_results[source]
+        if not type_check_result.is_successful():
+            results[source] = RunResult(
+                stdout="",
+                stderr=type_check_result.make_output_message(),
+                returncode=1,
+            )
+            continue
+        results[source] = _run_translated_file(
+            source,
+            output_file,
+            translate_result,
+            capture_output,
+            in_process=in_process,
         )
-    else:
-        result = subprocess.run(
-            subprocess_args,
+    return results
+
+
+def _run_directory_in_process(
+    temp_output_dir: Path, module_name: str, capture_output: bool, *args: str
+) -> RunResult:
+    def _purge_modules():
+        for name in list(sys.modules):
+            if name == module_name or name.startswith(f"{module_name}."):
+                del sys.modules[name]
+
+    _purge_modules()
+    with _in_process_environment(
+        temp_output_dir, [module_name, *args], capture_output
+    ) as (stdout, stderr):
+        returncode = _run_code_in_process(
+            lambda: runpy.run_module(module_name, run_name="__main__", alter_sys=True)
         )
-    return RunResult.from_subprocess_result(result)
+    # Next run imports the translated modules again.
+    _purge_modules()
+    return RunResult(
+        stdout=stdout.getvalue(), stderr=stderr.getvalue(), returncode=returncode
+    )
 
 
-def run_directory(source_dir: Path, capture_output: bool, *args: str) -> RunResult:
+def run_directory(
+    source_dir: Path,
+    capture_output: bool,
+    *args: str,
+    jobs: int = 1,
+    in_process: bool = False,
+) -> RunResult:
     temp_output_dir = default_output_dir(source_dir.as_posix())
     temp_output_dir.mkdir(exist_ok=True)
     module_output_dir = temp_output_dir / source_dir.name
     # Translate source directory to temp output directory as module.
     type_check_result = translate_and_run_type_check_directory(
-        source_dir, module_output_dir
+        source_dir, module_output_dir, jobs=jobs
     )
     if not type_check_result.is_successful():
         return RunResult(
@@ -85,6 +275,11 @@ def run_directory(source_dir: Path, capture_output: bool, *args: str) -> RunResu
             stderr=type_check_result.make_output_message(),
             returncode=1,
         )
+    if in_process:
+        with profile_phase("execute", source_dir):
+            return _run_directory_in_process(
+                temp_output_dir, module_output_dir.name, capture_output, *args
+            )
     subprocess_args = [
         sys.executable,
         "-m",
@@ -104,22 +299,55 @@ def run_directory(source_dir: Path, capture_output: bool, *args: str) -> RunResu
             f"Running source directory: {source_dir} as module {module_output_dir.name} with args: {subprocess_args} env: {subprocess_env}"
         )
     )
-    if capture_output:
-        result = subprocess.run(
-            subprocess_args,
-            env=subprocess_env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    else:
-        result = subprocess.run(
-            subprocess_args,
-            env=subprocess_env,
-        )
+    with profile_phase("execute", source_dir):
+        if capture_output:
+            result = subprocess.run(
+                subprocess_args,
+                env=subprocess_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        else:
+            result = subprocess.run(
+                subprocess_args,
+                env=subprocess_env,
+            )
     return RunResult.from_subprocess_result(result)
 
 
-def run(source: str, *args: str):
+def run_many(*sources: str, jobs: int = 1, in_process: bool = False):
+    """
+    Run the given script files without arguments, type checked together in one checker run.
+
+    Scripts failed in type checking are not run.
+
+    Usage:
+        sources: The Typhon source files to run.
+        --jobs [int]: Number of processes to translate the files. 0 means all the cores. The default is 1.
+        --in_process [bool]: Run in this interpreter instead of starting a new Python process. The default is False.
+    """
+    if not sources:
+        raise ValueError("No source files to run.")
+    source_paths = [Path(source) for source in sources]
+    for source_path in source_paths:
+        if not source_path.is_file() or source_path.suffix != TYPHON_EXT:
+            raise ValueError(f"Source must be a '{TYPHON_EXT}' file: {source_path}")
+    results = run_files(source_paths, False, jobs=jobs, in_process=in_process)
+    failed = [
+        f"{source} (return code {result.returncode})"
+        for source, result in results.items()
+        if result.returncode != 0
+    ]
+    if failed:
+        raise RuntimeError(f"Running scripts failed: {', '.join(failed)}.")
+
+
+def run(
+    source: str,
+    *args: str,
+    jobs: int = 1,
+    in_process: bool = False,
+):
     """
     Run the given source code.
 
@@ -128,15 +356,19 @@ def run(source: str, *args: str):
     Usage:
         source: The Typhon source code to run.
         [args]: Additional arguments to pass to the script or module.
+        --jobs [int]: Number of processes to translate files in directory. 0 means all the cores. The default is 1.
+        --in_process [bool]: Run in this interpreter instead of starting a new Python process. The default is False.
     """
     source_path = Path(source)
 
     if source_path.is_file():
         if source_path.suffix != TYPHON_EXT:
             raise ValueError(f"Source file must have '{TYPHON_EXT}' extension.")
-        result = run_file(source_path, capture_output=False, *args)
+        result = run_file(source_path, False, *args, in_process=in_process)
     elif source_path.is_dir():
-        result = run_directory(source_path, capture_output=False, *args)
+        result = run_directory(
+            source_path, False, *args, jobs=jobs, in_process=in_process
+        )
     else:
         raise ValueError("Source must be a valid file or directory path.")
     if result.returncode != 0:
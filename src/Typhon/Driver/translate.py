@@ -2,11 +2,14 @@ from Typhon.Typing.result_diagnostic import Diagnostic
 
 
 from pathlib import Path
+import os
 import sys
 import ast
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, cast
+from typing import Any, Literal, cast
 from ..Grammar.parser import parse_file
+from ..Grammar.chunked_parse import parse_file_chunked
 from ..Grammar.demangle import demangle_text
 from ..Grammar.syntax_errors import (
     diag_errors,
@@ -27,11 +30,47 @@ from ._utils import (
     copy_type,
 )
 from ..Transform.transform import transform
-from .debugging import debug_print, is_debug_verbose
-from ..Driver.type_check import run_type_check, TypeCheckResult
+from .debugging import (
+    debug_print,
+    is_debug_mode,
+    is_debug_verbose,
+    set_debug_mode,
+    set_debug_verbose,
+)
+from .configs import (
+    get_profile_format,
+    is_translate_cache_enabled,
+    set_profile_format,
+    set_translate_cache_enabled,
+)
+from .profiling import (
+    PhaseProfile,
+    add_profile_records,
+    profile_phase,
+    start_profiling,
+    take_profile_records,
+)
+from .build_graph import (
+    BuildGraph,
+    ModuleNode,
+    diagnostics_by_source,
+    extract_imports,
+    is_package_source,
+    load_build_graph,
+    module_name_of,
+    store_build_graph,
+)
+from .translate_cache import (
+    CachedTranslation,
+    translate_cache_key,
+    load_translate_cache,
+    store_translate_cache,
+)
+from ..Driver.type_check import run_type_check, run_type_check_files, TypeCheckResult
 from ..SourceMap import SourceMap
 from ..SourceMap.datatype import Range
 from ..SourceMap.ast_match_based_map import map_from_translated_ast
+from ..Utils.source_text import SourceText
 from ..Typing.result_diagnostic import Diagnostic, Severity
 
 
@@ -45,11 +84,21 @@ class TranslateResult:
         SyntaxError | TyphonTransformSyntaxError | TyphonSyntaxErrorList | None
     )
     translated_code: str | None
+    # Source read once for translation, shared by the diagnostics.
+    source_text: SourceText | None = None
+    # Cache key of the source bytes actually translated.
+    cache_key: str | None = None
+
+
+def _source_text_of(result: TranslateResult) -> SourceText:
+    if result.source_text is None:
+        result.source_text = SourceText.from_file(Path(result.source_path_canonical))
+    return result.source_text
 
 
 def _syntax_errors_to_diagnostics(
     source_path: str,
-    source_code: str,
+    source_text: SourceText,
     module: ast.Module | None,
     syntax_error: SyntaxError
     | TyphonTransformSyntaxError
@@ -70,7 +119,7 @@ def _syntax_errors_to_diagnostics(
             message=demangle_text(syntax_error_message(error), module),
             pos=Range.from_syntax_error(error),
             rule="",
-            source_lines=source_code.splitlines(),
+            source_lines=source_text.lines,
         )
         for error in errors
     ]
@@ -123,7 +172,7 @@ def _merge_translate_result_errors(
         for result in translate_results
         for diagnostic in _syntax_errors_to_diagnostics(
             result.source_path_canonical,
-            Path(result.source_path_canonical).read_text(encoding="utf-8"),
+            _source_text_of(result),
             result.module,
             result.syntax_error,
         )
@@ -180,10 +229,23 @@ def _type_check_failed_empty_result() -> TypeCheckResult:
     )
 
 
+def _type_check_skipped_result() -> TypeCheckResult:
+    return TypeCheckResult(
+        returncode=0,
+        stderr="",
+        files_analyzed=0,
+        num_errors=0,
+        num_warnings=0,
+        num_info=0,
+        time_in_sec=0.0,
+        diagnostics=[],
+    )
+
+
 def _diag_errors_demangled(
     syntax_error: SyntaxError | TyphonTransformSyntaxError | TyphonSyntaxErrorList,
     source: Path,
-    source_code: str,
+    source_code: str | SourceText,
     module: ast.Module | None,
 ) -> str:
     return demangle_text(
@@ -196,27 +258,76 @@ def _diag_errors_demangled(
     )
 
 
+def _translate_result_from_cache(
+    source: Path,
+    output: Path,
+    cached: CachedTranslation,
+    source_text: SourceText,
+    cache_key: str,
+) -> TranslateResult:
+    # The translated file may have been removed or overwritten since cached.
+    if not output.exists() or output.read_text() != cached.translated_code:
+        output.write_text(cached.translated_code)
+    return TranslateResult(
+        source_path_canonical=canonicalize_path(source),
+        output_path_canonical=canonicalize_path(output),
+        source_map=cached.source_map,
+        module=cached.module,
+        syntax_error=cached.syntax_error,
+        translated_code=cached.translated_code,
+        source_text=source_text,
+        cache_key=cache_key,
+    )
+
+
 def translate_file(
     source: Path,
     output: Path,
     *,
     recover: bool = True,
+    parse_jobs: int = 1,
 ) -> TranslateResult:
     debug_print(lambda: f"Translating source: {source} to output_dir: {output}")
+    with profile_phase("read", source):
+        source_bytes = source.read_bytes()
+        source_text = SourceText.from_bytes(source_bytes, source.as_posix())
+        cache_key = translate_cache_key(source, source_bytes, recover)
+    with profile_phase("cache_load", source):
+        cached = load_translate_cache(output, cache_key)
+    if cached is not None:
+        return _translate_result_from_cache(
+            source, output, cached, source_text, cache_key
+        )
     ast_tree: ast.Module | None = None
     syntax_error: (
         SyntaxError | TyphonTransformSyntaxError | TyphonSyntaxErrorList | None
     ) = None
     try:
-        ast_tree = parse_file(source.as_posix(), verbose=is_debug_verbose())
-        transform(
-            ast_tree,
-            ignore_error=recover,
-        )
-        if recover:
-            syntax_errors = get_syntax_error_in_module(ast_tree)
-            if syntax_errors:
-                syntax_error = TyphonSyntaxErrorList(syntax_errors)
+        with profile_phase("parse", source):
+            if parse_jobs > 1:
+                # Huge files are parsed in chunks by processes.
+                ast_tree = parse_file_chunked(
+                    source.as_posix(),
+                    parse_jobs,
+                    verbose=is_debug_verbose(),
+                    source_text=source_text,
+                )
+            else:
+                ast_tree = parse_file(
+                    source.as_posix(),
+                    verbose=is_debug_verbose(),
+                    source_text=source_text,
+                    streaming=True,
+                )
+        with profile_phase("transform", source):
+            transform(
+                ast_tree,
+                ignore_error=recover,
+            )
+            if recover:
+                syntax_errors = get_syntax_error_in_module(ast_tree)
+                if syntax_errors:
+                    syntax_error = TyphonSyntaxErrorList(syntax_errors)
     except (SyntaxError, TyphonTransformSyntaxError, TyphonSyntaxErrorList) as error:
         error_message = (
             "\n".join(syntax_error_message(e) for e in error.errors)
@@ -231,17 +342,32 @@ def translate_file(
             module=ast_tree,
             syntax_error=error,
             translated_code=None,
+            source_text=source_text,
+            cache_key=cache_key,
+        )
+    with profile_phase("unparse", source):
+        translated_code = unparse_custom(ast_tree)
+    with profile_phase("map", source):
+        mapping = map_from_translated_ast(
+            ast_tree,
+            ast.parse(translated_code),
+            source_text,
+            source.as_posix(),
+            translated_code,
+        )
+    with profile_phase("write", source):
+        output.write_text(translated_code)
+    with profile_phase("cache_store", source):
+        store_translate_cache(
+            output,
+            CachedTranslation(
+                key=cache_key,
+                module=ast_tree,
+                source_map=cast(SourceMap | None, mapping),
+                syntax_error=syntax_error,
+                translated_code=translated_code,
+            ),
         )
-    translated_code = unparse_custom(ast_tree)
-    source_code = source.read_text(encoding="utf-8")
-    mapping = map_from_translated_ast(
-        ast_tree,
-        ast.parse(translated_code),
-        source_code,
-        source.as_posix(),
-        translated_code,
-    )
-    output.write_text(translated_code)
     return TranslateResult(
         source_path_canonical=canonicalize_path(source),
         output_path_canonical=canonicalize_path(output),
@@ -249,6 +375,8 @@ def translate_file(
         module=ast_tree,
         syntax_error=syntax_error,
         translated_code=translated_code,
+        source_text=source_text,
+        cache_key=cache_key,
     )
 
 
@@ -257,17 +385,32 @@ def translate_and_run_type_check_file(
     output: Path,
     *,
     recover: bool = True,
+    parse_jobs: int = 1,
 ) -> TypeCheckResult:
     translate_result = translate_file(
         source,
         output,
         recover=recover,
+        parse_jobs=parse_jobs,
     )
+    return run_type_check_translated_file(
+        translate_result, source, output, recover=recover
+    )
+
+
+# Type check the output of translate_file, reporting the translation errors too.
+def run_type_check_translated_file(
+    translate_result: TranslateResult,
+    source: Path,
+    output: Path,
+    *,
+    recover: bool = True,
+) -> TypeCheckResult:
     if translate_result.syntax_error is not None:
         syntax_message = _diag_errors_demangled(
             translate_result.syntax_error,
             source=source,
-            source_code=source.read_text(encoding="utf-8"),
+            source_code=_source_text_of(translate_result),
             module=translate_result.module,
         )
         if not recover:
@@ -296,41 +439,195 @@ def translate_and_run_type_check_file(
     return type_check_result
 
 
+def _init_translate_worker(
+    debug: bool,
+    debug_verbose: bool,
+    translate_cache_enabled: bool,
+    profile_format: Literal["text", "json"] | None,
+) -> None:
+    # Spawned workers do not inherit the module level settings.
+    set_debug_mode(debug)
+    set_debug_verbose(debug_verbose)
+    set_translate_cache_enabled(translate_cache_enabled)
+    set_profile_format(profile_format)
+    if profile_format is not None:
+        start_profiling()
+        # Forked workers inherit the records of the parent.
+        take_profile_records()
+
+
+# Profile records are measured in the worker and returned to be reported.
+def _translate_file_profiled(
+    source: Path, output: Path, *, recover: bool
+) -> tuple[TranslateResult, list[PhaseProfile]]:
+    result = translate_file(source, output, recover=recover)
+    return result, take_profile_records()
+
+
+def _translate_files_parallel(
+    targets: list[tuple[Path, Path]],
+    *,
+    recover: bool,
+    jobs: int,
+) -> dict[Path, TranslateResult]:
+    result: dict[Path, TranslateResult] = {}
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(targets)),
+        initializer=_init_translate_worker,
+        initargs=(
+            is_debug_mode(),
+            is_debug_verbose(),
+            is_translate_cache_enabled(),
+            get_profile_format(),
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(_translate_file_profiled, source, output, recover=recover)
+            for source, output in targets
+        ]
+        # Collect in the walk order, not in the completion order.
+        for (source, output), future in zip(targets, futures):
+            try:
+                result[source], records = future.result()
+                add_profile_records(records)
+            except Exception as e:
+                # e.g. broken worker process. Translate again in this process.
+                debug_print(lambda: f"Parallel translation failed for {source}: {e}")
+                result[source] = translate_file(source, output, recover=recover)
+    return result
+
+
 # Always translate as a module.
 # __init__.py is always created in the output directory.
+def _directory_translate_targets(
+    source_dir: Path,
+    module_output_dir: Path,
+) -> list[tuple[Path, Path]]:
+    targets: list[tuple[Path, Path]] = []
+    module_output_dir.mkdir(parents=True, exist_ok=True)
+    # Sorted to make the order of results and diagnostics deterministic.
+    for source in sorted(source_dir.glob(f"*{TYPHON_EXT}")):
+        targets.append((source, module_output_dir / (source.stem + ".py")))
+    mkdir_and_setup_init_py(module_output_dir)
+    for subdir in sorted(source_dir.iterdir()):
+        if subdir.is_dir():
+            sub_output_dir = module_output_dir / subdir.name
+            sub_output_dir.mkdir(exist_ok=True)
+            targets.extend(_directory_translate_targets(subdir, sub_output_dir))
+    return targets
+
+
+def _resolve_jobs(jobs: int) -> int:
+    # 0 or less means all the available cores.
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
 def translate_directory(
     source_dir: Path,
     module_output_dir: Path,
     *,
     recover: bool = True,
+    jobs: int = 1,
 ) -> dict[Path, TranslateResult]:
-    result: dict[Path, TranslateResult] = {}
     debug_print(
         lambda: (
             f"Translating source directory: {source_dir} to module output_dir: {module_output_dir}"
         )
     )
-    module_output_dir.mkdir(parents=True, exist_ok=True)
-    for source in source_dir.glob(f"*{TYPHON_EXT}"):
-        output_path = module_output_dir / (source.stem + ".py")
-        file_result = translate_file(
-            source,
-            output_path,
-            recover=recover,
-        )
-        result[source] = file_result
-    mkdir_and_setup_init_py(module_output_dir)
-    for subdir in source_dir.iterdir():
-        if subdir.is_dir():
-            sub_output_dir = module_output_dir / subdir.name
-            sub_output_dir.mkdir(exist_ok=True)
-            subdir_result = translate_directory(
-                subdir,
-                sub_output_dir,
-                recover=recover,
+    targets = _directory_translate_targets(source_dir, module_output_dir)
+    return _translate_targets(targets, recover=recover, jobs=jobs)
+
+
+def _translate_targets(
+    targets: list[tuple[Path, Path]],
+    *,
+    recover: bool,
+    jobs: int,
+) -> dict[Path, TranslateResult]:
+    jobs = _resolve_jobs(jobs)
+    if jobs > 1 and len(targets) > 1:
+        return _translate_files_parallel(targets, recover=recover, jobs=jobs)
+    return {
+        source: translate_file(source, output, recover=recover)
+        for source, output in targets
+    }
+
+
+def _affected_targets(
+    targets: list[tuple[Path, Path]],
+    graph: BuildGraph,
+    keys: dict[str, str],
+    module_names: dict[str, str],
+) -> list[tuple[Path, Path]]:
+    # Rebuild also the modules whose output has been removed.
+    current_keys = {
+        canonicalize_path(source): keys[canonicalize_path(source)]
+        if output.exists()
+        else ""
+        for source, output in targets
+    }
+    affected = graph.affected_sources(current_keys, module_names)
+    debug_print(lambda: f"Modules affected by the change: {sorted(affected)}")
+    return [
+        (source, output)
+        for source, output in targets
+        if canonicalize_path(source) in affected
+    ]
+
+
+# Combine the diagnostics of the rebuilt modules and the rest from the last build.
+def _update_build_graph(
+    targets: list[tuple[Path, Path]],
+    graph: BuildGraph | None,
+    keys: dict[str, str],
+    module_names: dict[str, str],
+    translate_results: dict[Path, TranslateResult],
+    type_check_result: TypeCheckResult,
+) -> tuple[BuildGraph, TypeCheckResult]:
+    fresh_diagnostics = diagnostics_by_source(
+        type_check_result.diagnostics,
+        {
+            result.output_path_canonical: result.source_path_canonical
+            for result in translate_results.values()
+        },
+    )
+    new_graph = BuildGraph(module_names=module_names)
+    diagnostics: list[Diagnostic] = []
+    for source, _ in targets:
+        canonical_source = canonicalize_path(source)
+        if source in translate_results:
+            module = translate_results[source].module
+            new_graph.nodes[canonical_source] = ModuleNode(
+                key=keys[canonical_source],
+                imports=extract_imports(
+                    module,
+                    module_names[canonical_source],
+                    is_package_source(source),
+                )
+                if module is not None
+                else set(),
+                diagnostics=fresh_diagnostics.pop(canonical_source, []),
             )
-            result.update(subdir_result)
-    return result
+        elif graph is not None and canonical_source in graph.nodes:
+            new_graph.nodes[canonical_source] = graph.nodes[canonical_source]
+        diagnostics.extend(new_graph.nodes[canonical_source].diagnostics)
+    # Such as generated __init__.py, not belonging to any source.
+    for rest in fresh_diagnostics.values():
+        diagnostics.extend(rest)
+    num_errors = sum(1 for d in diagnostics if d.severity == Severity.ERROR)
+    returncode = type_check_result.returncode
+    if returncode in (0, 1):
+        returncode = 1 if num_errors else 0
+    return new_graph, TypeCheckResult(
+        returncode=returncode,
+        stderr=type_check_result.stderr,
+        files_analyzed=type_check_result.files_analyzed,
+        num_errors=num_errors,
+        num_warnings=sum(1 for d in diagnostics if d.severity == Severity.WARNING),
+        num_info=sum(1 for d in diagnostics if d.severity == Severity.INFO),
+        time_in_sec=type_check_result.time_in_sec,
+        diagnostics=diagnostics,
+    )
 
 
 def translate_and_run_type_check_directory(
@@ -338,12 +635,35 @@ def translate_and_run_type_check_directory(
     module_output_dir: Path,
     *,
     recover: bool = True,
+    jobs: int = 1,
 ) -> TypeCheckResult:
-    translate_results = translate_directory(
-        source_dir,
-        module_output_dir,
-        recover=recover,
+    debug_print(
+        lambda: (
+            f"Translating source directory: {source_dir} to module output_dir: {module_output_dir}"
+        )
+    )
+    targets = _directory_translate_targets(source_dir, module_output_dir)
+    with profile_phase("scan", source_dir):
+        keys = {
+            canonicalize_path(source): translate_cache_key(
+                source, source.read_bytes(), recover
+            )
+            for source, _ in targets
+        }
+    module_names = {
+        canonicalize_path(source): module_name_of(
+            source, source_dir, module_output_dir.name
+        )
+        for source, _ in targets
+    }
+    # Only the changed modules and their reverse dependents since the last build.
+    graph = load_build_graph(module_output_dir)
+    rebuild_targets = (
+        targets
+        if graph is None
+        else _affected_targets(targets, graph, keys, module_names)
     )
+    translate_results = _translate_targets(rebuild_targets, recover=recover, jobs=jobs)
     source_maps = {
         t.output_path_canonical: t.source_map
         for t in translate_results.values()
@@ -358,9 +678,7 @@ def translate_and_run_type_check_directory(
                     _diag_errors_demangled(
                         t.syntax_error,
                         source=Path(t.source_path_canonical),
-                        source_code=Path(t.source_path_canonical).read_text(
-                            encoding="utf-8"
-                        ),
+                        source_code=_source_text_of(t),
                         module=t.module,
                     ),
                     file=sys.stderr,
@@ -379,23 +697,115 @@ def translate_and_run_type_check_directory(
         _print_type_check_result(result, source_maps=source_maps)
         return result
 
-    type_check_result = run_type_check(module_output_dir, run_mode=True)
+    if graph is None:
+        type_check_result = run_type_check(module_output_dir, run_mode=True)
+    elif rebuild_targets:
+        type_check_result = run_type_check(
+            module_output_dir,
+            run_mode=True,
+            files=[output for _, output in rebuild_targets],
+        )
+    else:
+        type_check_result = _type_check_skipped_result()
 
     type_check_result = _merge_translate_result_errors(
         type_check_result,
         list(translate_results.values()),
         source_maps,
     )
+    # A crashed or killed checker reported nothing for the rebuilt modules.
+    # The old graph is kept, so that the next run checks them again.
+    if is_translate_cache_enabled() and type_check_result.returncode in (0, 1):
+        new_graph, type_check_result = _update_build_graph(
+            targets, graph, keys, module_names, translate_results, type_check_result
+        )
+        store_build_graph(module_output_dir, new_graph)
     _print_type_check_result(type_check_result, source_maps=source_maps)
     return type_check_result
 
 
+# Type check result of one file out of the result of the batch.
+def _file_type_check_result(
+    batch_result: TypeCheckResult,
+    diagnostics: list[Diagnostic],
+    translated: bool,
+) -> TypeCheckResult:
+    num_errors = sum(1 for d in diagnostics if d.severity == Severity.ERROR)
+    if not translated:
+        returncode = 1
+    elif batch_result.returncode not in (0, 1):
+        # The checker itself failed.
+        returncode = batch_result.returncode
+    else:
+        returncode = 1 if num_errors > 0 else 0
+    return TypeCheckResult(
+        returncode=returncode,
+        stderr=batch_result.stderr,
+        files_analyzed=1 if translated else 0,
+        num_errors=num_errors,
+        num_warnings=sum(1 for d in diagnostics if d.severity == Severity.WARNING),
+        num_info=sum(1 for d in diagnostics if d.severity == Severity.INFO),
+        time_in_sec=batch_result.time_in_sec,
+        diagnostics=diagnostics,
+    )
+
+
+def translate_and_run_type_check_files(
+    targets: list[tuple[Path, Path]],
+    *,
+    jobs: int = 1,
+) -> dict[Path, tuple[TranslateResult, TypeCheckResult]]:
+    """
+    Translates each (source, output) and type checks all the outputs in one
+    checker run. Returns the translation and the type check result of each source.
+    """
+    translate_results = _translate_targets(targets, recover=True, jobs=jobs)
+    source_maps = {
+        t.output_path_canonical: t.source_map
+        for t in translate_results.values()
+        if t.translated_code is not None
+    }
+    checked_outputs = [
+        Path(t.output_path_canonical)
+        for t in translate_results.values()
+        if t.translated_code is not None
+    ]
+    type_check_result = (
+        run_type_check_files(checked_outputs)
+        if checked_outputs
+        else _type_check_skipped_result()
+    )
+    type_check_result = _merge_translate_result_errors(
+        type_check_result,
+        list(translate_results.values()),
+        source_maps,
+    )
+    source_diagnostics = diagnostics_by_source(
+        type_check_result.diagnostics,
+        {
+            t.output_path_canonical: t.source_path_canonical
+            for t in translate_results.values()
+        },
+    )
+    results: dict[Path, tuple[TranslateResult, TypeCheckResult]] = {}
+    for source, translate_result in translate_results.items():
+        result = _file_type_check_result(
+            type_check_result,
+            source_diagnostics.get(translate_result.source_path_canonical, []),
+            translate_result.translated_code is not None,
+        )
+        _print_type_check_result(result, source_maps=source_maps)
+        results[source] = (translate_result, result)
+    return results
+
+
 def translate(
     source: str,
     *,
     output_dir: str | None = None,
     _o: str | None = None,  # Shorthand for output_dir
     recover: bool = True,
+    jobs: int = 1,
 ):
     """
     Translates the given source code from Typhon language to Python code.
@@ -408,6 +818,7 @@ def translate(
         --output_dir [str]: The directory where the translated Python code will be saved. The default is .typhon directory in the source's parent directory of source.
         -o [str]: Shorthand for output_dir.
         --recover: Continue to type checking when parsing recovered enough to produce an AST.
+        --jobs [int]: Number of processes to translate files in directory, or to parse a huge single file in chunks. 0 means all the cores. The default is 1.
     """
     source_path = Path(source)
     output_dir = shorthand(
@@ -426,12 +837,14 @@ def translate(
             source_path,
             output_file,
             recover=recover,
+            parse_jobs=_resolve_jobs(jobs),
         )
     elif source_path.is_dir():
         result = translate_and_run_type_check_directory(
             source_path,
             output_dir_path / source_path.name,
             recover=recover,
+            jobs=jobs,
         )
     else:
         raise FileNotFoundError(f"Source path '{source}' does not exist.")
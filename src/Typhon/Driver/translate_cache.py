@@ -0,0 +1,161 @@
+import ast
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+from dataclasses import dataclass
+from functools import cache
+from importlib import metadata
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from types import CodeType
+from ..Grammar.syntax_errors import (
+    TyphonTransformSyntaxError,
+    TyphonSyntaxErrorList,
+)
+from ..SourceMap import SourceMap
+from ..Utils.path import TYPHON_CACHE_DIR, canonicalize_path
+from .configs import is_translate_cache_enabled
+from .debugging import debug_print
+
+# Bump when the layout of CachedTranslation changes.
+_CACHE_FORMAT_VERSION = 1
+_TYPHON_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+# Front-end packages whose source affects the translated output.
+_FRONTEND_PACKAGES = ("Grammar", "Transform", "SourceMap")
+
+
+@dataclass
+class CachedTranslation:
+    key: str
+    module: ast.Module
+    source_map: SourceMap | None
+    syntax_error: (
+        SyntaxError | TyphonTransformSyntaxError | TyphonSyntaxErrorList | None
+    )
+    translated_code: str
+
+
+def _typhon_version() -> str:
+    try:
+        return metadata.version("Typhon-Language")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def _frontend_hash() -> str:
+    # Editable installs do not bump the version, so the front-end sources
+    # (including the generated parser, that is the grammar) are hashed too.
+    digest = hashlib.sha256()
+    for package in _FRONTEND_PACKAGES:
+        for file in sorted((_TYPHON_PACKAGE_ROOT / package).rglob("*.py")):
+            digest.update(file.relative_to(_TYPHON_PACKAGE_ROOT).as_posix().encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+# Changes when the Typhon version or the front-end sources change.
+@cache
+def toolchain_key() -> str:
+    return f"{_CACHE_FORMAT_VERSION}:{_typhon_version()}:{_frontend_hash()}"
+
+
+def translate_cache_key(source: Path, source_code: bytes, recover: bool) -> str:
+    digest = hashlib.sha256()
+    digest.update(toolchain_key().encode())
+    # Source map and diagnostics embed the source path.
+    digest.update(canonicalize_path(source).encode())
+    digest.update(b"recover" if recover else b"strict")
+    digest.update(hashlib.sha256(source_code).digest())
+    return digest.hexdigest()
+
+
+def translate_cache_file(output: Path) -> Path:
+    return output.parent / TYPHON_CACHE_DIR / f"{output.stem}.pickle"
+
+
+def load_translate_cache(output: Path, key: str) -> CachedTranslation | None:
+    if not is_translate_cache_enabled():
+        return None
+    cache_file = translate_cache_file(output)
+    try:
+        with cache_file.open("rb") as f:
+            cached = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Broken or incompatible cache is just a miss.
+        debug_print(lambda: f"Failed to load translate cache {cache_file}: {e}")
+        return None
+    if not isinstance(cached, CachedTranslation) or cached.key != key:
+        debug_print(lambda: f"Translate cache is stale: {cache_file}")
+        return None
+    debug_print(lambda: f"Translate cache hit: {cache_file}")
+    return cached
+
+
+def store_translate_cache(output: Path, cached: CachedTranslation) -> None:
+    if not is_translate_cache_enabled():
+        return
+    cache_file = translate_cache_file(output)
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    # Deeply nested expressions exceed the default limit while pickling.
+    recursion_limit = sys.getrecursionlimit()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        sys.setrecursionlimit(max(recursion_limit, 10000))
+        with temp_file.open("wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Replace atomically so that concurrent readers never see a partial file.
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        debug_print(lambda: f"Failed to store translate cache {cache_file}: {e}")
+        temp_file.unlink(missing_ok=True)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+
+def code_cache_file(output: Path) -> Path:
+    # Marshal format depends on the interpreter, as __pycache__ does.
+    return (
+        output.parent
+        / TYPHON_CACHE_DIR
+        / f"{output.stem}.{sys.implementation.cache_tag}.code"
+    )
+
+
+def load_code_cache(output: Path, key: str) -> CodeType | None:
+    if not is_translate_cache_enabled():
+        return None
+    cache_file = code_cache_file(output)
+    try:
+        data = cache_file.read_bytes()
+    except FileNotFoundError:
+        return None
+    header = MAGIC_NUMBER + key.encode()
+    if not data.startswith(header):
+        debug_print(lambda: f"Code cache is stale: {cache_file}")
+        return None
+    try:
+        code = marshal.loads(data[len(header) :])
+    except Exception as e:
+        debug_print(lambda: f"Failed to load code cache {cache_file}: {e}")
+        return None
+    debug_print(lambda: f"Code cache hit: {cache_file}")
+    return code if isinstance(code, CodeType) else None
+
+
+def store_code_cache(output: Path, key: str, code: CodeType) -> None:
+    if not is_translate_cache_enabled():
+        return
+    cache_file = code_cache_file(output)
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file.write_bytes(MAGIC_NUMBER + key.encode() + marshal.dumps(code))
+        os.replace(temp_file, cache_file)
+    except Exception as e:
+        debug_print(lambda: f"Failed to store code cache {cache_file}: {e}")
+        temp_file.unlink(missing_ok=True)
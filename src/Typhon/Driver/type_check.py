@@ -1,7 +1,17 @@
 import sys
 from pathlib import Path
+from typing import Literal
 from ..Typing.pyright import run_pyright, TypeCheckLevel, write_pyright_config
+from ..Typing.pyright_daemon import (
+    run_pyright_daemon,
+    serve_pyright_daemon,
+    spawn_pyright_daemon,
+    stop_pyright_daemon,
+)
 from ..Typing.result_diagnostic import TypeCheckResult
+from .configs import is_type_check_daemon_enabled
+from .debugging import debug_print
+from .profiling import profile_phase
 
 
 def write_config(
@@ -10,14 +20,43 @@ def write_config(
     write_pyright_config(output_dir, level, overwrite)
 
 
-def run_type_check(py_file_or_dir: Path, run_mode: bool = False) -> TypeCheckResult:
+# Only the diagnostics in files are reported if given.
+def run_type_check(
+    py_file_or_dir: Path, run_mode: bool = False, files: list[Path] | None = None
+) -> TypeCheckResult:
     # TODO: Now fixed to pyright, support other type checkers later.
     contained_dir = (
         py_file_or_dir.parent if py_file_or_dir.is_file() else py_file_or_dir
     )
     level = "script" if run_mode else "translate"
     write_config(contained_dir, level)
-    return run_pyright(py_file_or_dir, level)
+    with profile_phase("type_check", py_file_or_dir):
+        if is_type_check_daemon_enabled():
+            result = run_pyright_daemon(py_file_or_dir, files)
+            if result is not None:
+                return result
+            debug_print(
+                lambda: "Checker daemon is not available, fallback to subprocess."
+            )
+        return run_pyright(py_file_or_dir, level, files)
+
+
+# Type check the files in one checker run, even in different directories.
+def run_type_check_files(files: list[Path], run_mode: bool = False) -> TypeCheckResult:
+    level = "script" if run_mode else "translate"
+    contained_dirs = sorted({file.parent for file in files})
+    for contained_dir in contained_dirs:
+        write_config(contained_dir, level)
+    with profile_phase("type_check"):
+        # The daemon serves one directory.
+        if is_type_check_daemon_enabled() and len(contained_dirs) == 1:
+            result = run_pyright_daemon(contained_dirs[0], files)
+            if result is not None:
+                return result
+            debug_print(
+                lambda: "Checker daemon is not available, fallback to subprocess."
+            )
+        return run_pyright(contained_dirs[0], level, files)
 
 
 def type_check(source: str, level: TypeCheckLevel = "translate") -> None:
@@ -32,10 +71,45 @@ def type_check(source: str, level: TypeCheckLevel = "translate") -> None:
         bool: True if type checking passed without errors, False otherwise.
     """
     source_path = Path(source)
-    result = run_pyright(source_path, level)
+    result = None
+    with profile_phase("type_check", source_path):
+        # The user's directory is checked by its own config, not written here.
+        if is_type_check_daemon_enabled():
+            result = run_pyright_daemon(source_path)
+            if result is None:
+                debug_print(
+                    lambda: "Checker daemon is not available, fallback to subprocess."
+                )
+        if result is None:
+            result = run_pyright(source_path, level)
     if result.returncode != 0:
         print(result.stderr, file=sys.stderr)
         raise RuntimeError("Type checking process failed.")
     output_message = result.make_output_message()
     if output_message:
         print(output_message, file=sys.stderr)
+
+
+def checker_daemon(action: Literal["start", "stop", "serve"], directory: str) -> None:
+    """
+    Manages the persistent type checker daemon used by '--checker-daemon' option.
+
+    The daemon keeps the type checker warm for the directory of translated Python files,
+    such as the '.typhon' directory, and exits after 10 minutes of inactivity.
+
+    Usage:
+        action: 'start' to start in background, 'stop' to stop, 'serve' to run in foreground.
+        directory: The directory containing the translated Python files and pyrightconfig.json.
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        raise FileNotFoundError(f"Directory '{directory}' does not exist.")
+    if action == "start":
+        spawn_pyright_daemon(root)
+    elif action == "stop":
+        if not stop_pyright_daemon(root):
+            print(f"No checker daemon is running for '{directory}'.", file=sys.stderr)
+    elif action == "serve":
+        serve_pyright_daemon(root)
+    else:
+        raise ValueError(f"Unknown checker daemon action: {action}")
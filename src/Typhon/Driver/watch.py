@@ -0,0 +1,172 @@
+import os
+import time
+from pathlib import Path
+from ..Typing.pyright_daemon import stop_pyright_daemon
+from ..Typing.result_diagnostic import TypeCheckResult
+from ..Utils.path import TYPHON_EXT, default_output_dir
+from ._utils import shorthand
+from .configs import (
+    is_type_check_daemon_enabled,
+    set_transform_memo_enabled,
+    set_type_check_daemon_enabled,
+)
+from .debugging import debug_print
+from .translate import (
+    translate_and_run_type_check_directory,
+    translate_and_run_type_check_file,
+)
+
+_POLL_INTERVAL_SEC = 0.3
+_DEBOUNCE_SEC = 0.2
+
+type _Snapshot = dict[str, tuple[int, int]]
+
+
+def _scan_sources(source: Path) -> _Snapshot:
+    if source.is_file():
+        stat = source.stat()
+        return {str(source): (stat.st_mtime_ns, stat.st_size)}
+    snapshot: _Snapshot = {}
+    for dirpath, dirnames, filenames in os.walk(source):
+        # Skip output directories such as .typhon and .typhon-server.
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for filename in filenames:
+            if filename.endswith(TYPHON_EXT):
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def _changed_sources(before: _Snapshot, after: _Snapshot) -> list[str]:
+    return sorted(
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    )
+
+
+# Block until sources change, then until they stay unchanged for the debounce.
+def _wait_for_changes(
+    source: Path, snapshot: _Snapshot, interval: float, debounce: float
+) -> _Snapshot:
+    current = snapshot
+    while current == snapshot:
+        time.sleep(interval)
+        current = _scan_sources(source)
+    while True:
+        time.sleep(debounce)
+        latest = _scan_sources(source)
+        if latest == current:
+            return current
+        current = latest
+
+
+def _build(source: Path, output: Path, jobs: int) -> TypeCheckResult:
+    if source.is_file():
+        return translate_and_run_type_check_file(source, output)
+    return translate_and_run_type_check_directory(source, output, jobs=jobs)
+
+
+def _print_batch_summary(target: str, successful: bool, summary: str, begin: float):
+    status = "succeeded" if successful else "failed"
+    print(
+        f"[watch] Build {status} for {target} "
+        f"in {time.perf_counter() - begin:.2f}s ({summary})",
+        flush=True,
+    )
+
+
+# Build one batch. Broken or half saved files must not stop the watcher.
+def _build_batch(target: str, source: Path, output: Path, jobs: int):
+    begin = time.perf_counter()
+    try:
+        result = _build(source, output, jobs)
+    except Exception as e:
+        debug_print(lambda: f"Build of {target} raised: {e!r}")
+        _print_batch_summary(target, False, f"{type(e).__name__}: {e}", begin)
+        return
+    _print_batch_summary(target, result.is_successful(), result.summary(), begin)
+
+
+def watch_loop(
+    source: Path,
+    output: Path,
+    *,
+    jobs: int = 1,
+    interval: float = _POLL_INTERVAL_SEC,
+    debounce: float = _DEBOUNCE_SEC,
+    max_batches: int | None = None,
+) -> None:
+    """
+    Build once, then rebuild incrementally on each settled batch of changes.
+    Returns after max_batches rebuilds if given.
+    """
+    snapshot = _scan_sources(source)
+    _build_batch("initial build", source, output, jobs)
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        current = _wait_for_changes(source, snapshot, interval, debounce)
+        changed = _changed_sources(snapshot, current)
+        snapshot = current
+        debug_print(lambda: f"Changed sources: {changed}")
+        if source.exists():
+            _build_batch(f"{len(changed)} changed file(s)", source, output, jobs)
+        else:
+            print(f"[watch] {source} is removed.", flush=True)
+        batches += 1
+
+
+def watch(
+    source: str,
+    *,
+    output_dir: str | None = None,
+    _o: str | None = None,  # Shorthand for output_dir
+    jobs: int = 1,
+    interval: float = _POLL_INTERVAL_SEC,
+    debounce: float = _DEBOUNCE_SEC,
+):
+    """
+    Watches the given source and translates and type checks the changed files.
+
+    The translated results and the type checker are kept warm between builds,
+    so only the changed modules and the modules importing them are rebuilt.
+    Stop with Ctrl+C.
+
+    Usage:
+        source: The Typhon source file or directory to watch.
+        --output_dir [str]: The directory where the translated Python code will be saved. The default is .typhon directory in the source's parent directory of source.
+        -o [str]: Shorthand for output_dir.
+        --jobs [int]: Number of processes to translate files in directory. 0 means all the cores. The default is 1.
+        --interval [float]: Seconds between polling the source changes. The default is 0.3.
+        --debounce [float]: Seconds the sources must stay unchanged before rebuild. The default is 0.2.
+    """
+    source_path = Path(source)
+    if not source_path.exists():
+        raise FileNotFoundError(f"Source path '{source}' does not exist.")
+    output_dir = shorthand(
+        "--output_dir", output_dir, "-o", _o, default_output_dir(source).as_posix()
+    )
+    output_dir_path = Path(output_dir)
+    output_dir_path.mkdir(parents=True, exist_ok=True)
+    if source_path.is_file():
+        output = output_dir_path / (source_path.stem + ".py")
+        checked_dir = output_dir_path
+    else:
+        output = output_dir_path / source_path.name
+        checked_dir = output
+    # Keep the type checker warm across builds unless already managed by user.
+    own_daemon = not is_type_check_daemon_enabled()
+    set_type_check_daemon_enabled(True)
+    # Edited files are rebuilt reusing their unchanged top level functions.
+    set_transform_memo_enabled(True)
+    try:
+        watch_loop(source_path, output, jobs=jobs, interval=interval, debounce=debounce)
+    except KeyboardInterrupt:
+        print("[watch] Stopped.")
+    finally:
+        if own_daemon:
+            stop_pyright_daemon(checked_dir)
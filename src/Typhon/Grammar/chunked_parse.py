@@ -0,0 +1,260 @@
+import ast
+import token
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from ..Driver.debugging import (
+    debug_print,
+    is_debug_first_error,
+    set_debug_first_error,
+)
+from ..Utils.source_text import SourceText
+from .parser import parse_file, parse_tokenizer
+from .syntax_errors import get_syntax_error_in_module, set_syntax_error
+from .token_factory_custom import token_stream_factory
+from .tokenizer_custom import TokenizerCustom, is_newline
+from .typhon_ast import (
+    SyntaxFeature,
+    get_anonymous_base_name,
+    get_anonymous_name_id,
+    get_syntax_features,
+    is_reparse_target_token_size,
+    set_anonymous_name_id,
+    set_is_reparse_target,
+    set_syntax_features,
+)
+
+# Parse of huge files in chunks of top level statements, in a process pool.
+# With braces, a top level statement ends at a NEWLINE out of any brackets.
+
+# Target number of lines of a chunk. Fixed, not by the number of processes,
+# so that the result does not depend on the number of processes.
+CHUNK_LINES = 2000
+
+
+def _bracket_depth_change(string: str) -> int:
+    # Also for the combined brackets such as "{|", "|}" and "?[".
+    return (
+        string.count("(")
+        + string.count("[")
+        + string.count("{")
+        - string.count(")")
+        - string.count("]")
+        - string.count("}")
+    )
+
+
+def top_level_boundaries(source_text: SourceText) -> list[int]:
+    """
+    0-based lines where a top level statement begins just after another one.
+    Empty if the brackets are not balanced, to parse the whole at once.
+    """
+    tokenizer = TokenizerCustom(
+        token_stream_factory(source_text.line_reader()),
+        path=source_text.path or "",
+        source_text=source_text,
+    )
+    boundaries: list[int] = []
+    depth = 0
+    statement_first: str | None = None
+    newline_line: int | None = None
+    while (tok := tokenizer.getnext()).type != token.ENDMARKER:
+        if newline_line is not None:
+            # The next statement must begin in the following lines.
+            # 1-based line of the NEWLINE is the 0-based next line.
+            if tok.start[0] > newline_line:
+                boundaries.append(newline_line)
+            newline_line = None
+        if is_newline(tok):
+            # Decorators are not separated from the definitions.
+            if depth == 0 and statement_first != "@":
+                newline_line = tok.end[0]
+            statement_first = None
+            continue
+        if statement_first is None:
+            statement_first = tok.string
+        if tok.type == token.OP:
+            depth += _bracket_depth_change(tok.string)
+            if depth < 0:
+                return []
+    if depth != 0:
+        return []
+    return boundaries
+
+
+def split_chunks(
+    boundaries: list[int], line_count: int, chunk_lines: int = CHUNK_LINES
+) -> list[tuple[int, int]]:
+    """Ranges of 0-based lines [begin, end) of at least chunk_lines each."""
+    chunks: list[tuple[int, int]] = []
+    begin = 0
+    for boundary in boundaries:
+        if boundary - begin >= chunk_lines and line_count - boundary >= chunk_lines:
+            chunks.append((begin, boundary))
+            begin = boundary
+    chunks.append((begin, line_count))
+    return chunks
+
+
+def _init_parse_worker(first_error: bool) -> None:
+    set_debug_first_error(first_error)
+
+
+def _parse_chunk(
+    file_path: str,
+    begin_line: int,
+    chunk: str,
+    py_version: Optional[tuple[int, int]],
+    verbose: bool,
+) -> tuple[ast.Module, list[ast.Name], int]:
+    # Tokens are shifted by the lines before the chunk, so that all the positions
+    # are in the file, including the anchor tokens and the syntax errors out of
+    # the AST fields.
+    source_text = SourceText(chunk, file_path)
+    tokenizer = TokenizerCustom(
+        token_stream_factory(source_text.line_reader(), begin_line),
+        path=file_path,
+        verbose=verbose,
+        source_text=source_text,
+        line_offset=begin_line,
+    )
+    parsed = parse_tokenizer(
+        tokenizer,
+        file_path=file_path,
+        py_version=py_version,
+        verbose=verbose,
+        streaming=True,
+    )
+    if not isinstance(parsed, ast.Module):
+        raise SyntaxError(f"Parsing failed: {parsed}")
+    anonymous_names = [
+        node
+        for node in ast.walk(parsed)
+        if isinstance(node, ast.Name) and get_anonymous_name_id(node) is not None
+    ]
+    # Returned together to be pickled as one object graph.
+    return parsed, anonymous_names, tokenizer.all_token_count()
+
+
+def _renumber_anonymous_names(names: list[ast.Name], offset: int) -> int:
+    # Anonymous names are numbered from 0 in each chunk.
+    # Returns the offset for the next chunk.
+    next_offset = offset
+    for name in names:
+        anon_id = get_anonymous_name_id(name)
+        assert anon_id is not None
+        new_id = anon_id + offset
+        name.id = f"{get_anonymous_base_name()}_{new_id}"
+        set_anonymous_name_id(name, new_id)
+        next_offset = max(next_offset, new_id + 1)
+    return next_offset
+
+
+def _parse_chunks(
+    file_path: str,
+    chunks: list[tuple[int, str]],
+    py_version: Optional[tuple[int, int]],
+    verbose: bool,
+    jobs: int,
+) -> list[tuple[ast.Module, list[ast.Name], int]]:
+    if jobs <= 1:
+        return [
+            _parse_chunk(file_path, begin, chunk, py_version, verbose)
+            for begin, chunk in chunks
+        ]
+    results: list[tuple[ast.Module, list[ast.Name], int]] = []
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(chunks)),
+        initializer=_init_parse_worker,
+        initargs=(is_debug_first_error(),),
+    ) as executor:
+        futures = [
+            executor.submit(_parse_chunk, file_path, begin, chunk, py_version, verbose)
+            for begin, chunk in chunks
+        ]
+        for (begin, chunk), future in zip(chunks, futures):
+            try:
+                results.append(future.result())
+            except SyntaxError:
+                raise
+            except Exception as e:
+                # e.g. broken worker process. Parse again in this process.
+                debug_print(lambda: f"Parallel parse failed at line {begin}: {e}")
+                results.append(
+                    _parse_chunk(file_path, begin, chunk, py_version, verbose)
+                )
+    return results
+
+
+def parse_file_chunked(
+    file_path: str,
+    jobs: int,
+    py_version: Optional[tuple[int, int]] = None,
+    verbose: bool = False,
+    source_text: SourceText | None = None,
+    chunk_lines: int = CHUNK_LINES,
+) -> ast.Module:
+    """
+    Parse a large file in chunks of top level statements with jobs processes,
+    and join them into one module. Small files and files with syntax errors
+    are parsed at once.
+    """
+    if source_text is None:
+        source_text = SourceText.from_file(Path(file_path))
+    line_starts = source_text.line_starts
+    line_count = len(line_starts)
+    if line_count < chunk_lines * 2:
+        return parse_file(
+            file_path,
+            py_version=py_version,
+            verbose=verbose,
+            source_text=source_text,
+            streaming=True,
+        )
+    ranges = split_chunks(top_level_boundaries(source_text), line_count, chunk_lines)
+    if len(ranges) == 1:
+        return parse_file(
+            file_path,
+            py_version=py_version,
+            verbose=verbose,
+            source_text=source_text,
+            streaming=True,
+        )
+    debug_print(lambda: f"Parsing {file_path} in {len(ranges)} chunks")
+    text = source_text.text
+    chunks = [
+        (
+            begin,
+            text[line_starts[begin] : line_starts[end] if end < line_count else None],
+        )
+        for begin, end in ranges
+    ]
+    results = _parse_chunks(file_path, chunks, py_version, verbose, jobs)
+    if any(get_syntax_error_in_module(parsed) for parsed, _, _ in results):
+        # Error recovery skips tokens across the chunks. Parse again at once
+        # for the same recovery and errors.
+        debug_print(lambda: f"Syntax error in chunks, parsing {file_path} at once")
+        return parse_file(
+            file_path,
+            py_version=py_version,
+            verbose=verbose,
+            source_text=source_text,
+            streaming=True,
+        )
+    body: list[ast.stmt] = []
+    type_ignores: list[ast.TypeIgnore] = []
+    anonymous_offset = 0
+    token_count = 0
+    features = SyntaxFeature(0)
+    for parsed, anonymous_names, chunk_token_count in results:
+        anonymous_offset = _renumber_anonymous_names(anonymous_names, anonymous_offset)
+        body.extend(parsed.body)
+        type_ignores.extend(parsed.type_ignores)
+        token_count += chunk_token_count
+        features |= get_syntax_features(parsed)
+    module = ast.Module(body=body, type_ignores=type_ignores)
+    set_syntax_error(module, [])
+    set_is_reparse_target(module, is_reparse_target_token_size(token_count))
+    set_syntax_features(module, features)
+    return module
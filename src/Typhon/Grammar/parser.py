@@ -1,6 +1,4 @@
 import ast
-import importlib
-import sys
 import io
 from pathlib import Path
 
@@ -13,59 +11,50 @@ from Typhon.Grammar.typhon_ast import (
 
 
 from ..Driver.debugging import is_debug_verbose
+from ..Utils.source_text import SourceText
+from .rule_profile import RuleProfiler
 
 from .tokenizer_custom import TokenizerCustom, show_token
 from .token_factory_custom import token_stream_factory
-from .typhon_ast_error import gather_errors
 
-# We need to patch to the pegen parser to optimize memorization functions.
-import pegen.parser as pegen_parser
-from . import parser_patch
-
-
-# Monkey patching mechanism.
-def _load_typhon_parser_module():
-    # import or reload the generated parser module
-    module_name = f"{__package__}._typhon_parser"
-    if module_name in sys.modules:
-        return importlib.reload(sys.modules[module_name])
-    return importlib.import_module("._typhon_parser", package=__package__)
-
-
-def _install_parser_patch():
-    pegen_parser.memoize = parser_patch.memoize
-    pegen_parser.memoize_left_rec = parser_patch.memoize_left_rec
-    parser_patch.redecorate_pegen_parser_base_methods()
-    return _load_typhon_parser_module()
-
-
-# Semantically equal to,
-# from . import _typhon_parser as _TYPHON_PARSER_MODULE
-_TYPHON_PARSER_MODULE = _install_parser_patch()
+# Generated with the memoize decorators of parser_patch. See typhon.gram @header.
+from . import _typhon_parser as _TYPHON_PARSER_MODULE
 
 
 def parse_file(
     file_path: str,
     py_version: Optional[tuple[int, int]] = None,
     verbose: bool = False,
+    source_text: SourceText | None = None,
+    streaming: bool = False,
+    rule_profiler: RuleProfiler | None = None,
 ) -> ast.Module:
-    """Parse a file."""
-    with open(file_path) as f:
-        if is_debug_verbose():
-            show_token(Path(file_path).read_text())
-        tok_stream = token_stream_factory(f.readline)
-        tokenizer = TokenizerCustom(tok_stream, verbose=verbose, path=file_path)
-        parsed = parse_tokenizer(
-            tokenizer,
-            file_path=file_path,
-            py_version=py_version,
-            verbose=verbose,
-        )
-        if not isinstance(parsed, ast.Module):
-            raise SyntaxError(f"Parsing failed: {parsed}")
-        assert isinstance(parsed, ast.Module), f"Parsing failed: {parsed}"
-        gather_errors(parsed)
-        return parsed
+    """
+    Parse a file. The file is not read again if source_text is given.
+    With streaming, the memory for parsing is bounded by the largest top level
+    statement instead of the whole file.
+    Statistics of each grammar rule are recorded to rule_profiler if given.
+    """
+    if source_text is None:
+        source_text = SourceText.from_file(Path(file_path))
+    if is_debug_verbose():
+        show_token(source_text.text)
+    tok_stream = token_stream_factory(source_text.line_reader())
+    tokenizer = TokenizerCustom(
+        tok_stream, verbose=verbose, path=file_path, source_text=source_text
+    )
+    parsed = parse_tokenizer(
+        tokenizer,
+        file_path=file_path,
+        py_version=py_version,
+        verbose=verbose,
+        streaming=streaming,
+        rule_profiler=rule_profiler,
+    )
+    if not isinstance(parsed, ast.Module):
+        raise SyntaxError(f"Parsing failed: {parsed}")
+    assert isinstance(parsed, ast.Module), f"Parsing failed: {parsed}"
+    return parsed
 
 
 def parse_tokenizer(
@@ -73,6 +62,8 @@ def parse_tokenizer(
     file_path: str | None = None,
     py_version: Optional[tuple[int, int]] = None,
     verbose: bool = False,
+    streaming: bool = False,
+    rule_profiler: RuleProfiler | None = None,
 ) -> ast.AST:
     """Parse using a tokenizer."""
     parsed = _TYPHON_PARSER_MODULE.parse(
@@ -81,12 +72,13 @@ def parse_tokenizer(
         mode="file",
         py_version=py_version,
         verbose=verbose,
+        streaming=streaming,
+        rule_profiler=rule_profiler,
     )
     # Must be successful parse
     assert isinstance(parsed, ast.AST), f"Parsing failed: {parsed}"
-    gather_errors(parsed)
     set_is_reparse_target(
-        parsed, is_reparse_target_token_size(len(tokenizer.read_all_tokens()))
+        parsed, is_reparse_target_token_size(tokenizer.all_token_count())
     )
     return parsed
 
@@ -107,8 +99,6 @@ def parse_string(
         py_version=py_version,
         verbose=verbose,
     )
-    if parsed:
-        gather_errors(parsed)
     return parsed
 
 
@@ -144,5 +134,4 @@ def parse_type(
         verbose=verbose,
     )
     assert isinstance(parsed, ast.Expression), f"Type parsing failed: {parsed}"
-    gather_errors(parsed)
     return parsed.body
@@ -28,6 +28,9 @@ from typing import (
 from pegen.tokenizer import Tokenizer
 from pegen.parser import Parser as PegenParser
 from ..Driver.debugging import is_debug_first_error
+from .parser_patch import MemoTable, redecorated_pegen_parser_base_methods
+from .rule_profile import RuleProfiler
+from .tokenizer_custom import TokenizerCustom
 from .position import PosAttributes
 from .typhon_ast import (
     set_anonymous_name_id,
@@ -100,6 +103,8 @@ class Parser(PegenParser):
         verbose: bool = False,
         filename: str = "<unknown>",
         py_version: tuple[int, int] | None = None,
+        streaming: bool = False,
+        rule_profiler: RuleProfiler | None = None,
     ) -> None:
         super().__init__(tokenizer, verbose=verbose)
         self.filename = filename
@@ -108,6 +113,20 @@ class Parser(PegenParser):
         )
         # Note "invalid_*" rules returns None. Cannot use for error recovery.
         self.call_invalid_rules = True
+        # Packrat memo table indexed by token mark. See parser_patch.memoize.
+        self._memo: MemoTable = []
+        # Streaming parse discards the memo and tokens behind the top level statements.
+        self._streaming = streaming
+        self._committed_mark = 0
+        self._evicted_mark = 0
+        # Memo hits are recorded only in the slow path of memoize wrappers.
+        self._rule_profiler = rule_profiler
+        self._slow_path = verbose or rule_profiler is not None
+        if rule_profiler is not None:
+            self._reset = rule_profiler.counting_reset(tokenizer.reset)
+        # Registry of the errors built during the parse, including the ones in
+        # the backtracked alternatives.
+        self.built_syntax_errors: list[SyntaxError] = []
 
     def parse(self, rule: str, call_invalid_rules: bool = True) -> Optional[ast.AST]:
         old = self.call_invalid_rules
@@ -125,7 +144,7 @@ class Parser(PegenParser):
                 # Reset the parser cache to be able to restart parsing from the
                 # beginning.
                 self._reset(0)  # type: ignore
-                self._cache.clear()
+                self._memo.clear()
 
                 res = getattr(self, rule)()
 
@@ -135,6 +154,25 @@ class Parser(PegenParser):
 
         return res
 
+    def commit_top_level_statement(self, stmts: list[ast.stmt]) -> list[ast.stmt]:
+        """
+        Called when a top level statement is parsed. The parser never backtracks
+        before it, so the streaming parse discards the memo entries and tokens
+        before the previous top level statement.
+        """
+        if self._streaming:
+            self._evict_before(self._committed_mark)
+            self._committed_mark = self._mark()
+        return stmts
+
+    def _evict_before(self, mark: int) -> None:
+        memo = self._memo
+        for index in range(self._evicted_mark, min(mark, len(memo))):
+            memo[index] = None
+        self._evicted_mark = max(self._evicted_mark, mark)
+        if isinstance(self._tokenizer, TokenizerCustom):
+            self._tokenizer.evict_tokens_before(mark)
+
     def check_version(
         self, min_version: Tuple[int, ...], error_msg: str, node: Node
     ) -> Node:
@@ -400,6 +438,7 @@ class Parser(PegenParser):
         result = error_type(message, args)
         if is_debug_first_error():
             raise result
+        self.built_syntax_errors.append(result)
         return result
 
     def build_expected_error(
@@ -513,3 +552,9 @@ class Parser(PegenParser):
     def raise_syntax_error_on_next_token(self, message: str) -> SyntaxError:
         next_token = self._tokenizer.peek()
         return self.build_syntax_error(message, next_token.start, next_token.end)
+
+
+# Defined in the subclass, not to modify pegen.parser.Parser.
+for _name, _method in redecorated_pegen_parser_base_methods().items():
+    if _name not in Parser.__dict__:
+        setattr(Parser, _name, _method)
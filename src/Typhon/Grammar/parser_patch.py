@@ -1,50 +1,124 @@
 # pyright: reportPrivateUsage=false
-# Patch to pegen.parser to replace memoize, memoize_left_rec decorators implementation because of performance issues.
+# memoize, memoize_left_rec decorators replacing the ones of pegen.parser because of performance issues.
+# The generated parser imports them from here. pegen.parser itself is not modified.
 
+from itertools import repeat
 from typing import Any, cast, Callable, Optional
 from pegen.parser import T, P, F
-import pegen.parser as pegen_parser
 from pegen.parser import Parser as PegenParser
+from .rule_profile import RuleProfiler
+
+
+# Memo table of packrat parsing.
+# Indexed by token mark, each slot maps the rule id to (tree, endmark).
+# Rules with arguments use (rule id, args) as the key.
+type MemoKey = int | tuple[int, tuple[object, ...]]
+type MemoTable = list[dict[MemoKey, tuple[Any, int]] | None]
+
+# Dense integer ids of the memoized rules, given when the rules are decorated.
+_rule_ids: dict[str, int] = {}
+
+
+def rule_id(method_name: str) -> int:
+    return _rule_ids.setdefault(method_name, len(_rule_ids))
+
+
+# Attributes of the memoized parsers. Only for typing, set by Typhon's Parser
+# or _init_memo_table.
+class _MemoizedParser(PegenParser):
+    _memo: MemoTable
+    _rule_profiler: RuleProfiler | None
+    _slow_path: bool
+
+
+# pegen parsers other than Typhon's do not initialize the table.
+def _init_memo_table(parser: _MemoizedParser) -> MemoTable:
+    memo: MemoTable = []
+    parser._memo = memo
+    parser._rule_profiler = None
+    parser._slow_path = parser._verbose
+    return memo
+
+
+def _call_profiled(
+    profiler: RuleProfiler, method_name: str, call: Callable[[], Any]
+) -> Any:
+    profiler.enter(method_name)
+    tree = None
+    try:
+        tree = call()
+    finally:
+        profiler.exit(method_name, tree)
+    return tree
+
+
+def _memo_store(
+    memo: MemoTable, mark: int, key: MemoKey, entry: tuple[Any, int]
+) -> None:
+    if mark >= len(memo):
+        memo.extend(repeat(None, mark + 1 - len(memo)))
+    slot = memo[mark]
+    if slot is None:
+        slot = memo[mark] = {}
+    slot[key] = entry
+
+
+def _memo_lookup(memo: MemoTable, mark: int, key: MemoKey) -> tuple[Any, int] | None:
+    slot = memo[mark] if mark < len(memo) else None
+    return slot.get(key) if slot is not None else None
 
 
-# TODO: Monkey patching for memo of parser to optimize
 def memoize(method: F) -> F:
     """Memoize a symbol method."""
     method_name = method.__name__
+    method_id = rule_id(method_name)
 
-    def memoize_wrapper(self: PegenParser, *args: object) -> Any:
+    def memoize_wrapper(self: _MemoizedParser, *args: object) -> Any:
         mark = self._mark()
-        key = mark, method_name, args
-        # Fast path: cache hit, and not verbose.
-        key_in_cache = key in self._cache
-        if key_in_cache and not self._verbose:
-            tree, endmark = self._cache[key]
-            self._reset(endmark)
-            return tree
-        # Slow path: no cache hit, or verbose.
+        key: MemoKey = (method_id, args) if args else method_id
+        try:
+            memo = self._memo
+        except AttributeError:
+            memo = _init_memo_table(self)
+        # Fast path: cache hit, and not verbose nor profiling. Lookup is inlined.
+        slot = memo[mark] if mark < len(memo) else None
+        entry = slot.get(key) if slot is not None else None
+        if entry is not None and not self._slow_path:
+            self._reset(entry[1])
+            return entry[0]
+        # Slow path: no cache hit, verbose or profiling.
         verbose = self._verbose
+        profiler = self._rule_profiler
         argsr = ""
         fill = ""
         if verbose:  # Optimized
             argsr = ",".join(repr(arg) for arg in args)
             fill = "  " * self._level
-        if not key_in_cache:
+        if entry is None:
             if verbose:
                 print(
                     f"{fill}{method_name}({argsr}) ... (looking at {self.showpeek()})"
                 )
             self._level += 1
-            tree = method(self, *args)
+            if profiler is None:
+                tree = method(self, *args)
+            else:
+                tree = _call_profiled(
+                    profiler, method_name, lambda: method(self, *args)
+                )
             self._level -= 1
             if verbose:
                 print(f"{fill}... {method_name}({argsr}) -> {tree!s:.200}")
             endmark = self._mark()
-            self._cache[key] = tree, endmark
+            _memo_store(memo, mark, key, (tree, endmark))
         else:
-            tree, endmark = self._cache[key]
+            tree, endmark = entry
             if verbose:
                 print(f"{fill}{method_name}({argsr}) -> {tree!s:.200}")
-            self._reset(endmark)
+            if profiler is not None:
+                profiler.hit(method_name)
+            # Not a backtrack counted by the profiler.
+            self._tokenizer.reset(endmark)
         return tree
 
     memoize_wrapper.__wrapped__ = method  # type: ignore
@@ -54,25 +128,31 @@ def memoize(method: F) -> F:
 def memoize_left_rec(method: Callable[[P], Optional[T]]) -> Callable[[P], Optional[T]]:
     """Memoize a left-recursive symbol method."""
     method_name = method.__name__
+    key = rule_id(method_name)
 
-    def memoize_left_rec_wrapper(self: PegenParser) -> Optional[T]:
+    def memoize_left_rec_wrapper(self: _MemoizedParser) -> Optional[T]:
         mark = self._mark()
-        key = mark, method_name, ()
-        # Fast path: cache hit, and not verbose.
-        key_in_cache = key in self._cache
-        if key_in_cache and not self._verbose:
-            tree, endmark = self._cache[key]
-            self._reset(endmark)
-            return tree
-        # Slow path: no cache hit, or verbose.
+        try:
+            memo = self._memo
+        except AttributeError:
+            memo = _init_memo_table(self)
+        entry = _memo_lookup(memo, mark, key)
+        # Fast path: cache hit, and not verbose nor profiling.
+        if entry is not None and not self._slow_path:
+            self._reset(entry[1])
+            return entry[0]
+        # Slow path: no cache hit, verbose or profiling.
         verbose = self._verbose
+        profiler = self._rule_profiler
         fill = ""
         if verbose:
             fill = "  " * self._level
-        if not key_in_cache:
+        if entry is None:
             if verbose:
                 print(f"{fill}{method_name} ... (looking at {self.showpeek()})")
             self._level += 1
+            if profiler is not None:
+                profiler.enter(method_name)
 
             # For left-recursive rules we manipulate the cache and
             # loop until the rule shows no progress, then pick the
@@ -83,7 +163,7 @@ def memoize_left_rec(method: Callable[[P], Optional[T]]) -> Callable[[P], Option
             # (http://web.cs.ucla.edu/~todd/research/pub.php?id=pepm08).
 
             # Prime the cache with a failure.
-            self._cache[key] = None, mark
+            _memo_store(memo, mark, key, (None, mark))
             lastresult, lastmark = None, mark
             depth = 0
             if verbose:
@@ -93,7 +173,7 @@ def memoize_left_rec(method: Callable[[P], Optional[T]]) -> Callable[[P], Option
                 self._reset(mark)
                 self.in_recursive_rule += 1
                 try:
-                    result = method(self)
+                    result = method(cast(P, self))
                 finally:
                     self.in_recursive_rule -= 1
                 endmark = self._mark()
@@ -110,11 +190,14 @@ def memoize_left_rec(method: Callable[[P], Optional[T]]) -> Callable[[P], Option
                     if verbose:
                         print(f"{fill}Bailing with {lastresult!s:.200} to {lastmark}")
                     break
-                self._cache[key] = lastresult, lastmark = result, endmark
+                lastresult, lastmark = result, endmark
+                _memo_store(memo, mark, key, (lastresult, lastmark))
 
             self._reset(lastmark)
             tree = lastresult
 
+            if profiler is not None:
+                profiler.exit(method_name, tree)
             self._level -= 1
             if verbose:
                 print(f"{fill}{method_name}() -> {tree!s:.200} [cached]")
@@ -123,17 +206,19 @@ def memoize_left_rec(method: Callable[[P], Optional[T]]) -> Callable[[P], Option
             else:
                 endmark = mark
                 self._reset(endmark)
-            self._cache[key] = tree, endmark
+            _memo_store(memo, mark, key, (tree, endmark))
         else:
-            tree, endmark = self._cache[key]
+            tree, endmark = entry
             if verbose:
                 print(f"{fill}{method_name}() -> {tree!s:.200} [fresh]")
+            if profiler is not None:
+                profiler.hit(method_name)
             if tree:
-                self._reset(endmark)
+                self._tokenizer.reset(endmark)
         return tree
 
     memoize_left_rec_wrapper.__wrapped__ = method  # type: ignore
-    return memoize_left_rec_wrapper
+    return cast(Callable[[P], Optional[T]], memoize_left_rec_wrapper)
 
 
 # Methods that should not be re-decorated with memoize because
@@ -148,23 +233,19 @@ _SKIP_MEMOIZE_METHODS = {
 }
 
 
-# Re decorate the base methods of pegen.parser.Parser with our memoization decorators.
-# Methods listed in _SKIP_MEMOIZE_METHODS have their original @memoize stripped entirely.
-def redecorate_pegen_parser_base_methods() -> None:
-    parser_cls = pegen_parser.Parser
-    for name, attr in list(parser_cls.__dict__.items()):
+# Base methods of pegen.parser.Parser decorated with our memoization decorators,
+# to be defined in the subclass. Methods listed in _SKIP_MEMOIZE_METHODS have
+# their original @memoize stripped entirely.
+def redecorated_pegen_parser_base_methods() -> dict[str, Callable[..., Any]]:
+    methods: dict[str, Callable[..., Any]] = {}
+    for name, attr in PegenParser.__dict__.items():
         if not callable(attr):
             continue
         wrapped = getattr(attr, "__wrapped__", None)
         if wrapped is None:
             continue
-        if getattr(attr, "__typhon_patched__", False):
-            continue
         if name in _SKIP_MEMOIZE_METHODS:
-            # Strip memoize entirely: restore the unwrapped original method.
-            setattr(wrapped, "__typhon_patched__", True)
-            setattr(parser_cls, name, wrapped)
+            methods[name] = wrapped
         else:
-            patched = pegen_parser.memoize(wrapped)
-            setattr(patched, "__typhon_patched__", True)
-            setattr(parser_cls, name, patched)
+            methods[name] = memoize(wrapped)
+    return methods
@@ -0,0 +1,123 @@
+import json
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Callable, Literal
+
+# Per grammar rule profile of the parser, recorded by the memoize wrappers.
+
+type RuleSortKey = Literal[
+    "calls", "memo_hits", "backtracks", "cumulative_sec", "self_sec"
+]
+
+
+@dataclass
+class RuleStats:
+    rule: str
+    # Invocations including memo hits.
+    calls: int = 0
+    memo_hits: int = 0
+    # Invocations that did not match.
+    failures: int = 0
+    # Resets to the start of a failed alternative or a lookahead inside the rule.
+    backtracks: int = 0
+    # Time of the outermost invocations, including the called rules.
+    cumulative_sec: float = 0.0
+    # Time excluding the called rules.
+    self_sec: float = 0.0
+
+    @property
+    def memo_hit_rate(self) -> float:
+        return self.memo_hits / self.calls if self.calls else 0.0
+
+
+class _Frame:
+    __slots__ = ("stats", "begin", "children_sec")
+
+    def __init__(self, stats: RuleStats, begin: float):
+        self.stats = stats
+        self.begin = begin
+        self.children_sec = 0.0
+
+
+class RuleProfiler:
+    """
+    Opt-in profile of the grammar rules. Pass to parse_file to record.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, RuleStats] = {}
+        self._frames: list[_Frame] = []
+        # Recursion depth of each rule, to count the cumulative time once.
+        self._active: dict[str, int] = {}
+
+    def _stats_of(self, rule: str) -> RuleStats:
+        stats = self.stats.get(rule)
+        if stats is None:
+            stats = self.stats[rule] = RuleStats(rule)
+        return stats
+
+    def hit(self, rule: str) -> None:
+        stats = self._stats_of(rule)
+        stats.calls += 1
+        stats.memo_hits += 1
+
+    def enter(self, rule: str) -> None:
+        stats = self._stats_of(rule)
+        stats.calls += 1
+        self._active[rule] = self._active.get(rule, 0) + 1
+        self._frames.append(_Frame(stats, perf_counter()))
+
+    def exit(self, rule: str, tree: object) -> None:
+        frame = self._frames.pop()
+        elapsed = perf_counter() - frame.begin
+        stats = frame.stats
+        if not tree:
+            stats.failures += 1
+        stats.self_sec += elapsed - frame.children_sec
+        self._active[rule] -= 1
+        if self._active[rule] == 0:
+            stats.cumulative_sec += elapsed
+        if self._frames:
+            self._frames[-1].children_sec += elapsed
+
+    def counting_reset(self, reset: Callable[[int], None]) -> Callable[[int], None]:
+        # Generated rules reset the mark after each failed alternative.
+        frames = self._frames
+
+        def reset_and_count(mark: int) -> None:
+            if frames:
+                frames[-1].stats.backtracks += 1
+            reset(mark)
+
+        return reset_and_count
+
+    def sorted_stats(self, sort_key: RuleSortKey = "self_sec") -> list[RuleStats]:
+        return sorted(
+            self.stats.values(),
+            key=lambda stats: getattr(stats, sort_key),
+            reverse=True,
+        )
+
+    def format_report(
+        self, sort_key: RuleSortKey = "self_sec", limit: int | None = None
+    ) -> str:
+        lines = [
+            f"{'rule':<40} {'calls':>9} {'hit%':>6} {'failures':>9} "
+            f"{'backtracks':>10} {'cum(s)':>9} {'self(s)':>9}"
+        ]
+        for stats in self.sorted_stats(sort_key)[:limit]:
+            lines.append(
+                f"{stats.rule:<40} {stats.calls:>9} {stats.memo_hit_rate * 100:>6.1f} "
+                f"{stats.failures:>9} {stats.backtracks:>10} "
+                f"{stats.cumulative_sec:>9.4f} {stats.self_sec:>9.4f}"
+            )
+        return "\n".join(lines)
+
+    def to_json(self, sort_key: RuleSortKey = "self_sec") -> str:
+        return json.dumps(
+            [
+                {**asdict(stats), "memo_hit_rate": stats.memo_hit_rate}
+                for stats in self.sorted_stats(sort_key)
+            ],
+            indent=2,
+        )
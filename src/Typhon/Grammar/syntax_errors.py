@@ -6,6 +6,7 @@ from typing import Unpack, Callable
 from ..Driver.diagnostic import diag_error_file_position, positioned_source_code
 from ..SourceMap.datatype import Range
 from ..Driver.debugging import debug_print, is_debug_first_error
+from ..Utils.source_text import SourceText
 
 
 _ERROR_NODE = "_typh_error_node"
@@ -58,6 +59,16 @@ class TyphonTransformSyntaxError(SyntaxError):
     def __str__(self):
         return f"{self.message}"
 
+    # Default exception pickling calls __init__(*args) without the position.
+    def __reduce__(self):
+        return (_rebuild_transform_syntax_error, (type(self), self.message, self.pos))
+
+
+def _rebuild_transform_syntax_error(
+    cls: type[TyphonTransformSyntaxError], message: str, pos: PosAttributes
+) -> TyphonTransformSyntaxError:
+    return cls(message, **pos)
+
 
 def set_syntax_error(node: ast.AST, error_details: list[SyntaxError]):
     setattr(node, _SYNTAX_ERROR_IN_MODULE, error_details)
@@ -191,19 +202,20 @@ def raise_must_have_resolved(msg: str):
 def diag_error(
     syntax_error: SyntaxError | TyphonTransformSyntaxError,
     source: Path,
-    source_code: str,
+    source_code: str | SourceText,
 ) -> str:
+    source_lines = SourceText.of(source_code).lines
     result = diag_error_file_position(
         error_type="syntax error",
         file_path=source.as_posix(),
         position=_get_range_of_error(syntax_error),
         rule=None,
-        source_lines=source_code.splitlines(),
+        source_lines=source_lines,
         message=syntax_error_message(syntax_error),
     )
     result += "\n\n"
     result += positioned_source_code(
-        source_lines=source_code.splitlines(),
+        source_lines=source_lines,
         range_in_source=_get_range_of_error(syntax_error),
     )
     return result
@@ -212,11 +224,13 @@ def diag_error(
 def diag_errors(
     syntax_error: SyntaxError | TyphonTransformSyntaxError | TyphonSyntaxErrorList,
     source: Path,
-    source_code: str,
+    source_code: str | SourceText,
 ) -> str:
+    # Split lines only once for all the errors.
+    source_text = SourceText.of(source_code)
     if isinstance(syntax_error, TyphonSyntaxErrorList):
         return "\n".join(
-            diag_error(error, source, source_code) for error in syntax_error.errors
+            diag_error(error, source, source_text) for error in syntax_error.errors
         )
     else:
-        return diag_error(syntax_error, source, source_code)
+        return diag_error(syntax_error, source, source_text)
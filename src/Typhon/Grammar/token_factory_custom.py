@@ -79,6 +79,12 @@ class _Str:
         return self.prefix.is_fstring
 
 
+# Line without string quotes, nor comments other than a trailing line comment.
+# Such a line in normal code is passed through by _LineParser as it is.
+_PLAIN_LINE = re.compile(r"[^'\"#]*(?:#+(?![#(]).*)?", re.DOTALL)
+_LINE_HEAD_SPACES = re.compile(r"[ \t]*")
+
+
 # Line parser that handles block comments and strings.
 # This is ONLY for implementing block comments that can span multiple lines.
 class _LineParser:
@@ -337,7 +343,7 @@ class _LineParser:
         self, line: str, line_head_in_string_or_comment: bool
     ) -> str:
         if not line_head_in_string_or_comment:
-            match = re.match(r"[ \t]*", line)
+            match = _LINE_HEAD_SPACES.match(line)
             if match:
                 self.line_head_spaces.append(match.group(0))
                 return line[match.end() :]
@@ -354,6 +360,16 @@ class _LineParser:
     # They are valid in f-string expressions.
     def parse_next_line(self) -> str:
         self._next_line()
+        # Fast path: no state to track in the line.
+        if (
+            not self.in_string
+            and not self.in_comment
+            and not self.block_comment_begin_stack
+            and not self.interpolation_stack
+            and not self.str_context
+            and _PLAIN_LINE.fullmatch(self.line)
+        ):
+            return self._cut_line_head_spaces(self.line, False)
         ch = ""
         line_head_in_string_or_comment = self.in_string or self.in_comment
         while True:
@@ -406,6 +422,7 @@ def _generate_and_postprocess_tokens(
     readline: Callable[[], str],  # After block comment is processed.
     unconsumed_block_comment: list[_BlockComment],
     head_space_lines: list[str],
+    line_offset: int,
 ) -> Iterator[TokenInfo]:
     """Generate tokens from readline, handling head space and  block comments."""
     line_offset_already_consumed = 0
@@ -473,8 +490,11 @@ def _generate_and_postprocess_tokens(
                 yield TokenInfo(
                     type=tokenize.COMMENT,
                     string=block_comment.comment,
-                    start=(block_comment.start_line, block_comment.start_col),
-                    end=(block_comment.end_line, block_comment.end_col),
+                    start=(
+                        block_comment.start_line + line_offset,
+                        block_comment.start_col,
+                    ),
+                    end=(block_comment.end_line + line_offset, block_comment.end_col),
                     line=block_comment.lines,
                 )
             # The length of the last line of block comment.
@@ -539,8 +559,8 @@ def _generate_and_postprocess_tokens(
         yield TokenInfo(
             type=_regularize_token_type(tok.type),
             string=tok.string,
-            start=(adjusted_start_line, adjusted_start_col),
-            end=(adjusted_end_line, adjusted_end_col),
+            start=(adjusted_start_line + line_offset, adjusted_start_col),
+            end=(adjusted_end_line + line_offset, adjusted_end_col),
             line=tok.line,
         )
     for block_comment in unconsumed_block_comment:
@@ -555,17 +575,21 @@ def _generate_and_postprocess_tokens(
             yield TokenInfo(
                 type=tokenize.COMMENT,
                 string=block_comment.comment,
-                start=(block_comment.start_line, block_comment.start_col),
-                end=(block_comment.end_line, block_comment.end_col),
+                start=(block_comment.start_line + line_offset, block_comment.start_col),
+                end=(block_comment.end_line + line_offset, block_comment.end_col),
                 line=block_comment.lines,
             )
 
 
-def token_stream_factory(readline: Callable[[], str]) -> Iterator[TokenInfo]:
+def token_stream_factory(
+    readline: Callable[[], str], line_offset: int = 0
+) -> Iterator[TokenInfo]:
+    # Lines of the tokens are shifted by line_offset, for a part of a file.
     line_parser = _LineParser(readline)
 
     yield from _generate_and_postprocess_tokens(
         line_parser.parse_next_line,
         line_parser.outermost_block_comments,
         line_parser.line_head_spaces,
+        line_offset,
     )
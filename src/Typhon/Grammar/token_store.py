@@ -0,0 +1,143 @@
+from array import array
+from typing import Iterator
+from tokenize import NAME, OP, TokenInfo
+
+
+class TokenStore:
+    """
+    Tokens stored in parallel int columns. Names and operators are shared by
+    the same strings, lines are held once, and TokenInfo is built on access.
+    Indexes are kept after the tokens before them are evicted.
+    """
+
+    __slots__ = (
+        "_types",
+        "_start_lines",
+        "_start_cols",
+        "_end_lines",
+        "_end_cols",
+        "_strings",
+        "_shared_strings",
+        "_line_ids",
+        "_lines",
+        "_lines_evicted",
+        "_evicted",
+        "end",
+        "_view_index",
+        "_view",
+    )
+
+    def __init__(self):
+        self._types = array("i")
+        self._start_lines = array("i")
+        self._start_cols = array("i")
+        self._end_lines = array("i")
+        self._end_cols = array("i")
+        self._strings: list[str] = []
+        # Names and operators repeat in a source, so the same string is shared.
+        self._shared_strings: dict[str, str] = {}
+        self._line_ids = array("i")
+        self._lines: list[str] = []
+        # Number of lines and tokens evicted from the head of the columns.
+        self._lines_evicted = 0
+        self._evicted = 0
+        # Index after the last token. Same as len(), without the call overhead.
+        self.end = 0
+        # The parser peeks the same token repeatedly, so the last view is kept.
+        self._view_index = -1
+        self._view: TokenInfo | None = None
+
+    def _line_id(self, line: str) -> int:
+        # Tokens on the same line come in a row.
+        lines = self._lines
+        if not lines or lines[-1] != line:
+            lines.append(line)
+        return self._lines_evicted + len(lines) - 1
+
+    def append(self, tok: TokenInfo) -> None:
+        tok_type, string, (start_line, start_col), (end_line, end_col), line = tok
+        self._types.append(tok_type)
+        self._start_lines.append(start_line)
+        self._start_cols.append(start_col)
+        self._end_lines.append(end_line)
+        self._end_cols.append(end_col)
+        if tok_type == NAME or tok_type == OP:
+            string = self._shared_strings.setdefault(string, string)
+        self._strings.append(string)
+        self._line_ids.append(self._line_id(line))
+        self.end += 1
+
+    def __len__(self) -> int:
+        return self.end
+
+    def __bool__(self) -> bool:
+        return len(self._types) > 0
+
+    def _column_index(self, index: int) -> int:
+        if index < 0:
+            index += self.end
+        column_index = index - self._evicted
+        if not 0 <= column_index < len(self._types):
+            raise IndexError(f"token index out of range: {index}")
+        return column_index
+
+    def _view_at(self, i: int) -> TokenInfo:
+        return TokenInfo(
+            self._types[i],
+            self._strings[i],
+            (self._start_lines[i], self._start_cols[i]),
+            (self._end_lines[i], self._end_cols[i]),
+            self._lines[self._line_ids[i] - self._lines_evicted],
+        )
+
+    def __getitem__(self, index: int) -> TokenInfo:
+        if index < 0:
+            index += self.end
+        if index == self._view_index:
+            return self._view  # type: ignore[return-value]
+        view = self._view_at(self._column_index(index))
+        self._view_index = index
+        self._view = view
+        return view
+
+    def __iter__(self) -> Iterator[TokenInfo]:
+        for i in range(len(self._types)):
+            yield self._view_at(i)
+
+    def token_at(self, index: int) -> TokenInfo:
+        """Same as indexing, without replacing the kept view."""
+        if index == self._view_index:
+            return self._view  # type: ignore[return-value]
+        return self._view_at(self._column_index(index))
+
+    def type_at(self, index: int) -> int:
+        return self._types[self._column_index(index)]
+
+    def start_at(self, index: int) -> tuple[int, int]:
+        i = self._column_index(index)
+        return self._start_lines[i], self._start_cols[i]
+
+    def first_index(self) -> int:
+        return self._evicted
+
+    def evict_before(self, index: int) -> None:
+        count = index - self._evicted
+        if count <= 0:
+            return
+        for column in (
+            self._types,
+            self._start_lines,
+            self._start_cols,
+            self._end_lines,
+            self._end_cols,
+            self._strings,
+            self._line_ids,
+        ):
+            del column[:count]
+        self._evicted = index
+        if self._line_ids:
+            del self._lines[: self._line_ids[0] - self._lines_evicted]
+            self._lines_evicted = self._line_ids[0]
+        if self._view_index < index:
+            self._view_index = -1
+            self._view = None
@@ -1,14 +1,17 @@
+from collections import deque
 from pathlib import Path
-from typing import NamedTuple
+from typing import Iterator, NamedTuple
 from tokenize import TokenInfo, OP, NAME
 import tokenize
 import token
 import io
-from pegen.tokenizer import Tokenizer as PegenTokenizer
+from pegen.tokenizer import Tokenizer as PegenTokenizer, shorttok
 from typing import override
 from .line_break import line_breakable_after, line_breakable_before
 from .typhon_ast import get_postfix_operator_temp_name
 from ..Driver.debugging import debug_verbose_print
+from ..Utils.source_text import SourceText
+from .token_store import TokenStore
 from .token_factory_custom import token_stream_factory, generate_tokens_ignore_error
 
 
@@ -167,16 +170,34 @@ def is_possible_postfix_operator(tok: TokenInfo) -> bool:
 
 # Custom Tokenizer to override peek() not to skip always continuous NEWLINE and NL tokens.
 class TokenizerCustom(PegenTokenizer):
-    _forward_next: list[TokenInfo]  # Next token to be processed in peek()
-    _all_tokens: list[TokenInfo]  # All tokens including comments
+    _token_store: TokenStore  # Tokens for the parser, instead of the list in base
+    _forward_next: deque[TokenInfo]  # Next token to be processed in peek()
+    _trivia_tokens: TokenStore  # Comments, INDENT and DEDENT in position order
     _end_tok: TokenInfo | None  # Whether reached the end of token stream
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._all_tokens = []
-        self._forward_next = []
-        self._lines_cache: dict[int, str] = {}
+    _evicted_mark: int  # Tokens before this mark are discarded by streaming parse
+    _source_line_offset: int  # Lines in the file before the source_text
+
+    def __init__(
+        self,
+        tokengen: Iterator[TokenInfo],
+        *,
+        path: str = "",
+        verbose: bool = False,
+        source_text: SourceText | None = None,
+        line_offset: int = 0,
+    ):
+        """
+        With line_offset, the source_text is a part of the file beginning at
+        the 0-based line line_offset, and tokengen is made with the same offset.
+        """
+        self._token_store = TokenStore()
+        super().__init__(tokengen, path=path, verbose=verbose)
+        self._trivia_tokens = TokenStore()
+        self._forward_next = deque()
+        self._source_text = source_text
+        self._source_line_offset = line_offset if source_text is not None else 0
         self._end_tok = None
+        self._evicted_mark = 0
 
     def _is_token_to_skip(self, tok: TokenInfo) -> bool:
         return (
@@ -191,7 +212,7 @@ class TokenizerCustom(PegenTokenizer):
         while True:
             tok = next(self._tokengen)
             if self._is_token_to_skip(tok):
-                self._all_tokens.append(tok)
+                self._trivia_tokens.append(tok)
                 continue
             if tok.type == token.ENDMARKER:
                 self._end_tok = tok
@@ -200,7 +221,7 @@ class TokenizerCustom(PegenTokenizer):
 
     def _next(self) -> TokenInfo:
         if self._forward_next:
-            return self._forward_next.pop(0)
+            return self._forward_next.popleft()
         else:
             return self._exact_next()
 
@@ -216,28 +237,31 @@ class TokenizerCustom(PegenTokenizer):
     @override
     def get_lines(self, line_numbers: list[int]) -> list[str]:
         # Original method is fragile to invalid line numbers, not suitable to error text reporting.
-        if self._lines_cache:
-            lines = self._lines_cache
-        else:
-            count = 0
+        if self._source_text is None:
             if not Path(self._path).is_file():
                 return []
-            with open(self._path) as f:
-                for line in f:
-                    count += 1
-                    self._lines_cache[count] = line
-                self._lines_cache[count + 1] = ""  # Add empty sentinel line.
-            lines = self._lines_cache
-        return [lines[n] for n in line_numbers if n in lines]
+            self._source_text = SourceText.from_file(Path(self._path))
+        source_text = self._source_text
+        line_numbers = [n - self._source_line_offset for n in line_numbers]
+        line_count = len(source_text.line_starts)
+        # Empty sentinel line after the last line without line break.
+        if not source_text.text.endswith("\n"):
+            line_count += 1
+        return [
+            source_text.line_with_ending(n - 1)
+            if n <= len(source_text.line_starts)
+            else ""
+            for n in line_numbers
+            if 1 <= n <= line_count
+        ]
 
     def _commit_token(self, tok: TokenInfo) -> None:
-        self._tokens.append(tok)
-        self._all_tokens.append(tok)
+        self._token_store.append(tok)
         if not self._path and tok.start[0] not in self._lines:
             self._lines[tok.start[0]] = tok.line
 
     def _peek_on_newline(self, tok: TokenInfo) -> list[TokenInfo]:
-        if not self._tokens:
+        if not self._token_store:
             # No previous token. Just skip.
             return []
         # Forward the next token to check if the current newline.
@@ -247,7 +271,7 @@ class TokenizerCustom(PegenTokenizer):
         combined = self._peek_try_combine(next_tok)
         if combined is not None:
             next_tok = combined
-        if is_newline_to_skip(self._tokens[-1], tok, next_tok):
+        if is_newline_to_skip(self._token_store[-1], tok, next_tok):
             return [next_tok]  # Skip this newline
         return [
             TokenInfo(  # Canonicalize to NEWLINE
@@ -283,10 +307,20 @@ class TokenizerCustom(PegenTokenizer):
                 return False
         return True
 
+    @override
+    def getnext(self) -> tokenize.TokenInfo:
+        """Return the next token and updates the index."""
+        cached = self._index != self._token_store.end
+        tok = self.peek()
+        self._index += 1
+        if self._verbose:
+            self.report(cached, False)
+        return tok
+
     @override
     def peek(self) -> tokenize.TokenInfo:
         """Return the next token *without* updating the index."""
-        while self._index >= len(self._tokens):
+        while self._index >= self._token_store.end:
             tok = self._next()
             # Newline handling: skip continuous NEWLINE or NL tokens.
             if is_newline(tok):
@@ -303,8 +337,8 @@ class TokenizerCustom(PegenTokenizer):
             if (
                 is_possible_postfix_operator(tok)
                 and self._postfix_operator_next_guard(tok)
-                and self._tokens
-                and _is_unified(self._tokens[-1], tok)
+                and self._token_store
+                and _is_unified(self._token_store[-1], tok)
             ):
                 # This is postfix operator.
                 self._commit_token(
@@ -318,38 +352,124 @@ class TokenizerCustom(PegenTokenizer):
                 )
                 continue
             self._commit_token(tok)
-        return self._tokens[self._index]
+        return self._token_store[self._index]
+
+    @override
+    def diagnose(self) -> tokenize.TokenInfo:
+        if not self._token_store:
+            self.getnext()
+        return self._token_store[-1]
+
+    # Override reset for performance. Marks are always taken by mark().
+    @override
+    def reset(self, index: int) -> None:
+        if not self._verbose:
+            self._index = index
+            return
+        if index == self._index:
+            return
+        assert 0 <= index <= self._token_store.end, (index, self._token_store.end)
+        old_index = self._index
+        self._index = index
+        self.report(True, index < old_index)
+
+    @override
+    def report(self, cached: bool, back: bool) -> None:
+        if back:
+            fill = "-" * self._index + "-"
+        elif cached:
+            fill = "-" * self._index + ">"
+        else:
+            fill = "-" * self._index + "*"
+        if self._index == 0:
+            print(f"{fill} (Bof)")
+        else:
+            tok = self._token_store[self._index - 1]
+            print(f"{fill} {shorttok(tok)}")
 
     # Override get_last_non_whitespace_token for better performance.
     @override
     def get_last_non_whitespace_token(self) -> tokenize.TokenInfo:
-        if len(self._tokens) > 0:
-            tok = self._tokens[self._index - 1]
-            if tok.type != tokenize.ENDMARKER and (
-                tok.type < tokenize.NEWLINE or tok.type > tokenize.DEDENT
+        tokens = self._token_store
+        # Does not look back into the discarded tokens.
+        index = max(self._index - 1, tokens.first_index())
+        while index > tokens.first_index():
+            tok_type = tokens.type_at(index)
+            if tok_type != tokenize.ENDMARKER and (
+                tok_type < tokenize.NEWLINE or tok_type > tokenize.DEDENT
             ):
-                return tok  # Fast path for common case.
-        return super().get_last_non_whitespace_token()
+                break
+            index -= 1
+        return tokens.token_at(index)
+
+    def evict_tokens_before(self, mark: int) -> None:
+        """
+        Discard the tokens before mark, which the parser never looks back.
+        Marks of the remaining tokens are unchanged.
+        """
+        tokens = self._token_store
+        mark = min(mark, len(tokens) - 1)
+        if mark <= self._evicted_mark:
+            return
+        tokens.evict_before(mark)
+        self._evicted_mark = mark
+        boundary = tokens.start_at(mark)
+        trivia = self._trivia_tokens
+        index = trivia.first_index()
+        while index < len(trivia) and trivia.start_at(index) < boundary:
+            index += 1
+        trivia.evict_before(index)
+
+    def _read_to_end(self) -> None:
+        # Commit the rest of the stream, keeping the position of the parser.
+        index = self._index
+        tokens = self._token_store
+        while not tokens or tokens.type_at(-1) != token.ENDMARKER:
+            self._index = tokens.end
+            self.peek()
+        self._index = index
+
+    def all_token_count(self) -> int:
+        """Number of all tokens including comments and the discarded ones."""
+        # Counted while parsing. Only the tokens the parser did not reach are read.
+        self._read_to_end()
+        return len(self._token_store) + len(self._trivia_tokens)
+
+    def comment_tokens(self) -> list[TokenInfo]:
+        """
+        Comments including block comments in position order, read so far.
+        Comments before the discarded tokens are not included.
+        """
+        trivia = self._trivia_tokens
+        return [
+            trivia.token_at(index)
+            for index in range(trivia.first_index(), trivia.end)
+            if trivia.type_at(index) in (tokenize.COMMENT, tokenize.TYPE_COMMENT)
+        ]
 
     def read_all_tokens(self) -> list[TokenInfo]:
         """Return all tokens including comments."""
-        # Force to consume all tokens
         debug_verbose_print(lambda: "Reading all tokens for tokenizer.")
-        while tok := self.getnext():
-            debug_verbose_print(lambda: f"  Token: {tok}")
-            if tok.type == token.ENDMARKER:
-                break
-        debug_verbose_print(lambda: "Finished reading all tokens.")
+        self._read_to_end()
         self.reset(0)
-        return sorted(self._all_tokens, key=lambda t: t.start)
+        # Both are in position order, so this is a merge of the two runs.
+        tokens = sorted(
+            [*self._token_store, *self._trivia_tokens], key=lambda t: t.start
+        )
+        debug_verbose_print(
+            lambda: (
+                "".join(f"  Token: {tok}\n" for tok in tokens)
+                + "Finished reading all tokens."
+            )
+        )
+        return tokens
 
 
 def tokenizer_for_file(file_path: str) -> TokenizerCustom:
     """Tokenize the specified file."""
-    with open(file_path) as f:
-        tok_stream = token_stream_factory(f.readline)
-        tokenizer = TokenizerCustom(tok_stream, path=file_path)
-    return tokenizer
+    source_text = SourceText.from_file(Path(file_path))
+    tok_stream = token_stream_factory(source_text.line_reader())
+    return TokenizerCustom(tok_stream, path=file_path, source_text=source_text)
 
 
 def tokenizer_for_string(source: str) -> TokenizerCustom:
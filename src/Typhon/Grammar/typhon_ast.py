@@ -12,6 +12,7 @@ from typing import (
 )
 import ast
 from dataclasses import dataclass
+from enum import IntFlag, auto
 from copy import copy
 from tokenize import TokenInfo
 
@@ -61,6 +62,60 @@ def is_reparse_target(module: ast.Module) -> bool:
     return getattr(module, _IS_REPARSE_TARGET, False)
 
 
+# Typhon syntax built by the parser actions, for the transform passes to skip
+# the module without it. Over approximated, as backtracked actions also count.
+class SyntaxFeature(IntFlag):
+    RECORD = auto()
+    EXTENDED_PATTERN = auto()
+    INLINE_STATEMENT = auto()
+    LET_PATTERN = auto()
+    CONTROL_COMPREHENSION = auto()
+    FUNCTION_LITERAL = auto()
+    PLACEHOLDER = auto()
+    OPTIONAL_OPERATOR = auto()
+
+
+ALL_SYNTAX_FEATURES = SyntaxFeature(~SyntaxFeature(0))
+
+_SYNTAX_FEATURES = "_typh_syntax_features"
+# Features built in the running parse.
+_built_features = SyntaxFeature(0)
+
+
+def add_built_feature(feature: SyntaxFeature) -> None:
+    global _built_features
+    _built_features |= feature
+
+
+def begin_built_features() -> SyntaxFeature:
+    """Start collecting the features. Returns the outer ones to restore."""
+    global _built_features
+    outer = _built_features
+    _built_features = SyntaxFeature(0)
+    return outer
+
+
+def end_built_features(outer: SyntaxFeature) -> SyntaxFeature:
+    """Returns the collected features and restores the outer ones."""
+    global _built_features
+    built = _built_features
+    _built_features = outer
+    return built
+
+
+def set_syntax_features(node: ast.AST, features: SyntaxFeature) -> None:
+    setattr(node, _SYNTAX_FEATURES, features)
+
+
+def add_syntax_features(node: ast.AST, features: SyntaxFeature) -> None:
+    set_syntax_features(node, get_syntax_features(node) | features)
+
+
+def get_syntax_features(node: ast.AST) -> SyntaxFeature:
+    # Not from the parser, any feature may be included.
+    return getattr(node, _SYNTAX_FEATURES, ALL_SYNTAX_FEATURES)
+
+
 PythonScope = ast.Module | ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
 
 
@@ -85,6 +140,20 @@ def clear_anonymous_name(node: ast.Name) -> None:
         delattr(node, _ANONYMOUS_NAME)
 
 
+# Marks the Name standing for a function literal, function type or control
+# comprehension. Visitors probe only this on every Name, and the others on hit.
+# Not cleared, the kinds are checked again after this.
+_MAY_BE_EXTENDED_NAME = "_typh_may_be_extended_name"
+
+
+def _set_may_be_extended_name(node: ast.Name) -> None:
+    setattr(node, _MAY_BE_EXTENDED_NAME, True)
+
+
+def may_be_extended_name(node: ast.Name) -> bool:
+    return getattr(node, _MAY_BE_EXTENDED_NAME, False)
+
+
 def is_anonymous_name(node: ast.Name) -> bool:
     return hasattr(node, _ANONYMOUS_NAME)
 
@@ -132,6 +201,25 @@ def clear_type_ignore_node(node: ast.AST) -> None:
         delattr(node, _TYPE_IGNORE_NODES)
 
 
+# Unparsed text of a top level statement shared by its transformed copies.
+# Filled at the first unparse.
+@dataclass
+class UnparsedText:
+    text: str | None = None
+
+
+_UNPARSED_TEXT = "_typh_unparsed_text"
+
+
+def get_unparsed_text(node: ast.stmt) -> UnparsedText | None:
+    return getattr(node, _UNPARSED_TEXT, None)
+
+
+def set_unparsed_text(node: ast.stmt, unparsed: UnparsedText) -> ast.stmt:
+    setattr(node, _UNPARSED_TEXT, unparsed)
+    return node
+
+
 # The name is internal when it has no counterpart in input typhon source code.
 _INTERNAL_NAME = "_typh_internal_name"
 
@@ -248,7 +336,11 @@ PossibleAnnotatedNode = (
 def set_type_annotation[T: PossibleAnnotatedNode](
     node: T, type_node: ast.expr | None
 ) -> T:
-    setattr(node, _TYPE_ANNOTATION, type_node)
+    if type_node is None:
+        # Not annotated is the default. Not to grow the node.
+        clear_type_annotation(node)
+    else:
+        setattr(node, _TYPE_ANNOTATION, type_node)
     return node
 
 
@@ -434,6 +526,8 @@ def is_inline_with(node: Union[ast.With, ast.AsyncWith]) -> bool:
 def set_inline_with(
     node: Union[ast.With, ast.AsyncWith], is_inline: bool = True
 ) -> Union[ast.With, ast.AsyncWith]:
+    if is_inline:
+        add_built_feature(SyntaxFeature.INLINE_STATEMENT)
     setattr(node, _INLINE_WITH, is_inline)
     return node
 
@@ -593,8 +687,10 @@ def is_function_literal(name: ast.Name) -> bool:
 def set_function_literal_def(
     name: FunctionLiteral, func_def: ast.FunctionDef | ast.AsyncFunctionDef
 ):
+    add_built_feature(SyntaxFeature.FUNCTION_LITERAL)
     setattr(name, _FUNC_DEF, func_def)
     setattr(func_def, _IS_FUNCTION_LITERAL, True)
+    _set_may_be_extended_name(name)
     set_is_internal_name(name)
 
 
@@ -661,6 +757,7 @@ def get_args_of_function_type(node: FunctionType) -> list[ast.arg]:
 
 def set_args_of_function_type(node: FunctionType, args: list[ast.arg]):
     setattr(node, _ARG_TYPES, args)
+    _set_may_be_extended_name(node)
 
 
 def get_star_arg_of_function_type(node: FunctionType) -> ast.arg | None:
@@ -868,6 +965,7 @@ def get_let_pattern_body(node: ast.While | ast.If) -> LetPatternInfo | None:
 def set_let_pattern_body(
     node: ast.While | ast.If, body: LetPatternInfo
 ) -> ast.While | ast.If:
+    add_built_feature(SyntaxFeature.LET_PATTERN)
     setattr(node, _LET_PATTERN_BODY, body)
     return node
 
@@ -885,6 +983,8 @@ def is_let_else(node: LetElseAnnotatedNode) -> bool:
 
 
 def set_is_let_else[T: LetElseAnnotatedNode](node: T, is_let_else: bool) -> T:
+    if is_let_else:
+        add_built_feature(SyntaxFeature.INLINE_STATEMENT)
     setattr(node, _IS_LET_ELSE, is_let_else)
     return node
 
@@ -1174,7 +1274,10 @@ IS_STATIC = "_typh_is_static"
 
 
 def set_is_static(node: ast.FunctionDef | ast.AsyncFunctionDef, is_static: bool = True):
-    setattr(node, IS_STATIC, is_static)
+    if is_static:
+        setattr(node, IS_STATIC, True)
+    elif hasattr(node, IS_STATIC):
+        delattr(node, IS_STATIC)
 
 
 def is_static(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
@@ -1520,7 +1623,9 @@ def is_control_comprehension(node: ControlComprehension) -> bool:
 def set_control_comprehension_def(
     node: ControlComprehension, func_def: ast.FunctionDef | ast.AsyncFunctionDef
 ):
+    add_built_feature(SyntaxFeature.CONTROL_COMPREHENSION)
     setattr(node, _CONTROL_COMPREHENSION, func_def)
+    _set_may_be_extended_name(node)
     set_is_internal_name(node)
 
 
@@ -2083,11 +2188,14 @@ IS_OPTIONAL_PIPE = "_typh_is_optional_pipe"
 
 def maybe_optional(node: ast.expr, operator_string: str) -> ast.expr:
     if operator_string.startswith("?"):
+        add_built_feature(SyntaxFeature.OPTIONAL_OPERATOR)
         setattr(node, IS_OPTIONAL, True)
     return node
 
 
 def set_is_optional(node: ast.expr, is_optional: bool = True) -> ast.expr:
+    if is_optional:
+        add_built_feature(SyntaxFeature.OPTIONAL_OPERATOR)
     setattr(node, IS_OPTIONAL, is_optional)
     return node
 
@@ -2102,6 +2210,8 @@ def clear_is_optional(node: ast.expr) -> None:
 
 
 def set_is_optional_pipe(node: ast.expr, is_optional: bool = True) -> ast.expr:
+    if is_optional:
+        add_built_feature(SyntaxFeature.OPTIONAL_OPERATOR)
     setattr(node, IS_OPTIONAL_PIPE, is_optional)
     return node
 
@@ -2120,6 +2230,8 @@ IS_COALESCING = "_typh_is_coalescing"
 
 def set_is_coalescing(node: ast.Tuple, is_coalescing: bool = True) -> ast.expr:
     ast.Tuple()
+    if is_coalescing:
+        add_built_feature(SyntaxFeature.OPTIONAL_OPERATOR)
     setattr(node, IS_COALESCING, is_coalescing)
     return node
 
@@ -2150,6 +2262,7 @@ def get_force_unwrap_node(
     node: ast.expr,
     **kwargs: Unpack[PosAttributes],
 ) -> UnaryPostfix:
+    add_built_feature(SyntaxFeature.OPTIONAL_OPERATOR)
     result = ast.Tuple(elts=[node], ctx=ast.Load(), **kwargs)
     setattr(result, FORCE_UNWRAP, True)
     return result
@@ -2192,6 +2305,13 @@ def clear_is_placeholder(node: ast.Name) -> None:
         delattr(node, _IS_PLACEHOLDER)
 
 
+def maybe_placeholder(node: ast.Name) -> ast.Name:
+    # Placeholders are marked in scope_check_rename. Only noted here.
+    if node.id == "_":
+        add_built_feature(SyntaxFeature.PLACEHOLDER)
+    return node
+
+
 _RECORD_LITERAL_FIELDS = "_typh_is_record_literal_fields"
 _RECORD_TYPE = "_typh_is_record_literal_type"
 type RecordLiteral = ast.Name
@@ -2201,6 +2321,7 @@ type RecordType = ast.Name
 def set_record_literal_fields(
     node: RecordLiteral, fields: list[tuple[ast.Name, ast.expr | None, ast.expr]]
 ) -> ast.expr:
+    add_built_feature(SyntaxFeature.RECORD)
     setattr(node, _RECORD_LITERAL_FIELDS, fields)
     return node
 
@@ -2235,6 +2356,7 @@ def make_record_literal(
 def set_record_type_fields(
     node: RecordType, fields: list[tuple[ast.Name, ast.expr]]
 ) -> ast.expr:
+    add_built_feature(SyntaxFeature.RECORD)
     setattr(node, _RECORD_TYPE, fields)
     return node
 
@@ -2271,6 +2393,7 @@ type AttributesPatternClass = ast.Name
 
 
 def set_is_attributes_pattern(node: ast.Name, is_record_pattern: bool) -> ast.expr:
+    add_built_feature(SyntaxFeature.EXTENDED_PATTERN)
     setattr(node, _ATTRIBUTES_PATTERN, is_record_pattern)
     return node
 
@@ -2404,6 +2527,8 @@ _PATTERN_IS_TUPLE = "_typh_pattern_is_tuple"
 
 
 def set_pattern_is_tuple(pattern: ast.pattern, is_tuple: bool = True) -> ast.pattern:
+    if is_tuple:
+        add_built_feature(SyntaxFeature.EXTENDED_PATTERN)
     setattr(pattern, _PATTERN_IS_TUPLE, is_tuple)
     return pattern
 
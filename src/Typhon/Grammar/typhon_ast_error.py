@@ -663,7 +663,14 @@ class _ErrorGather(TyphonASTRawVisitor):
         self.generic_visit(node)
 
 
-def gather_errors(node: ast.AST):
+def gather_errors(node: ast.AST, built_errors: list[SyntaxError] | None = None):
+    """
+    Collect the errors in the AST into the syntax error list of node.
+    The walk is skipped when the parser built no error.
+    """
+    if built_errors is not None and not built_errors:
+        set_syntax_error(node, [])
+        return
     gather = _ErrorGather()
     gather.visit(node)
     parse_errors = sorted(gather.errors, key=lambda e: (e.lineno, e.offset))
@@ -3,7 +3,7 @@
 import ast
 
 from .position import get_call_trailing_comma_anchor
-from .typhon_ast import get_type_ignore_comment
+from .typhon_ast import get_type_ignore_comment, get_unparsed_text
 
 
 # Hack the ast._Unparser to create our CustomUnparser.
@@ -12,6 +12,32 @@ class CustomUnparser(ast._Unparser):
     def __init__(self):
         super().__init__()
 
+    def visit_Module(self, node):
+        self._type_ignores = {
+            ignore.lineno: f"ignore{ignore.tag}" for ignore in node.type_ignores
+        }
+        body = node.body
+        if docstring := self.get_raw_docstring(node):
+            self._write_docstring(docstring)
+            body = body[1:]
+        for stmt in body:
+            self._traverse_top_level(stmt)
+        self._type_ignores.clear()
+
+    def _traverse_top_level(self, node):
+        unparsed = get_unparsed_text(node)
+        # The text begins with a newline except at the start. Type ignores are
+        # by the line numbers, which are not in the text.
+        if unparsed is None or not self._source or self._type_ignores:
+            self.traverse(node)
+            return
+        if unparsed.text is not None:
+            self._source.append(unparsed.text)
+            return
+        begin = len(self._source)
+        self.traverse(node)
+        unparsed.text = "".join(self._source[begin:])
+
     def visit_match_case(self, node):
         self.fill("case ")
         self.traverse(node.pattern)
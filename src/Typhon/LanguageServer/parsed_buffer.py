@@ -2,6 +2,7 @@ import ast
 import copy
 
 from ..Transform.transform import transform
+from ..Grammar.tokenizer_custom import TokenInfo
 from ..Grammar.unparse_custom import unparse_custom
 from ..SourceMap.ast_match_based_map import MatchBasedSourceMap, map_from_translated
 from ..SourceMap.source_ast_cache import SourceAstCache
@@ -15,6 +16,7 @@ class LanguageServerParsedBuffer:
         self.source_ast_caches: dict[str, SourceAstCache] = {}
         self.mappings: dict[str, MatchBasedSourceMap] = {}
         self.translated_sources: dict[str, str] = {}
+        self.comment_tokens: dict[str, list[TokenInfo]] = {}
 
     def get_module(self, original_uri: str | None) -> ast.Module | None:
         if original_uri is None:
@@ -44,6 +46,11 @@ class LanguageServerParsedBuffer:
             return None
         return self.translated_sources.get(original_uri, None)
 
+    def get_comment_tokens(self, original_uri: str | None) -> list[TokenInfo]:
+        if original_uri is None:
+            return []
+        return self.comment_tokens.get(original_uri, [])
+
     def _set_parsed_module(self, original_uri: str, module: ast.Module | None) -> None:
         self.parsed_ast_modules[original_uri] = module
 
@@ -61,20 +68,27 @@ class LanguageServerParsedBuffer:
     def _set_translated_source(self, original_uri: str, source: str) -> None:
         self.translated_sources[original_uri] = source
 
+    def _set_comment_tokens(self, original_uri: str, comments: list[TokenInfo]) -> None:
+        self.comment_tokens[original_uri] = comments
+
     def reload_from_parsed_module(
         self,
         original_uri: str,
         module_before_transform: ast.Module,
         source_code: str,
         source_file_path: str,
+        comments: list[TokenInfo] | None = None,
     ) -> tuple[ast.Module, str] | None:
         """
         Reload the buffer content. Responsible to all workflow for parsed module.
         Returns the transformed module and the unparsed source code on success.
+        Comments are the ones read by the tokenizer of the parse. Without them,
+        the previous comments are dropped since their positions may be moved.
         """
         module_before_transform_snap = copy.deepcopy(module_before_transform)
         module_to_transform = module_before_transform_snap
         self._set_parsed_module(original_uri, module_before_transform_snap)
+        self._set_comment_tokens(original_uri, comments or [])
         self._set_source_ast_cache(
             original_uri,
             SourceAstCache(
@@ -7,6 +7,7 @@ from ._utils.mapping import lsp_range_to_range
 
 from ..Transform.name_generator import is_builtin_name
 from ..Grammar.parser import parse_string
+from ..Grammar.typhon_ast import add_syntax_features, get_syntax_features
 from ..LanguageServer.parsed_buffer import LanguageServerParsedBuffer
 from ..SourceMap import SourceMap
 from ..SourceMap.datatype import Range
@@ -154,6 +155,7 @@ def _replace_to_reparsed_unit(
         return None
     if not isinstance(new_ast, ast.Module):
         return None
+    add_syntax_features(new_ast, get_syntax_features(reparsed_result))
     return new_ast
 
 
@@ -10,6 +10,7 @@ from ..Grammar.tokenizer_custom import TokenInfo
 from ..Driver.debugging import debug_file_write_verbose
 from ..SourceMap.ast_match_based_map import MatchBasedSourceMap
 from ..SourceMap.datatype import Range, Pos
+from ..Utils.source_text import SourceText
 
 # https://code.visualstudio.com/api/language-extensions/semantic-highlight-guide
 TOKEN_TYPES = [
@@ -162,10 +163,38 @@ def decode_semantic_tokens(
     return decoded_tokens
 
 
+def comment_semantic_tokens(
+    comments: list[TokenInfo], source_text: SourceText
+) -> list[SemanticToken]:
+    # Comments are not in the translated code. Block comments are split by lines.
+    tokens: list[SemanticToken] = []
+    for comment in comments:
+        (start_line, start_col), (end_line, end_col) = comment.start, comment.end
+        for line in range(start_line - 1, end_line):
+            line_text = source_text.line_with_ending(line).rstrip("\r\n")
+            first = start_col if line == start_line - 1 else 0
+            last = end_col if line == end_line - 1 else len(line_text)
+            if last <= first:
+                continue
+            tokens.append(
+                SemanticToken(
+                    line=line,
+                    offset=-1,
+                    length=last - first,
+                    start_col=first,
+                    end_col=last,
+                    text=line_text[first:last],
+                    tok_type="comment",
+                )
+            )
+    return tokens
+
+
 def map_semantic_tokens(
     tokens: types.SemanticTokens,
     mapping: MatchBasedSourceMap,
     client_legend: dict[int, str],
+    comments: list[TokenInfo] | None = None,
 ) -> types.SemanticTokens:
     # First decode the tokens into SemanticTokens
     decoded_tokens = decode_semantic_tokens(tokens, client_legend)
@@ -178,7 +207,7 @@ def map_semantic_tokens(
             end=Pos(line=token.line, column=token.end_col),
         )
         # For debugging to see text.
-        token.text = Range.of_string(token_range, mapping.unparsed_code)
+        token.text = Range.of_string(token_range, mapping.unparsed_text)
         debug_file_write_verbose(
             lambda: f"Mapping token from decoded: {token} at range: {token_range}"
         )
@@ -214,12 +243,14 @@ def map_semantic_tokens(
                             length=mapped_range.end.column - mapped_range.start.column,
                             start_col=mapped_range.start.column,
                             end_col=mapped_range.end.column,
-                            text=Range.of_string(mapped_range, mapping.source_code),
+                            text=Range.of_string(mapped_range, mapping.source_text),
                             tok_type=token.tok_type,  # TODO: map this
                             tok_modifiers=token.tok_modifiers,
                         )
                     )
                     continue
+    if comments:
+        mapped_tokens.extend(comment_semantic_tokens(comments, mapping.source_text))
     sorted_tokens = list(sorted(mapped_tokens, key=lambda t: (t.line, t.start_col)))
     # Calculate offsets
     prev_line = 0
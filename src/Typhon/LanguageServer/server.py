@@ -210,6 +210,7 @@ class LanguageServer(PyglsLanguageServer):
                 ast_node,
                 source,
                 doc_path.as_posix(),
+                tokenizer.comment_tokens(),
             )
             if reload_result is None:
                 debug_file_write(
@@ -636,7 +637,10 @@ async def semantic_tokens_full(ls: LanguageServer, params: types.SemanticTokensP
         if (mapping := ls.parsed_buffer.get_mapping(uri)) is None:
             return None
         mapped = map_semantic_tokens(
-            semantic_tokens, mapping, ls.client_semantic_legend
+            semantic_tokens,
+            mapping,
+            ls.client_semantic_legend,
+            ls.parsed_buffer.get_comment_tokens(uri),
         )
         debug_file_write(lambda: f"Mapped semantic tokens: {mapped}")
         return mapped
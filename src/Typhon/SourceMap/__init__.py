@@ -1,11 +1,13 @@
 from typing import Callable, Protocol
 from .datatype import Range, Pos
+from ..Utils.source_text import SourceText
 import ast
 
 
 class SourceMap(Protocol):
     source_file: str
     source_code: str
+    source_text: SourceText
 
     def unparsed_node_to_origin_node(
         self,
@@ -5,6 +5,7 @@ from ..Grammar.position import get_pos_attributes_if_exists
 from ..Driver.debugging import debug_verbose_print
 from ..SourceMap.ast_matching import match_ast
 from .defined_name_retrieve import defined_name_retrieve
+from ..Utils.source_text import SourceText
 from ._utils import (
     filter_fn_by_node_type,
     index_node_by_line,
@@ -17,9 +18,9 @@ class MatchBasedSourceMap:
         self,
         origin_to_unparsed: dict[ast.AST, ast.AST],
         unparsed_to_origin: dict[ast.AST, ast.AST],
-        source_code: str,
+        source_code: str | SourceText,
         source_file: str,
-        unparsed_code: str,
+        unparsed_code: str | SourceText,
     ):
         self.origin_to_unparsed = origin_to_unparsed
         self.unparsed_to_origin = unparsed_to_origin
@@ -27,10 +28,12 @@ class MatchBasedSourceMap:
         self.unparsed_interval_tree = RangeIntervalTree[ast.AST]()
         self.origin_nodes_by_line: dict[int, list[RangeInterval[ast.AST]]] = {}
         self.unparsed_nodes_by_line: dict[int, list[RangeInterval[ast.AST]]] = {}
-        self.source_code = source_code
+        self.source_text = SourceText.of(source_code)
+        self.source_code = self.source_text.text
         self.source_file = source_file
-        self.unparsed_code: str = unparsed_code
-        self.unparsed_code_lines = unparsed_code.splitlines()
+        self.unparsed_text = SourceText.of(unparsed_code)
+        self.unparsed_code: str = self.unparsed_text.text
+        self.unparsed_code_lines = self.unparsed_text.lines
         self._setup_interval_trees()
 
     def _setup_interval_trees(self):
@@ -40,7 +43,7 @@ class MatchBasedSourceMap:
                 origin_range = Range.from_pos_attr_may_not_end(origin_pos)
                 debug_verbose_print(
                     lambda: (
-                        f"Adding to origin interval tree: in {self.source_file}\n    range={origin_range}\n    {ast.dump(origin_node)}\n    pos: {origin_pos}, text:{origin_range.of_string(self.source_code)}"
+                        f"Adding to origin interval tree: in {self.source_file}\n    range={origin_range}\n    {ast.dump(origin_node)}\n    pos: {origin_pos}, text:{origin_range.of_string(self.source_text)}"
                     )
                 )
                 self.origin_interval_tree.add(origin_range, origin_node)
@@ -54,7 +57,7 @@ class MatchBasedSourceMap:
                 unparsed_range = Range.from_pos_attr_may_not_end(unparsed_pos)
                 debug_verbose_print(
                     lambda: (
-                        f"  Adding to unparsed interval tree: in {self.source_file}\n    range={unparsed_range}\n    {ast.dump(unparsed_node)}\n    pos: {unparsed_pos}, text:{unparsed_range.of_string(self.unparsed_code)}"
+                        f"  Adding to unparsed interval tree: in {self.source_file}\n    range={unparsed_range}\n    {ast.dump(unparsed_node)}\n    pos: {unparsed_pos}, text:{unparsed_range.of_string(self.unparsed_text)}"
                     )
                 )
                 self.unparsed_interval_tree.add(unparsed_range, unparsed_node)
@@ -202,7 +205,7 @@ class MatchBasedSourceMap:
         range_in_origin = self.unparsed_range_to_origin_range(range_unparsed)
         if range_in_origin is None:
             return None
-        return range_in_origin.of_string(self.source_code)
+        return range_in_origin.of_string(self.source_text)
 
     def unparsed_range_to_origin_node(
         self,
@@ -377,11 +380,12 @@ class MatchBasedSourceMap:
 def map_from_translated_ast(
     origin_ast: ast.AST,
     unparsed_ast: ast.AST,
-    source_code: str,
+    source_code: str | SourceText,
     source_file_path: str,
     unparsed_code: str,
 ) -> MatchBasedSourceMap | None:
-    defined_name_retrieve(unparsed_ast, unparsed_code)
+    unparsed_text = SourceText(unparsed_code)
+    defined_name_retrieve(unparsed_ast, unparsed_text)
     mapping = match_ast(origin_ast, unparsed_ast)
     if mapping is None:
         return None
@@ -390,13 +394,13 @@ def map_from_translated_ast(
         mapping.right_to_left,
         source_code,
         source_file_path,
-        unparsed_code,
+        unparsed_text,
     )
 
 
 def map_from_translated(
     origin_ast: ast.AST,
-    source_code: str,
+    source_code: str | SourceText,
     source_file_path: str,
     translated_code: str,
 ) -> MatchBasedSourceMap | None:
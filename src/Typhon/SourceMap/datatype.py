@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from ..Grammar.position import PosAttributes, PosRange, get_pos_attributes_if_exists
 from ..Driver.debugging import debug_verbose_print
+from ..Utils.source_text import SourceText
 from intervaltree import IntervalTree, Interval  # type: ignore[import]
 from typing import Callable, Iterable
 import ast
@@ -191,9 +192,10 @@ class Range:
         debug_verbose_print(lambda: f"Merged range: start={start}, end={end}")
         return Range(start=start, end=end)
 
-    def of_string(self, source: str) -> str:
-        lines = source.splitlines()
-        return self.of_lines(lines)
+    def of_string(self, source: "str | SourceText") -> str:
+        if isinstance(source, SourceText):
+            return self.of_lines(source.lines)
+        return self.of_lines(source.splitlines())
 
     def of_lines(self, lines: list[str]) -> str:
         start_line = self.start.line
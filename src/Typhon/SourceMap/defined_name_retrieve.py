@@ -1,6 +1,7 @@
 import ast
 
 from ..Driver.debugging import debug_verbose_print
+from ..Utils.source_text import SourceText
 from ..Grammar.position import (
     get_pos_attributes,
     set_call_argument_comma_anchors,
@@ -17,9 +18,10 @@ from ..Grammar.typhon_ast import (
 
 # Assume the base source code is in canonical form by ast.unparse
 class _DefinedNameRetriever(ast.NodeVisitor):
-    def __init__(self, unparsed_source_code: str):
-        self.unparsed_source_code = unparsed_source_code
-        self.unparsed_source_code_lines = unparsed_source_code.splitlines()
+    def __init__(self, unparsed_source_code: str | SourceText):
+        unparsed_text = SourceText.of(unparsed_source_code)
+        self.unparsed_source_code = unparsed_text.text
+        self.unparsed_source_code_lines = unparsed_text.lines
 
     def _visit_defines(
         self,
@@ -90,7 +92,7 @@ class _DefinedNameRetriever(ast.NodeVisitor):
             else:
                 # Fallback: search 'as' in the source code line
                 # TODO: Is this truly necessary? and reliable?
-                line_start = self.unparsed_source_code.splitlines()[start_line - 1]
+                line_start = self.unparsed_source_code_lines[start_line - 1]
                 as_index = line_start.find(" as ", start_col)
                 if as_index != -1:
                     start_col = as_index + len(" as ")
@@ -224,6 +226,8 @@ class _DefinedNameRetriever(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def defined_name_retrieve(node: ast.AST, unparsed_source_code: str) -> None:
+def defined_name_retrieve(
+    node: ast.AST, unparsed_source_code: str | SourceText
+) -> None:
     visitor = _DefinedNameRetriever(unparsed_source_code)
     visitor.visit(node)
@@ -5,6 +5,7 @@ from ..Driver.debugging import debug_verbose_print
 from ..Grammar.position import get_pos_attributes_if_exists
 from ..Grammar.typhon_ast import PythonScope
 from .datatype import Pos, Range, RangeIntervalTree
+from ..Utils.source_text import SourceText
 from ._utils import (
     filter_fn_by_node_type,
     index_node_by_line,
@@ -16,13 +17,14 @@ class SourceAstCache:
     def __init__(
         self,
         module: ast.Module,
-        source_code: str,
+        source_code: str | SourceText,
         source_file_path: str,
     ):
         self.module = module
-        self.source_code = source_code
+        self.source_text = SourceText.of(source_code)
+        self.source_code = self.source_text.text
         self.source_file_path = source_file_path
-        self.source_code_lines = source_code.splitlines()
+        self.source_code_lines = self.source_text.lines
         self.parent_map: dict[ast.AST, ast.AST | None] = {module: None}
         self.node_interval_tree = RangeIntervalTree[ast.AST]()
         self.nodes_by_line: dict[int, list[tuple[Range, ast.AST]]] = {}
@@ -45,7 +47,7 @@ class SourceAstCache:
                     f"Adding to source AST interval tree: in {self.source_file_path}\n"
                     f"    range={node_range}\n"
                     f"    {ast.dump(node)}\n"
-                    f"    text={node_range.of_string(self.source_code)}"
+                    f"    text={node_range.of_string(self.source_text)}"
                 )
             )
             self.node_interval_tree.add(node_range, node)
@@ -134,7 +136,7 @@ class SourceAstCache:
         self,
         range: Range,
     ) -> str:
-        return range.of_string(self.source_code)
+        return range.of_string(self.source_text)
 
     def source_code_end_pos(self) -> Pos:
         if self.source_code_lines:
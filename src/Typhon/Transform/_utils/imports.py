@@ -32,6 +32,18 @@ def add_import_for_final(mod: ast.Module):
     return name
 
 
+_FINAL_IMPORT_REQUIRED = "_typh_final_import_required"
+
+
+# Final is imported for the statements not transformed this time (transform_memo).
+def require_import_for_final(mod: ast.Module):
+    setattr(mod, _FINAL_IMPORT_REQUIRED, True)
+
+
+def is_import_for_final_required(mod: ast.Module) -> bool:
+    return getattr(mod, _FINAL_IMPORT_REQUIRED, False)
+
+
 def get_final(ctx: ast.expr_context, **kwargs: Unpack[PosAttributes]) -> ast.Name:
     final_name = get_final_name()
     return set_is_internal_name(ast.Name(id=final_name, ctx=ctx, **kwargs))
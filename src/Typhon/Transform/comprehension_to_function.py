@@ -1,11 +1,13 @@
 import ast
 from ..Grammar.position import get_pos_attributes
 from ..Grammar.typhon_ast import (
+    SyntaxFeature,
     clear_is_control_comprehension,
     get_control_comprehension_def,
     ControlComprehension,
 )
 from .visitor import TyphonParentASTVisitor, TyphonASTTransformer, flat_append
+from .pass_manager import TransformPass
 from dataclasses import dataclass
 from typing import override
 from ..Driver.debugging import debug_print
@@ -51,7 +53,7 @@ class _Transform(TyphonASTTransformer):
             for comp in self.parent_stmt_to_comprehensions[node]:
                 func_def = get_control_comprehension_def(comp)
                 assert func_def is not None
-                func_def.name = self.new_control_comprehension_name(comp)
+                func_def.name = self.new_control_comprehension_name()
                 comp.id = func_def.name
                 flat_append(result, self.visit(func_def))
         node_result = super().visit(node)
@@ -68,11 +70,36 @@ class _Transform(TyphonASTTransformer):
         )
 
 
-def comprehension_to_function(module: ast.Module):
-    gatherer = _Gather(module)
-    gatherer.run()
+def _rewrite_comprehensions(module: ast.Module, gatherer: _Gather):
+    if not gatherer.comprehensions_to_process:
+        return
     parent_stmt_to_comprehensions: dict[ast.stmt, list[ControlComprehension]] = {}
     # parent_stmt_to_comprehensions only with to_be_replaced FROM outer
     for comp, parent_stmt in gatherer.comprehensions_to_process:
         parent_stmt_to_comprehensions.setdefault(parent_stmt, []).append(comp)
     _Transform(module, parent_stmt_to_comprehensions).run()
+
+
+def comprehension_to_function(module: ast.Module):
+    gatherer = _Gather(module)
+    gatherer.run()
+    _rewrite_comprehensions(module, gatherer)
+
+
+comprehension_to_function_pass = TransformPass(
+    "comprehension_to_function",
+    reads=frozenset({"ControlComprehension", "stmt"}),
+    writes=frozenset(
+        {
+            "ControlComprehension",
+            "Name",
+            "Call",
+            "stmt",
+            "FunctionDef",
+            "AsyncFunctionDef",
+        }
+    ),
+    gather=_Gather,
+    rewrite=_rewrite_comprehensions,
+    features=SyntaxFeature.CONTROL_COMPREHENSION,
+)
@@ -63,10 +63,7 @@ class _GatherRecords(TyphonASTVisitor):
                 kwd_attr_name = (
                     kwd_names[i] if kwd_names and i < len(kwd_names) else None
                 )
-                type_var = self.new_typevar_name(
-                    kwd_attr,
-                    kwd_attr_name if kwd_attr_name is not None else node,
-                )
+                type_var = self.new_typevar_name(kwd_attr)
                 type_vars.append(type_var)
                 pos = (
                     get_pos_attributes(kwd_attr_name)
@@ -94,7 +91,7 @@ class _GatherRecords(TyphonASTVisitor):
                 )
             self.record_patterns.append(
                 AttributePatternInfo(
-                    self.new_class_name("", node),
+                    self.new_class_name(""),
                     node,
                     record_cls,
                     type_vars,
@@ -15,6 +15,7 @@ from ..Grammar.syntax_errors import (
     try_handle_syntax_error_or,
 )
 from .visitor import TyphonASTVisitor
+from .pass_manager import TransformPass
 
 
 class ForbiddenStatementChecker(TyphonASTVisitor):
@@ -109,7 +110,8 @@ class ForbiddenStatementChecker(TyphonASTVisitor):
             return True
         return False
 
-    def visit(self, node: ast.AST):
+    # Checked before entering the scope of the node.
+    def before_visit(self, node: ast.AST):
         if isinstance(node, ast.stmt) and isinstance(
             self.parent_python_scopes[-1], ast.ClassDef
         ):
@@ -124,8 +126,30 @@ class ForbiddenStatementChecker(TyphonASTVisitor):
                         "Only single variable declaration is allowed inside class definition",
                         get_pos_attributes(node),
                     )
+
+    def visit(self, node: ast.AST):
+        self.before_visit(node)
         super().visit(node)
 
 
 def check_forbidden_statements(mod: ast.Module):
     ForbiddenStatementChecker(mod).run()
+
+
+check_forbidden_statements_pass = TransformPass(
+    "check_forbidden_statements",
+    reads=frozenset(
+        {
+            "stmt",
+            "Delete",
+            "Global",
+            "Nonlocal",
+            "ImportFrom",
+            "With",
+            "AsyncWith",
+            "If",
+        }
+    ),
+    writes=frozenset(),
+    gather=ForbiddenStatementChecker,
+)
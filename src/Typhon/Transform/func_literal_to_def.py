@@ -1,10 +1,12 @@
 import ast
 from ..Grammar.typhon_ast import (
+    SyntaxFeature,
     FunctionLiteral,
     get_function_literal_def,
     clear_function_literal_def,
 )
 from .visitor import TyphonParentASTVisitor, TyphonASTTransformer, flat_append
+from .pass_manager import TransformPass
 from ..Driver.debugging import debug_print
 
 
@@ -49,7 +51,7 @@ class _Transform(TyphonASTTransformer):
         if node in self.parent_stmts_for_literals:
             for func_literal in self.parent_stmts_for_literals[node]:
                 func_def = get_function_literal_def(func_literal)
-                func_def.name = self.new_func_literal_name(func_literal)
+                func_def.name = self.new_func_literal_name()
                 func_literal.id = func_def.name
                 flat_append(result, self.visit(func_def))
                 clear_function_literal_def(func_literal)
@@ -58,11 +60,9 @@ class _Transform(TyphonASTTransformer):
         return result
 
 
-# Entry point for the transformation.
-def func_literal_to_def(mod: ast.Module):
-    gatherer = _Gather(mod)
-    # First, gather all function literals with their parent statements.
-    gatherer.run()
+def _rewrite_func_literals(mod: ast.Module, gatherer: _Gather):
+    if not gatherer.func_literals:
+        return
     # Do transform to the literals and the parent statements.
     func_literals: dict[FunctionLiteral, ast.stmt] = {}
     parent_stmts_for_literals: dict[ast.stmt, list[FunctionLiteral]] = {}
@@ -75,3 +75,24 @@ def func_literal_to_def(mod: ast.Module):
         parent_stmts_for_literals,
     )
     transformer.run()
+
+
+# Entry point for the transformation.
+def func_literal_to_def(mod: ast.Module):
+    gatherer = _Gather(mod)
+    # First, gather all function literals with their parent statements.
+    gatherer.run()
+    _rewrite_func_literals(mod, gatherer)
+
+
+func_literal_to_def_pass = TransformPass(
+    "func_literal_to_def",
+    reads=frozenset({"FunctionLiteral", "stmt"}),
+    writes=frozenset(
+        {"FunctionLiteral", "Name", "stmt", "FunctionDef", "AsyncFunctionDef"}
+    ),
+    gather=_Gather,
+    rewrite=_rewrite_func_literals,
+    verbose=False,
+    features=SyntaxFeature.FUNCTION_LITERAL,
+)
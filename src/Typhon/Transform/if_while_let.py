@@ -86,7 +86,7 @@ class IfMultipleLetTransformer(TyphonASTTransformer):
             return direct_result
         # Need flag control.
         # <else_flag> = True
-        else_flag_name = self.new_temp_variable_name(node)
+        else_flag_name = self.new_temp_variable_name()
         else_flag_assign = ast.Assign(
             targets=[ast.Name(id=else_flag_name, ctx=ast.Store(), **pos)],
             value=ast.Constant(value=True),
@@ -262,7 +262,7 @@ class WhileLetTransformer(TyphonASTTransformer):
             return node
         pos = get_pos_attributes(node)
         # <continue_flag> = True
-        continue_flag_name = self.new_temp_variable_name(node)
+        continue_flag_name = self.new_temp_variable_name()
         continue_flag_assign_true = ast.Assign(
             targets=[ast.Name(id=continue_flag_name, ctx=ast.Store(), **pos)],
             value=ast.Constant(value=True),
@@ -5,6 +5,7 @@ from ..Grammar.typhon_ast import (
     is_function_literal_def,
 )
 from .visitor import TyphonASTVisitor, TyphonASTTransformer
+from .pass_manager import TransformPass
 from ..Driver.debugging import debug_print, debug_verbose_print
 
 
@@ -39,10 +40,23 @@ class _Gather(TyphonASTVisitor):
         return self.generic_visit(node)
 
 
-def insert_self_to_method(mod: ast.Module):
-    gather = _Gather(mod)
-    gather.run()
+def _rewrite_methods(mod: ast.Module, gather: _Gather):
     for method in gather.methods:
         debug_print(lambda: f"insert_self_to_method: {method.name} {method.args}")
         new_arg = ast.arg(arg="self", annotation=None, **get_pos_attributes(method))
         method.args.args.insert(0, new_arg)
+
+
+def insert_self_to_method(mod: ast.Module):
+    gather = _Gather(mod)
+    gather.run()
+    _rewrite_methods(mod, gather)
+
+
+insert_self_to_method_pass = TransformPass(
+    "insert_self_to_method",
+    reads=frozenset({"ClassDef", "FunctionDef", "AsyncFunctionDef"}),
+    writes=frozenset({"arguments", "arg"}),
+    gather=_Gather,
+    rewrite=_rewrite_methods,
+)
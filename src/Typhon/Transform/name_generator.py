@@ -1,7 +1,5 @@
 import ast
-import base64
 import hashlib
-from dataclasses import dataclass
 from enum import Enum, auto
 from contextlib import contextmanager
 from ..Grammar.typhon_ast import (
@@ -61,6 +59,13 @@ def _kind_code(kind: NameKind) -> str:
         raise ValueError(f"Unknown NameKind: {kind}")
 
 
+# Looked up per generated name, avoiding the enum attribute access.
+_KIND_NAMES: dict[NameKind, str] = {kind: kind.name for kind in NameKind}
+_KIND_PREFIXES: dict[NameKind, str] = {
+    kind: f"{_TYPHON_PREFIX}{_kind_code(kind)}" for kind in NameKind
+}
+
+
 def is_builtin_name(name: str) -> bool:
     return name.startswith(_TYPHON_BUILTIN_PREFIX)
 
@@ -95,27 +100,27 @@ _SCOPE_COUNT_COUNTER = "_typh_name_generator_scope_count"
 _MANGLE_COLLISION_COUNTER = "_typh_name_generator_collision_counter"
 
 
-@dataclass(frozen=True)
-class MangleHashSeed:
-    kind: NameKind
-    node_id: str
-    scope_id: str
-    original_name: str = ""
-
-    def serialize(self) -> str:
-        return "$".join(
-            [
-                self.kind.name,
-                self.scope_id,
-                self.node_id,
-                self.original_name,
-            ]
-        )
+def get_scope_id(module: ast.Module, scope: PythonScope) -> str | None:
+    # The scope id given in the transform of the module.
+    scope_ids: dict[PythonScope, str] = getattr(module, _SCOPE_IDS, {})
+    return scope_ids.get(scope)
+
+
+# Lower base32 digits, two per entry to encode 10 bits at once.
+_BASE32_DIGITS = "abcdefghijklmnopqrstuvwxyz234567"
+_BASE32_PAIRS = tuple(a + b for a in _BASE32_DIGITS for b in _BASE32_DIGITS)
 
-    def short_hash(self) -> str:
-        text: str = self.serialize()
-        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=5).digest()
-        return base64.b32encode(digest).decode("ascii").rstrip("=").lower()
+
+def _short_hash(text: str) -> str:
+    # 5 bytes digest is exactly 8 base32 digits, the same as base64.b32encode
+    # without padding.
+    n = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=5).digest())
+    return (
+        _BASE32_PAIRS[n >> 30]
+        + _BASE32_PAIRS[(n >> 20) & 1023]
+        + _BASE32_PAIRS[(n >> 10) & 1023]
+        + _BASE32_PAIRS[n & 1023]
+    )
 
 
 # The goal of name mangling:
@@ -198,11 +203,6 @@ class UniqueNameGenerator:
         self.raw_scope_id_counter[scope_id] = count + 1
         return f"{scope_id}_{count}"
 
-    def _parent_scope(self) -> PythonScope:
-        if len(self.scope_stack) >= 1:
-            return self.scope_stack[-1][0]
-        return self._module
-
     def _parent_scope_id(self) -> str:
         if len(self.scope_stack) >= 1:
             return self.scope_stack[-1][1]
@@ -245,48 +245,38 @@ class UniqueNameGenerator:
 
     # Actually, not "id". The key is kind and collision counting.
     # This is enough to avoid the effect of small change in expression.
-    def _anchor_id_from_node(
-        self, node: ast.AST, kind: NameKind, original_name: str
-    ) -> str:
-        candidate = f"{kind.name}_{original_name}"
-        parent = self._parent_scope()
-        kind_counter = self.scope_kind_counter.setdefault(parent, {})
-        count = kind_counter.setdefault(candidate, 0)
+    def _anchor_count(self, kind_name: str, original_name: str) -> int:
+        parent = self.scope_stack[-1][0] if self.scope_stack else self._module
+        kind_counter = self.scope_kind_counter.get(parent)
+        if kind_counter is None:
+            kind_counter = self.scope_kind_counter[parent] = {}
+        candidate = f"{kind_name}_{original_name}"
+        count = kind_counter.get(candidate, 0)
         kind_counter[candidate] = count + 1
-        return f"{kind.name}_{count}"
+        return count
 
-    def _seed_with_anchored_node(
+    def _new_name(
         self,
-        node: ast.AST,
-        *,
-        original_name: str,
         kind: NameKind,
-        scope: PythonScope | None = None,
-    ) -> MangleHashSeed:
-        scope_id = (
-            self._get_scope_id(scope) if scope is not None else self._parent_scope_id()
-        )
-        node_id = (
-            f"{original_name}|{self._anchor_id_from_node(node, kind, original_name)}"
-        )
-        return MangleHashSeed(
-            kind=kind,
-            node_id=node_id,
-            scope_id=scope_id,
-            original_name=original_name,
+        original_name: str,
+        scope: PythonScope | None,
+        use_original_name: bool,
+    ) -> str:
+        if scope is not None:
+            scope_id = self._get_scope_id(scope)
+        else:
+            scope_id = self._parent_scope_id()
+        kind_name = _KIND_NAMES[kind]
+        count = self._anchor_count(kind_name, original_name)
+        # Kind, scope id, node id (original name and anchor) and original name.
+        # Kept the same for the names stable in the caches.
+        seed_text = (
+            f"{kind_name}${scope_id}${original_name}|{kind_name}_{count}"
+            f"${original_name}"
         )
-
-    def _render_name(self, seed: MangleHashSeed, use_original_name: bool) -> str:
-        parts = [
-            f"{_TYPHON_PREFIX}{_kind_code(seed.kind)}",
-            seed.short_hash(),
-        ]
-        if use_original_name and seed.original_name:
-            parts.append(seed.original_name)
-        return "_".join(parts)
-
-    def _new_name_from_seed(self, seed: MangleHashSeed, use_original_name: bool) -> str:
-        base_name = self._render_name(seed, use_original_name)
+        base_name = f"{_KIND_PREFIXES[kind]}_{_short_hash(seed_text)}"
+        if use_original_name and original_name:
+            base_name = f"{base_name}_{original_name}"
         collision_index = self.collision_counter.get(base_name)
         if collision_index is not None:
             new_name = f"{base_name}_{collision_index}"
@@ -294,37 +284,23 @@ class UniqueNameGenerator:
         else:
             new_name = base_name
             self.collision_counter[base_name] = 1
-        add_generated_name_original(self._module, new_name, seed.original_name)
+        add_generated_name_original(self._module, new_name, original_name)
         return new_name
 
     def new_name_decl(
         self,
         kind: NameKind,
         *,
-        anchored_node: ast.AST,
         original_name: str = "",
         scope: PythonScope | None = None,
     ) -> str:
-        seed = self._seed_with_anchored_node(
-            anchored_node,
-            original_name=original_name,
-            kind=kind,
-            scope=scope,
-        )
-        return self._new_name_from_seed(seed, use_original_name=True)
+        return self._new_name(kind, original_name, scope, use_original_name=True)
 
     def new_name_anonymous(
         self,
         kind: NameKind,
         *,
-        anchored_node: ast.AST,
         pretty_name: str = "",
         scope: PythonScope | None = None,
     ) -> str:
-        seed = self._seed_with_anchored_node(
-            anchored_node,
-            original_name=pretty_name,
-            kind=kind,
-            scope=scope,
-        )
-        return self._new_name_from_seed(seed, use_original_name=False)
+        return self._new_name(kind, pretty_name, scope, use_original_name=False)
@@ -43,13 +43,12 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
 
     def _optional_check_if_exp(
         self,
-        origin_node: ast.AST,
         maybe_none_val: ast.expr,
         then_val: Callable[[str], ast.expr],
         orelse_val: ast.expr,
         pos: PosAttributes,
     ) -> ast.IfExp:
-        tmp_name = self.new_temp_variable_name(origin_node)
+        tmp_name = self.new_temp_variable_name()
         return ast.IfExp(
             # (_tmp := a) is not None
             test=ast.Compare(
@@ -101,7 +100,6 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
         right = node.elts[1]
         # Transform a ?? b to (_tmp if (_tmp := a) is not None else b)
         result = self._optional_check_if_exp(
-            node,
             left,
             (lambda tmp_name: ast.Name(id=tmp_name, ctx=ast.Load())),
             right,
@@ -127,7 +125,6 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
         pos = get_pos_attributes(node)
         if is_optional(node):
             result = self._optional_check_if_exp(
-                node,
                 node.func,
                 lambda tmp_name: maybe_copy_anchors_in_call(
                     node,
@@ -150,7 +147,6 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
                 )
             arg = node.args[0]
             result = self._optional_check_if_exp(
-                node,
                 arg,
                 lambda tmp_name: maybe_copy_anchors_in_call(
                     node,
@@ -173,7 +169,6 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
             return self.generic_visit(node)
         pos = get_pos_attributes(node)
         result = self._optional_check_if_exp(
-            node,
             node.value,
             lambda tmp_name: maybe_copy_anchors_in_call(
                 node,
@@ -201,7 +196,6 @@ class _OptionalToCheckTransformer(TyphonASTTransformer):
             )
         )
         result = self._optional_check_if_exp(
-            node,
             node.value,
             lambda tmp_name: maybe_copy_defined_name(
                 node,
@@ -0,0 +1,219 @@
+import ast
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol, runtime_checkable
+from ..Driver.debugging import debug_print, debug_verbose_print
+from ..Driver.profiling import note_skipped
+from ..Grammar.typhon_ast import (
+    SyntaxFeature,
+    get_syntax_features,
+    is_function_literal,
+    is_function_type,
+    is_control_comprehension,
+    may_be_extended_name,
+)
+from ..Grammar.unparse_custom import unparse_custom
+from .visitor import TyphonASTVisitor, TyphonParentASTVisitor
+
+# Transform passes declare the node kinds they read and write. The gather
+# traversals of consecutive independent passes are fused into one traversal.
+# Kinds are the node class names, Typhon extended nodes such as
+# "FunctionLiteral", and "stmt" for the statement lists. A rewrite also writes
+# the kinds of the nodes it adds.
+
+type Gatherer = TyphonASTVisitor | TyphonParentASTVisitor
+
+
+@runtime_checkable
+class BeforeVisitGatherer(Protocol):
+    """Gatherer working on the node before entering its scope."""
+
+    def before_visit(self, node: ast.AST) -> None: ...
+
+
+@dataclass(frozen=True)
+class TransformPass:
+    name: str
+    reads: frozenset[str]
+    writes: frozenset[str]
+    # Whole pass in its own traversals. Not fused.
+    run: Callable[[ast.Module], None] | None = None
+    # Or a read only gather visitor and the rewrite by its result.
+    gather: Callable[[ast.Module], Gatherer] | None = None
+    rewrite: Callable[[ast.Module, Any], None] | None = None
+    # Generates names in the gather. The mangled names depend on the order of
+    # the generation, so two of them are not fused.
+    gather_names: bool = False
+    # Print the result only in the verbose debug mode.
+    verbose: bool = True
+    # Typhon syntax the pass works on. Skipped if the parser built none of it.
+    features: SyntaxFeature | None = None
+
+    def is_applicable(self, features: SyntaxFeature) -> bool:
+        return self.features is None or bool(self.features & features)
+
+    def run_alone(self, module: ast.Module) -> None:
+        if self.run is not None:
+            self.run(module)
+            return
+        assert self.gather is not None
+        gatherer = self.gather(module)
+        gatherer.run()
+        if self.rewrite is not None:
+            self.rewrite(module, gatherer)
+
+
+def _visit_no_children(node: ast.AST) -> None:
+    return None
+
+
+def _extended_handler_name(node: ast.Name) -> str | None:
+    # Same dispatch as TyphonASTVisitor.visit.
+    if is_function_literal(node):
+        return "visit_FunctionLiteral"
+    elif is_function_type(node):
+        return "visit_FunctionType"
+    elif is_control_comprehension(node):
+        return "visit_ControlComprehension"
+    return None
+
+
+class _FusedGather(TyphonParentASTVisitor):
+    """
+    One traversal calling the handlers of the gatherers on each node.
+    The gatherers share the scopes and the parents of this traversal, and
+    their generic_visit is disabled as this traversal visits the children.
+    Fused gatherers only work on the node before its children, except
+    before_visit(node) called before entering the scope of the node.
+    """
+
+    def __init__(self, module: ast.Module, gatherers: list[Gatherer]):
+        super().__init__(module)
+        self.gatherers = gatherers
+        self.before_visits: list[Callable[[ast.AST], None]] = [
+            g.before_visit for g in gatherers if isinstance(g, BeforeVisitGatherer)
+        ]
+        # The parents are tracked only for the gatherers using them.
+        self.track_parents = any(
+            isinstance(g, TyphonParentASTVisitor) for g in gatherers
+        )
+        self.handlers: dict[str, list[Callable[[ast.AST], Any]]] = {}
+
+    def _handlers_for(self, name: str) -> list[Callable[[ast.AST], Any]]:
+        handlers = self.handlers.get(name)
+        if handlers is None:
+            # The defaults of ast.NodeVisitor only visit the children.
+            default = getattr(ast.NodeVisitor, name, None)
+            handlers = [
+                getattr(g, name)
+                for g in self.gatherers
+                if getattr(type(g), name, default) is not default
+            ]
+            self.handlers[name] = handlers
+        return handlers
+
+    def run(self):
+        for g in self.gatherers:
+            g.name_gen = self.name_gen
+            g.parent_python_scopes = self.parent_python_scopes
+            if isinstance(g, TyphonParentASTVisitor):
+                g.parent_stmts = self.parent_stmts
+                g.parent_exprs = self.parent_exprs
+            setattr(g, "generic_visit", _visit_no_children)
+        try:
+            self.visit(self.module)
+        finally:
+            for g in self.gatherers:
+                delattr(g, "generic_visit")
+
+    def visit(self, node: ast.AST):
+        for before_visit in self.before_visits:
+            before_visit(node)
+        name = None
+        if isinstance(node, ast.Name) and may_be_extended_name(node):
+            name = _extended_handler_name(node)
+        handlers = self._handlers_for(name or f"visit_{node.__class__.__name__}")
+        stmt = node if self.track_parents and isinstance(node, ast.stmt) else None
+        expr = node if self.track_parents and isinstance(node, ast.expr) else None
+        if stmt is not None:
+            self.parent_stmts.append(stmt)
+        elif expr is not None:
+            self.parent_exprs.append(expr)
+        is_scope = self.is_python_scope(node)
+        if is_scope:
+            self.enter_scope(node)
+        for handler in handlers:
+            handler(node)
+        # Children including the definitions in the Typhon extended nodes.
+        TyphonParentASTVisitor.generic_visit(self, node)
+        if is_scope:
+            self.exit_scope(node)
+        if stmt is not None:
+            self.parent_stmts.pop()
+        elif expr is not None:
+            self.parent_exprs.pop()
+
+
+def fuse_passes(passes: list[TransformPass]) -> list[list[TransformPass]]:
+    """
+    Group the passes into the runs of one traversal. A gather joins the group
+    if no rewrite before it in the group writes what it reads.
+    """
+    groups: list[list[TransformPass]] = []
+    group_writes: set[str] = set()
+    group_names = False
+    for transform_pass in passes:
+        group = groups[-1] if groups else None
+        if (
+            group is not None
+            and transform_pass.gather is not None
+            and group[0].gather is not None
+            and not (transform_pass.reads & group_writes)
+            and not (transform_pass.gather_names and group_names)
+        ):
+            group.append(transform_pass)
+        else:
+            groups.append([transform_pass])
+            group_writes = set()
+            group_names = False
+        group_writes |= transform_pass.writes
+        group_names |= transform_pass.gather_names
+    return groups
+
+
+def _debug_print_after(transform_pass: TransformPass, module: ast.Module) -> None:
+    print_func = debug_verbose_print if transform_pass.verbose else debug_print
+    print_func(lambda: f"After {transform_pass.name}:\n{unparse_custom(module)}\n")
+
+
+def run_passes(
+    module: ast.Module, passes: list[TransformPass], fused: bool = True
+) -> None:
+    """
+    Run the passes in order. Not fused runs all the passes one by one,
+    as the sequential pipeline to cross-check.
+    """
+    if not fused:
+        for transform_pass in passes:
+            transform_pass.run_alone(module)
+            _debug_print_after(transform_pass, module)
+        return
+    features = get_syntax_features(module)
+    applicable: list[TransformPass] = []
+    for transform_pass in passes:
+        if transform_pass.is_applicable(features):
+            applicable.append(transform_pass)
+        else:
+            debug_verbose_print(lambda: f"Skipped {transform_pass.name}")
+            note_skipped(transform_pass.name)
+    for group in fuse_passes(applicable):
+        if len(group) == 1:
+            group[0].run_alone(module)
+            _debug_print_after(group[0], module)
+            continue
+        debug_verbose_print(lambda: f"Fused gather of {[p.name for p in group]}")
+        gatherers = [p.gather(module) for p in group if p.gather is not None]
+        _FusedGather(module, gatherers).run()
+        for transform_pass, gatherer in zip(group, gatherers):
+            if transform_pass.rewrite is not None:
+                transform_pass.rewrite(module, gatherer)
+            _debug_print_after(transform_pass, module)
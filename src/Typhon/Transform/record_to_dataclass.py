@@ -8,6 +8,7 @@ from ..Grammar.position import (
 )
 from ..Grammar.typhon_ast import (
     RecordLiteral,
+    SyntaxFeature,
     add_generated_name_original,
     get_record_literal_fields,
     get_record_type_fields,
@@ -24,6 +25,7 @@ from ..Grammar.pretty_printer import (
     set_record_literal_typevar_fields,
 )
 from .visitor import TyphonASTVisitor, TyphonASTTransformer, flat_append
+from .pass_manager import TransformPass
 from ._utils.imports import (
     get_insert_point_for_class,
 )
@@ -85,14 +87,14 @@ class _GatherRecords(TyphonASTVisitor):
         for name, annotation, value in fields:
             is_type_var = False
             if not annotation:
-                type_var = self.new_typevar_name(name.id, name)
+                type_var = self.new_typevar_name(name.id)
                 type_vars.append(type_var)
                 annotation = set_is_internal_name(
                     ast.Name(id=type_var, ctx=ast.Load(), **get_pos_attributes(name))
                 )
                 is_type_var = True
             field_infos.append(RecordFieldInfo(name, annotation, value, is_type_var))
-        class_name = self.new_class_name("", node)
+        class_name = self.new_class_name("")
         self.records.append(
             RecordInfo(
                 node,
@@ -126,7 +128,7 @@ class _GatherRecords(TyphonASTVisitor):
         for name, annotation in type_fields:
             # Always create a new type variable for each field so that scoped type
             # variables are handled correctly.
-            type_var = self.new_typevar_name(name.id, name)
+            type_var = self.new_typevar_name(name.id)
             type_vars.append(type_var)
             field_infos.append(
                 RecordTypeFieldInfo(
@@ -139,7 +141,7 @@ class _GatherRecords(TyphonASTVisitor):
                     annotation,
                 )
             )
-        class_name = self.new_class_name("", node)
+        class_name = self.new_class_name("")
         self.record_types.append(
             RecordTypeInfo(
                 node,
@@ -284,10 +286,7 @@ class _Transform(TyphonASTTransformer):
         return self.generic_visit(node)
 
 
-# Run before other transformations so that the generated call is visited properly.
-def record_to_dataclass(module: ast.Module):
-    gatherer = _GatherRecords(module)
-    gatherer.run()
+def _rewrite_records(module: ast.Module, gatherer: _GatherRecords):
     if not gatherer.records and not gatherer.record_types:
         return
     # Create class and information for each record literal.
@@ -327,3 +326,21 @@ def record_to_dataclass(module: ast.Module):
         class_for_record_type,
         info_for_record_type,
     ).run()
+
+
+# Run before other transformations so that the generated call is visited properly.
+def record_to_dataclass(module: ast.Module):
+    gatherer = _GatherRecords(module)
+    gatherer.run()
+    _rewrite_records(module, gatherer)
+
+
+record_to_dataclass_pass = TransformPass(
+    "record_to_dataclass",
+    reads=frozenset({"RecordLiteral", "RecordType"}),
+    writes=frozenset({"Name", "Call", "Subscript", "stmt", "ClassDef", "FunctionDef"}),
+    gather=_GatherRecords,
+    rewrite=_rewrite_records,
+    gather_names=True,
+    features=SyntaxFeature.RECORD,
+)
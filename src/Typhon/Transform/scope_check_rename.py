@@ -1,7 +1,7 @@
 import ast
 import builtins
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Unpack
 
 from ..Grammar.position import (
@@ -69,6 +69,48 @@ def get_builtins() -> set[str]:
     return builtin_syms
 
 
+# What a top-level function takes from the module scope, recorded to reuse the
+# transformed function (transform_memo). The function is transformed the same
+# way as far as its names have the same context.
+# Context is (name, suspended at entry, (is_mutable, renamed_to) of the
+# declarations) of each name.
+type FootprintContext = tuple[
+    tuple[str, bool, tuple[tuple[bool, str | None], ...]], ...
+]
+
+
+@dataclass
+class TopLevelFootprint:
+    # Names declared or referenced in the function.
+    names: set[str]
+    # References to module scope or suspended, and if mutated.
+    references: dict[str, bool] = field(default_factory=dict)
+    suspended_at_entry: frozenset[str] = frozenset()
+    # Module scope declarations of the names, and if suspended at entry.
+    context: FootprintContext | None = None
+
+
+_TOP_LEVEL_FOOTPRINTS = "_typh_top_level_footprints"
+
+
+def set_top_level_footprints(
+    module: ast.Module, footprints: dict[ast.AST, TopLevelFootprint]
+) -> None:
+    # Recorded only for the functions in footprints.
+    setattr(module, _TOP_LEVEL_FOOTPRINTS, footprints)
+
+
+def get_top_level_footprints(
+    module: ast.Module,
+) -> dict[ast.AST, TopLevelFootprint] | None:
+    return getattr(module, _TOP_LEVEL_FOOTPRINTS, None)
+
+
+def clear_top_level_footprints(module: ast.Module) -> None:
+    if hasattr(module, _TOP_LEVEL_FOOTPRINTS):
+        delattr(module, _TOP_LEVEL_FOOTPRINTS)
+
+
 class SymbolScopeVisitor(TyphonASTVisitor):
     def __init__(self, module: ast.Module):
         super().__init__(module)
@@ -88,6 +130,8 @@ class SymbolScopeVisitor(TyphonASTVisitor):
         self.require_nonlocal: dict[str, set[PythonScope]] = {}
         self.builtins_symbols = get_builtins()
         self.anonymous_names: dict[int, str] = {}
+        self.footprints = get_top_level_footprints(module)
+        self.footprint: TopLevelFootprint | None = None
 
     def _enter_scope(self):
         self.scopes.append({})
@@ -165,7 +209,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
         name: str,
         is_mutable: bool,
         pos: PosAttributes,
-        anchored_node: ast.AST | None = None,
         is_force_rename: bool = False,
         add_to_parent_python_scope: bool = False,  # For function/class name
         rename_on_demand_to_kind: NameKind | None = None,  # Rename if needed
@@ -182,6 +225,8 @@ class SymbolScopeVisitor(TyphonASTVisitor):
         )
         dec = SymbolDeclaration(name, is_mutable, None, python_scope_to_add)
         current_scope[name] = dec
+        if self.footprint is not None:
+            self.footprint.names.add(name)
         self.symbols.setdefault(name, []).append(dec)
         if name not in self.builtins_symbols:
             debug_print(
@@ -216,20 +261,11 @@ class SymbolScopeVisitor(TyphonASTVisitor):
         # Rename if required
         if rename_on_demand_to_kind is not None:
             if rename_condition:
-                if anchored_node is not None:
-                    new_name = self.name_gen.new_name_decl(
-                        rename_on_demand_to_kind,
-                        anchored_node=anchored_node,
-                        original_name=name,
-                        scope=python_scope_to_add,
-                    )
-                else:
-                    new_name = self.name_gen.new_name_decl(
-                        rename_on_demand_to_kind,
-                        anchored_node=ast.Name(id=name, ctx=ast.Store(), **pos),
-                        original_name=name,
-                        scope=python_scope_to_add,
-                    )
+                new_name = self.name_gen.new_name_decl(
+                    rename_on_demand_to_kind,
+                    original_name=name,
+                    scope=python_scope_to_add,
+                )
                 dec.renamed_to = new_name
                 debug_print(lambda: f"Renamed variable '{dec.name}' to '{new_name}'")
         return dec
@@ -299,7 +335,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
                 alias.asname or alias.name,
                 is_mutable=False,
                 pos=get_pos_attributes(alias),
-                anchored_node=alias,
                 rename_on_demand_to_kind=NameKind.IMPORT,
             )
             if sym.renamed_to:
@@ -316,7 +351,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
                 alias.asname or alias.name,
                 is_mutable=False,
                 pos=get_pos_attributes(alias),
-                anchored_node=alias,
                 rename_on_demand_to_kind=NameKind.IMPORT,
             )
             if sym.renamed_to:
@@ -342,7 +376,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
             node.name,
             is_mutable=False,
             pos=pos,
-            anchored_node=node,
             add_to_parent_python_scope=True,
             rename_on_demand_to_kind=NameKind.CLASS,
         )
@@ -357,14 +390,41 @@ class SymbolScopeVisitor(TyphonASTVisitor):
             self.generic_visit(node)
         return node
 
+    @contextmanager
+    def top_level_footprint(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        footprint = self.footprints.get(node) if self.footprints else None
+        if footprint is None:
+            yield
+            return
+        footprint.suspended_at_entry = frozenset(self.suspended_symbols)
+        self.footprint = footprint
+        try:
+            yield
+        finally:
+            self.footprint = None
+        footprint.context = tuple(
+            (
+                name,
+                name in footprint.suspended_at_entry,
+                tuple((d.is_mutable, d.renamed_to) for d in self.symbols.get(name, [])),
+            )
+            for name in sorted(footprint.names)
+        )
+
     def visit_FunctionDef_AsyncFunctionDef(
         self, node: ast.FunctionDef | ast.AsyncFunctionDef
+    ):
+        with self.top_level_footprint(node):
+            self._visit_FunctionDef_AsyncFunctionDef(node)
+        return node
+
+    def _visit_FunctionDef_AsyncFunctionDef(
+        self, node: ast.FunctionDef | ast.AsyncFunctionDef
     ):
         sym = self.add_symbol_declaration(
             node.name,
             is_mutable=False,
             pos=get_pos_attributes(node),
-            anchored_node=node,
             add_to_parent_python_scope=True,
             rename_on_demand_to_kind=NameKind.FUNCTION,
         )
@@ -399,7 +459,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
                     )
                 with self.scope():  # Function body scope
                     self.generic_visit(node)
-        return node
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
         return self.visit_FunctionDef_AsyncFunctionDef(node)
@@ -799,7 +858,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
         else:
             new_name = self.name_gen.new_name_decl(
                 NameKind.VARIABLE,
-                anchored_node=node,
                 original_name=node.id,
             )
             debug_verbose_print(
@@ -809,6 +867,15 @@ class SymbolScopeVisitor(TyphonASTVisitor):
             node.id = new_name
         return True
 
+    def add_footprint_reference(self, node: ast.Name, sym: SymbolDeclaration | None):
+        assert self.footprint is not None
+        self.footprint.names.add(node.id)
+        if sym is None or sym.declared_python_scope is self.parent_python_scopes[0]:
+            references = self.footprint.references
+            references[node.id] = (
+                references.get(node.id, False) or self.non_declaration_assign_context
+            )
+
     # The main part of this visitor.
     # Variable reference and declaration. Rename if necessary.
     def visit_Name(self, node: ast.Name):
@@ -821,7 +888,6 @@ class SymbolScopeVisitor(TyphonASTVisitor):
                 node.id,
                 is_mutable=self.declaration_context.is_mutable,
                 pos=get_pos_attributes(node),
-                anchored_node=node,
                 is_force_rename=self.declaration_context.is_force_rename
                 and not is_anon,
                 rename_on_demand_to_kind=(
@@ -841,6 +907,8 @@ class SymbolScopeVisitor(TyphonASTVisitor):
                 return node
             # Reference to the symbol
             sym = self.get_symbol(node.id)
+            if self.footprint is not None:
+                self.add_footprint_reference(node, sym)
             if sym is None:  # Undeclared variable
                 suspend = self.try_suspend_resolve(
                     node, is_mutation=self.non_declaration_assign_context
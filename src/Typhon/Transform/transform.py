@@ -1,61 +1,108 @@
 import ast
-from ..Driver.debugging import debug_print, debug_verbose_print
-from .func_literal_to_def import func_literal_to_def
+from ..Driver.configs import is_transform_memo_enabled
+from ..Driver.debugging import debug_print
+from .func_literal_to_def import func_literal_to_def_pass
 from .type_abbrev_desugar import type_abbrev_desugar
 from .scope_check_rename import scope_check_rename
-from .forbidden_statements import check_forbidden_statements
-from .insert_self_to_method import insert_self_to_method
+from .forbidden_statements import check_forbidden_statements_pass
+from .insert_self_to_method import insert_self_to_method_pass
 from .type_annotation_check_expand import type_annotation_check_expand
 from .inline_statement_block_capture import inline_statement_block_capture
 from .optional_operators_to_checked import optional_to_checked
 from .if_while_let import if_while_let_transform
-from .comprehension_to_function import comprehension_to_function
+from .comprehension_to_function import comprehension_to_function_pass
 from .placeholder_to_function import placeholder_to_func
-from .record_to_dataclass import record_to_dataclass
+from .record_to_dataclass import record_to_dataclass_pass
 from .extended_patterns import extended_protocol
+from .pass_manager import TransformPass, run_passes
+from .transform_memo import TransformMemo, get_transform_memo
+from ..Grammar.typhon_ast import SyntaxFeature
 
 from ..Grammar.syntax_errors import raise_from_module_syntax_errors
 from ..Grammar.unparse_custom import unparse_custom
 
 
-def transform(mod: ast.Module, ignore_error: bool = False) -> None:
-    check_forbidden_statements(mod)
-    record_to_dataclass(mod)
-    debug_verbose_print(lambda: f"After record_to_dataclass:\n{unparse_custom(mod)}\n")
-    extended_protocol(mod)
-    debug_verbose_print(lambda: f"After extended_protocol:\n{unparse_custom(mod)}\n")
-    inline_statement_block_capture(mod)
-    debug_print(
-        lambda: f"After inline_statement_block_capture:\n{unparse_custom(mod)}\n"
-    )
-    if_while_let_transform(mod)
-    debug_verbose_print(
-        lambda: f"After if_while_let_transform:\n{unparse_custom(mod)}\n"
-    )
-    insert_self_to_method(mod)
-    debug_verbose_print(
-        lambda: f"After insert_self_to_method:\n{unparse_custom(mod)}\n"
-    )
-    comprehension_to_function(mod)
-    debug_verbose_print(
-        lambda: f"After comprehension_to_function:\n{unparse_custom(mod)}\n"
-    )
-    func_literal_to_def(mod)
-    debug_print(lambda: f"After func_literal_to_def:\n{unparse_custom(mod)}\n")
-    scope_check_rename(mod)
-    debug_print(lambda: f"After scope_check_rename:\n{unparse_custom(mod)}\n")
-    placeholder_to_func(mod)
-    debug_print(lambda: f"After placeholder_to_func:\n{unparse_custom(mod)}\n")
-    optional_to_checked(mod)
-    debug_verbose_print(lambda: f"After optional_to_checked:\n{unparse_custom(mod)}\n")
-    type_annotation_check_expand(mod)
-    debug_verbose_print(
-        lambda: f"After type_annotation_check_expand:\n{unparse_custom(mod)}\n"
-    )
-    type_abbrev_desugar(mod)
-    debug_verbose_print(
-        lambda: f"After func_type_to_protocol:\n{unparse_custom(mod)}\n"
-    )
+TRANSFORM_PASSES: list[TransformPass] = [
+    check_forbidden_statements_pass,
+    record_to_dataclass_pass,
+    TransformPass(
+        "extended_protocol",
+        reads=frozenset({"MatchClass", "MatchSequence"}),
+        writes=frozenset({"Name", "MatchClass", "MatchSequence", "stmt", "ClassDef"}),
+        run=extended_protocol,
+        features=SyntaxFeature.EXTENDED_PATTERN,
+    ),
+    TransformPass(
+        "inline_statement_block_capture",
+        reads=frozenset({"With", "AsyncWith", "If"}),
+        writes=frozenset({"stmt"}),
+        run=inline_statement_block_capture,
+        verbose=False,
+        features=SyntaxFeature.INLINE_STATEMENT,
+    ),
+    TransformPass(
+        "if_while_let_transform",
+        reads=frozenset({"If", "While"}),
+        writes=frozenset({"If", "While", "Match", "Assign", "stmt"}),
+        run=if_while_let_transform,
+        features=SyntaxFeature.LET_PATTERN,
+    ),
+    insert_self_to_method_pass,
+    comprehension_to_function_pass,
+    func_literal_to_def_pass,
+    TransformPass(
+        "scope_check_rename",
+        reads=frozenset({"Name", "stmt"}),
+        writes=frozenset({"Name", "arg", "stmt"}),
+        run=scope_check_rename,
+        verbose=False,
+    ),
+    TransformPass(
+        "placeholder_to_func",
+        reads=frozenset({"Placeholder", "stmt"}),
+        writes=frozenset({"Name", "Lambda", "stmt", "FunctionDef"}),
+        run=placeholder_to_func,
+        verbose=False,
+        features=SyntaxFeature.PLACEHOLDER,
+    ),
+    TransformPass(
+        "optional_to_checked",
+        reads=frozenset({"OptionalOperator"}),
+        writes=frozenset({"Name", "IfExp", "NamedExpr", "stmt", "FunctionDef"}),
+        run=optional_to_checked,
+        features=SyntaxFeature.OPTIONAL_OPERATOR,
+    ),
+    TransformPass(
+        "type_annotation_check_expand",
+        reads=frozenset({"stmt"}),
+        writes=frozenset({"stmt", "ImportFrom"}),
+        run=type_annotation_check_expand,
+    ),
+    TransformPass(
+        "type_abbrev_desugar",
+        reads=frozenset({"FunctionType", "Tuple", "List"}),
+        writes=frozenset(
+            {"FunctionType", "Tuple", "List", "Subscript", "stmt", "ClassDef"}
+        ),
+        run=type_abbrev_desugar,
+    ),
+]
+
+
+def transform(
+    mod: ast.Module,
+    ignore_error: bool = False,
+    fused: bool = True,
+    memo: TransformMemo | None = None,
+) -> None:
+    # Not fused runs each pass in its own traversals, to cross-check.
+    # The memo reuses the top level functions transformed before, when fused.
+    if memo is None and is_transform_memo_enabled():
+        memo = get_transform_memo()
+    if memo is not None and fused:
+        memo.transform(mod, lambda: run_passes(mod, TRANSFORM_PASSES))
+    else:
+        run_passes(mod, TRANSFORM_PASSES, fused)
     debug_print(lambda: f"After transform:\n{unparse_custom(mod)}\n")
     if not ignore_error:
         raise_from_module_syntax_errors(mod)
@@ -0,0 +1,465 @@
+import ast
+import bisect
+import hashlib
+import io
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, cast
+
+from ..Driver.debugging import debug_print
+from ..Grammar.position import get_pos_attributes, pos_attribute_to_range
+from ..Grammar.syntax_errors import (
+    get_error_node,
+    get_syntax_error_in_module,
+)
+from ..Grammar.typhon_ast import (
+    UnparsedText,
+    add_generated_name_original,
+    get_generated_name_original_map,
+    set_unparsed_text,
+)
+from ._utils.imports import require_import_for_final
+from .name_generator import (
+    get_final_name,
+    get_scope_id,
+    is_builtin_name,
+    is_reserved_typh_name,
+)
+from .scope_check_rename import (
+    FootprintContext,
+    TopLevelFootprint,
+    clear_top_level_footprints,
+    set_top_level_footprints,
+)
+
+# Memo of the transformed top level functions across the transforms.
+# The key is the structural hash of the function before transform, with the
+# line numbers relative to the function. On hit, the function is replaced by a
+# stub with the same name, arguments and references to module scope during the
+# transform. The stub makes the same effect on the other statements, and checks
+# the function would be transformed in the same context. Otherwise the module
+# is restored and transformed as a whole.
+# Only the closed functions are recorded, with no mutation to module scope, no
+# error, no statement generated out of itself and no import except Final.
+
+type TopLevelDef = ast.FunctionDef | ast.AsyncFunctionDef
+
+_LINE_ATTRIBUTES = ("lineno", "end_lineno")
+_RELATIVE_LINES: dict[tuple[bool, bool], tuple[str, ...]] = {
+    (False, False): (),
+    (True, False): ("lineno",),
+    (False, True): ("end_lineno",),
+    (True, True): _LINE_ATTRIBUTES,
+}
+
+
+class _NotClosed(Exception):
+    pass
+
+
+def _set_node_state(
+    node: ast.AST, state: tuple[dict[str, Any], tuple[str, ...]], base_line: int = 0
+) -> None:
+    attributes, relative = state
+    node.__dict__.update(attributes)
+    for key in relative:
+        setattr(node, key, attributes[key] + base_line)
+
+
+class _RelativePickler(pickle.Pickler):
+    # Line numbers in the statement are relative to its first line.
+    def __init__(
+        self,
+        file: io.BytesIO,
+        root: TopLevelDef,
+        line_range: tuple[int, int],
+        outside: set[int],
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.root = root
+        self.base_line = root.lineno
+        self.begin, self.end = line_range
+        self.outside = outside
+
+    def _in_range(self, line: Any) -> bool:
+        return isinstance(line, int) and self.begin <= line <= self.end
+
+    def reducer_override(self, obj: Any) -> Any:
+        if not isinstance(obj, ast.AST):
+            return NotImplemented
+        if id(obj) in self.outside and obj is not self.root:
+            raise _NotClosed()
+        cls, args, state = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)[:3]
+        if not isinstance(state, dict):
+            return NotImplemented
+        state = cast(dict[str, Any], state)
+        relative = _RELATIVE_LINES[
+            self._in_range(state.get("lineno")),
+            self._in_range(state.get("end_lineno")),
+        ]
+        if relative:
+            state = state.copy()
+            for key in relative:
+                state[key] -= self.base_line
+        return (cls, args, (state, relative), None, None, _set_node_state)
+
+
+class _RelativeUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, base_line: int):
+        super().__init__(file)
+        self.base_line = base_line
+
+    def find_class(self, module_name: str, name: str) -> Any:
+        if module_name == __name__ and name == _set_node_state.__name__:
+            return partial(_set_node_state, base_line=self.base_line)
+        return super().find_class(module_name, name)
+
+
+def _line_range(node: TopLevelDef) -> tuple[int, int]:
+    begin = min([node.lineno, *(d.lineno for d in node.decorator_list)])
+    return begin, node.end_lineno or node.lineno
+
+
+def _dump_relative(
+    node: TopLevelDef, line_range: tuple[int, int], outside: set[int]
+) -> bytes | None:
+    file = io.BytesIO()
+    try:
+        _RelativePickler(file, node, line_range, outside).dump(node)
+    except (_NotClosed, pickle.PicklingError, TypeError, RecursionError) as e:
+        debug_print(lambda: f"Transform memo cannot dump {node.name}: {e!r}")
+        return None
+    return file.getvalue()
+
+
+def _load_relative(data: bytes, base_line: int) -> TopLevelDef:
+    return _RelativeUnpickler(io.BytesIO(data), base_line).load()
+
+
+@dataclass(frozen=True)
+class _Keyed:
+    key: bytes
+    line_range: tuple[int, int]
+
+
+@dataclass
+class _MemoEntry:
+    transformed: bytes
+    name: str
+    scope_id: str
+    # Footprint of the function in the module scope.
+    names: frozenset[str]
+    references: tuple[str, ...]
+    context: FootprintContext
+    generated_names: dict[str, str]
+    requires_final: bool
+    unparsed: UnparsedText
+
+
+def _make_stub(node: TopLevelDef, entry: _MemoEntry) -> TopLevelDef:
+    # Same scope id and declarations as the function, and references to the
+    # module scope. All at the position of the function for the errors.
+    pos = get_pos_attributes(node)
+
+    def plain_arg(arg: ast.arg) -> ast.arg:
+        return ast.arg(arg=arg.arg, annotation=None, **get_pos_attributes(arg))
+
+    def plain_type_param(tp: ast.type_param) -> ast.type_param:
+        tp_pos = pos_attribute_to_range(get_pos_attributes(tp))
+        if isinstance(tp, ast.ParamSpec):
+            return ast.ParamSpec(name=tp.name, **tp_pos)
+        elif isinstance(tp, ast.TypeVarTuple):
+            return ast.TypeVarTuple(name=tp.name, **tp_pos)
+        assert isinstance(tp, ast.TypeVar)
+        return ast.TypeVar(name=tp.name, **tp_pos)
+
+    args = node.args
+    stub_args = ast.arguments(
+        posonlyargs=[plain_arg(arg) for arg in args.posonlyargs],
+        args=[plain_arg(arg) for arg in args.args],
+        vararg=plain_arg(args.vararg) if args.vararg else None,
+        kwonlyargs=[plain_arg(arg) for arg in args.kwonlyargs],
+        kw_defaults=[None for _ in args.kwonlyargs],
+        kwarg=plain_arg(args.kwarg) if args.kwarg else None,
+        defaults=[],
+    )
+    body: list[ast.stmt] = [
+        ast.Expr(value=ast.Name(id=name, ctx=ast.Load(), **pos), **pos)
+        for name in entry.references
+    ]
+    return type(node)(
+        name=node.name,
+        args=stub_args,
+        body=body or [ast.Pass(**pos)],
+        decorator_list=[],
+        returns=None,
+        type_comment=None,
+        type_params=[plain_type_param(tp) for tp in node.type_params or []],
+        **pos,
+    )
+
+
+def _defined_names(stmts: list[ast.stmt]) -> set[str]:
+    names: set[str] = set()
+    for stmt in stmts:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(stmt.name)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            names.update(a.asname or a.name.split(".")[0] for a in stmt.names)
+        elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+            for target in targets:
+                names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+    return names
+
+
+def _identifiers(node: ast.AST) -> set[str] | None:
+    # All the strings in the nodes. None if some node has errors.
+    identifiers: set[str] = set()
+    for child in ast.walk(node):
+        if get_error_node(child):
+            return None
+        for value in child.__dict__.values():
+            if isinstance(value, str):
+                identifiers.add(value)
+            elif isinstance(value, list):
+                values = cast(list[Any], value)
+                identifiers.update(v for v in values if isinstance(v, str))
+    return identifiers
+
+
+def _count_in_range(sorted_lines: list[int], line_range: tuple[int, int]) -> int:
+    begin, end = line_range
+    return bisect.bisect_right(sorted_lines, end) - bisect.bisect_left(
+        sorted_lines, begin
+    )
+
+
+class _ModuleBackup:
+    # Copy of the statements to transform and the attributes of the module.
+    def __init__(self, module: ast.Module, hits: dict[ast.AST, _MemoEntry]):
+        self.body = list(module.body)
+        self.hits = hits
+        kept = [stmt for stmt in self.body if stmt not in hits]
+        attributes = {k: v for k, v in module.__dict__.items() if k != "body"}
+        self.dumped = pickle.dumps((kept, attributes), pickle.HIGHEST_PROTOCOL)
+
+    def restore(self, module: ast.Module) -> None:
+        kept, attributes = pickle.loads(self.dumped)
+        kept_iter = iter(kept)
+        module.__dict__.clear()
+        module.__dict__.update(attributes)
+        module.body = [
+            stmt if stmt in self.hits else next(kept_iter) for stmt in self.body
+        ]
+
+
+class TransformMemo:
+    def __init__(self, max_entries: int = 4096):
+        self.entries: OrderedDict[bytes, _MemoEntry] = OrderedDict()
+        self.max_entries = max_entries
+
+    def transform(self, module: ast.Module, run: Callable[[], None]) -> int:
+        """
+        Run the transform of the module, reusing the functions in the memo.
+        Returns the number of the reused functions.
+        """
+        keyed = self._keyed_functions(module)
+        hits: dict[ast.AST, _MemoEntry] = {}
+        for node, k in keyed.items():
+            if (entry := self.entries.get(k.key)) is not None:
+                self.entries.move_to_end(k.key)
+                hits[node] = entry
+        debug_print(
+            lambda: f"Transform memo: {len(hits)} hits in {len(keyed)} functions"
+        )
+        try:
+            if hits and self._transform_with_hits(module, keyed, hits, run):
+                return len(hits)
+            footprints = {node: TopLevelFootprint(set()) for node in keyed}
+            set_top_level_footprints(module, footprints)
+            original_body = list(module.body)
+            run()
+            self._record(module, keyed, footprints, original_body)
+            return 0
+        finally:
+            clear_top_level_footprints(module)
+
+    def _keyed_functions(self, module: ast.Module) -> dict[ast.AST, _Keyed]:
+        outside = {id(module), *map(id, module.body)}
+        keyed: dict[ast.AST, _Keyed] = {}
+        seen: dict[bytes, ast.AST | None] = {}
+        for stmt in module.body:
+            if not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            line_range = _line_range(stmt)
+            dumped = _dump_relative(stmt, line_range, outside)
+            if dumped is None:
+                continue
+            key = hashlib.blake2b(dumped, digest_size=16).digest()
+            if key in seen:
+                # The same functions are not distinguished.
+                if (other := seen[key]) is not None:
+                    del keyed[other]
+                    seen[key] = None
+                continue
+            seen[key] = stmt
+            keyed[stmt] = _Keyed(key, line_range)
+        return keyed
+
+    def _transform_with_hits(
+        self,
+        module: ast.Module,
+        keyed: dict[ast.AST, _Keyed],
+        hits: dict[ast.AST, _MemoEntry],
+        run: Callable[[], None],
+    ) -> bool:
+        try:
+            backup = _ModuleBackup(module, hits)
+        except (pickle.PicklingError, TypeError, RecursionError) as e:
+            debug_print(lambda: f"Transform memo cannot back up the module: {e!r}")
+            return False
+        stubs: dict[TopLevelDef, TopLevelDef] = {}
+        footprints: dict[ast.AST, TopLevelFootprint] = {}
+        for index, stmt in enumerate(module.body):
+            if (
+                isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and (entry := hits.get(stmt)) is not None
+            ):
+                stub = _make_stub(stmt, entry)
+                module.body[index] = stub
+                stubs[stub] = stmt
+                footprints[stub] = TopLevelFootprint(set(entry.names))
+            elif stmt in keyed:
+                footprints[stmt] = TopLevelFootprint(set())
+        set_top_level_footprints(module, footprints)
+        if any(entry.requires_final for entry in hits.values()):
+            require_import_for_final(module)
+        original_body = list(module.body)
+        try:
+            run()
+        except Exception as e:
+            # Maybe by the stubs. Transform as a whole again.
+            debug_print(lambda: f"Transform memo failed with the stubs: {e!r}")
+            backup.restore(module)
+            return False
+        final_index = {id(stmt): index for index, stmt in enumerate(module.body)}
+        error_lines = self._error_lines(module)
+        for stub, node in stubs.items():
+            entry = hits[node]
+            footprint = footprints[stub]
+            if (
+                id(stub) not in final_index
+                or footprint.context != entry.context
+                or stub.name != entry.name
+                or get_scope_id(module, stub) != entry.scope_id
+                or error_lines is None
+                or _count_in_range(error_lines, keyed[node].line_range) > 0
+            ):
+                debug_print(
+                    lambda: f"Transform memo: {entry.name} in different context"
+                )
+                backup.restore(module)
+                return False
+        for stub, node in stubs.items():
+            entry = hits[node]
+            transformed = _load_relative(entry.transformed, node.lineno)
+            set_unparsed_text(transformed, entry.unparsed)
+            module.body[final_index[id(stub)]] = transformed
+            for generated, original in entry.generated_names.items():
+                add_generated_name_original(module, generated, original)
+        misses = {node: k for node, k in keyed.items() if node not in hits}
+        self._record(module, misses, footprints, original_body)
+        return True
+
+    def _error_lines(self, module: ast.Module) -> list[int] | None:
+        # None if some errors have no position.
+        lines: list[int] = []
+        for error in get_syntax_error_in_module(module) or []:
+            if error.lineno is None:
+                return None
+            lines.append(error.lineno)
+        return sorted(lines)
+
+    def _record(
+        self,
+        module: ast.Module,
+        keyed: dict[ast.AST, _Keyed],
+        footprints: dict[ast.AST, TopLevelFootprint],
+        original_body: list[ast.stmt],
+    ) -> None:
+        error_lines = self._error_lines(module)
+        if error_lines is None:
+            return
+        final_body = module.body
+        final_ids = {id(stmt) for stmt in final_body}
+        original_ids = {id(stmt) for stmt in original_body}
+        final_name = get_final_name()
+        generated = [stmt for stmt in final_body if id(stmt) not in original_ids]
+        generated_defs = {
+            name
+            for name in _defined_names(generated)
+            if is_reserved_typh_name(name) and name != final_name
+        }
+        # Generated from the functions, except the imports at the top.
+        generated_lines = sorted(
+            line
+            for stmt in generated
+            if not isinstance(stmt, (ast.Import, ast.ImportFrom))
+            and isinstance(line := getattr(stmt, "lineno", None), int)
+        )
+        name_map = get_generated_name_original_map(module)
+        outside = {id(module), *final_ids}
+        for node, k in keyed.items():
+            footprint = footprints.get(node)
+            if (
+                id(node) not in final_ids
+                or not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                or footprint is None
+                or footprint.context is None
+                or any(footprint.references.values())  # Mutation
+                or _count_in_range(error_lines, k.line_range) > 0
+                or _count_in_range(generated_lines, k.line_range) > 0
+            ):
+                continue
+            scope_id = get_scope_id(module, node)
+            identifiers = _identifiers(node)
+            if (
+                scope_id is None
+                or identifiers is None
+                or not identifiers.isdisjoint(generated_defs)
+                or any(
+                    is_builtin_name(name) and name != final_name for name in identifiers
+                )
+            ):
+                continue
+            transformed = _dump_relative(node, k.line_range, outside)
+            if transformed is None:
+                continue
+            entry = _MemoEntry(
+                transformed=transformed,
+                name=node.name,
+                scope_id=scope_id,
+                names=frozenset(footprint.names),
+                references=tuple(footprint.references),
+                context=footprint.context,
+                generated_names={
+                    name: name_map[name] for name in identifiers if name in name_map
+                },
+                requires_final=final_name in identifiers,
+                unparsed=UnparsedText(),
+            )
+            set_unparsed_text(node, entry.unparsed)
+            self.entries[k.key] = entry
+            self.entries.move_to_end(k.key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+_transform_memo = TransformMemo()
+
+
+def get_transform_memo() -> TransformMemo:
+    return _transform_memo
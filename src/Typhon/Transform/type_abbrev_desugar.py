@@ -32,11 +32,11 @@ class _GatherArrowType(TyphonASTVisitor):
         anonymous_args_name: dict[ast.arg, str] = {}
         for i, arg in enumerate(args):
             if len(arg.arg) == 0:
-                anonymous_args_name[arg] = self.new_anonymous_arg_name(node, i)
+                anonymous_args_name[arg] = self.new_anonymous_arg_name(i)
         self.func_types.append(
             (
                 node,
-                self.new_arrow_type_name(pretty_print_expr(node), node),
+                self.new_arrow_type_name(pretty_print_expr(node)),
                 anonymous_args_name,
             )
         )
@@ -4,7 +4,12 @@ from contextlib import contextmanager
 
 from Typhon.Grammar.pretty_printer import make_final_demangle_template
 
-from ._utils.imports import add_import_for_final, get_final, get_final_of_type
+from ._utils.imports import (
+    add_import_for_final,
+    get_final,
+    get_final_of_type,
+    is_import_for_final_required,
+)
 from ..Grammar.position import PosAttributes, get_pos_attributes
 from ..Grammar.typhon_ast import (
     DeclarableStmt,
@@ -457,6 +462,6 @@ def type_annotation_check_expand(module: ast.Module):
         expander = _PatternTypeAnnotationExpand(module, case_gather.annot_in_cases)
         expander.run()
         use_final |= expander.use_final
-    if use_final:
+    if use_final or is_import_for_final_required(module):
         final_name = add_import_for_final(module)
         add_generated_name_original(module, final_name, make_final_demangle_template())
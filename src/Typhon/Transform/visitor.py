@@ -16,6 +16,7 @@ from ..Grammar.typhon_ast import (
     set_control_comprehension_def,
     get_type_annotation,
     set_type_annotation,
+    may_be_extended_name,
 )
 from .name_generator import UniqueNameGenerator, PythonScope, NameKind
 from ..Grammar.syntax_errors import (
@@ -58,73 +59,54 @@ class _ScopeManagerMixin:
             return len(self.parent_python_scopes) == 2
         return len(self.parent_python_scopes) == 1
 
-    def new_func_literal_name(self, origin_node: ast.AST) -> str:
-        return self.name_gen.new_name_anonymous(
-            NameKind.FUNCTION_LITERAL,
-            anchored_node=origin_node,
-        )
+    def new_func_literal_name(self) -> str:
+        return self.name_gen.new_name_anonymous(NameKind.FUNCTION_LITERAL)
 
-    def new_control_comprehension_name(self, origin_node: ast.AST) -> str:
-        return self.name_gen.new_name_anonymous(
-            NameKind.CONTROL_COMPREHENSION,
-            anchored_node=origin_node,
-        )
+    def new_control_comprehension_name(self) -> str:
+        return self.name_gen.new_name_anonymous(NameKind.CONTROL_COMPREHENSION)
 
-    def new_anonymous_arg_name(self, origin_node: ast.AST, pos: int) -> str:
+    def new_anonymous_arg_name(self, pos: int) -> str:
         return self.name_gen.new_name_anonymous(
             NameKind.ARGUMENT,
-            anchored_node=origin_node,
             pretty_name=f"<arg {pos}>",
         )
 
-    def new_variable_rename_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_variable_rename_name(self, original_name: str) -> str:
         return self.name_gen.new_name_decl(
             NameKind.VARIABLE,
-            anchored_node=anchor_node,
             original_name=original_name,
         )
 
-    def new_temp_variable_name(
-        self,
-        origin_node: ast.AST,
-    ) -> str:
-        return self.name_gen.new_name_decl(
-            NameKind.VARIABLE,
-            anchored_node=origin_node,
-        )
+    def new_temp_variable_name(self) -> str:
+        return self.name_gen.new_name_decl(NameKind.VARIABLE)
 
-    def new_const_rename_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_const_rename_name(self, original_name: str) -> str:
         return self.name_gen.new_name_decl(
             NameKind.CONST,
-            anchored_node=anchor_node,
             original_name=original_name,
         )
 
-    def new_arrow_type_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_arrow_type_name(self, original_name: str) -> str:
         return self.name_gen.new_name_anonymous(
             NameKind.ARROW_TYPE,
-            anchored_node=anchor_node,
             pretty_name=original_name,
         )
 
-    def new_arg_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_arg_name(self, original_name: str) -> str:
         return self.name_gen.new_name_decl(
             NameKind.ARGUMENT,
-            anchored_node=anchor_node,
             original_name=original_name,
         )
 
-    def new_typevar_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_typevar_name(self, original_name: str) -> str:
         return self.name_gen.new_name_decl(
             NameKind.TYPEVAR,
-            anchored_node=anchor_node,
             original_name=original_name,
         )
 
-    def new_class_name(self, original_name: str, anchor_node: ast.AST) -> str:
+    def new_class_name(self, original_name: str) -> str:
         return self.name_gen.new_name_decl(
             NameKind.CLASS,
-            anchored_node=anchor_node,
             original_name=original_name,
         )
 
@@ -248,7 +230,7 @@ class _TyphonExtendedNodeTransformerMixin:
         visitor: ast.NodeVisitor | ast.NodeTransformer,
         otherwise: Callable[[ast.AST], ast.AST | list[ast.AST] | None],
     ):
-        if isinstance(node, ast.Name):
+        if isinstance(node, ast.Name) and may_be_extended_name(node):
             if is_function_literal(node):
                 visit = getattr(visitor, "visit_FunctionLiteral", visitor.generic_visit)
                 return visit(node)
@@ -268,7 +250,7 @@ class _TyphonExtendedNodeTransformerMixin:
         visitor: ast.NodeVisitor | ast.NodeTransformer,
         otherwise: Callable[[ast.AST], Any],
     ) -> ast.AST:
-        if isinstance(node, ast.Name):
+        if isinstance(node, ast.Name) and may_be_extended_name(node):
             if is_function_literal(node):
                 return self._visit_FunctionLiteral(node, visitor, False)
             elif is_function_type(node):
@@ -140,7 +140,7 @@ def filter_ignore_position(pos: Range) -> bool:
     )
 
 
-def _filter_ignore_diagnostics(
+def filter_ignore_diagnostics(
     result: TypeCheckResult,
 ) -> TypeCheckResult:
     filtered_diagnostics: list[Diagnostic] = []
@@ -177,14 +177,18 @@ def _filter_ignore_diagnostics(
 
 
 def run_pyright(
-    py_file_or_dir: Path, level: TypeCheckLevel = "translate"
+    py_file_or_dir: Path,
+    level: TypeCheckLevel = "translate",
+    files: list[Path] | None = None,
 ) -> TypeCheckResult:
+    # Only the given files are reported if any.
+    targets = files if files else [py_file_or_dir]
     output = subprocess.run(
         [
             sys.executable,
             "-m",
             "basedpyright",
-            str(py_file_or_dir),
+            *(str(target) for target in targets),
             "--outputjson",
         ],
         stdout=subprocess.PIPE,
@@ -194,4 +198,4 @@ def run_pyright(
     result = parse_json_output(
         output.stdout.decode(), output.returncode, output.stderr.decode()
     )
-    return _filter_ignore_diagnostics(result)
+    return filter_ignore_diagnostics(result)
@@ -0,0 +1,421 @@
+import asyncio
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from lsprotocol import types
+from pygls.lsp.client import LanguageClient
+from ..Driver.debugging import debug_print
+from .result_diagnostic import TypeCheckResult
+from .pyright import parse_json_output, filter_ignore_diagnostics
+
+# Long-lived basedpyright language server that serves type check requests over a
+# local socket. One daemon serves one directory where pyrightconfig.json is
+# written, and keeps stdlib/typeshed analysis warm across typhon invocations.
+
+DAEMON_STATE_FILE = ".typhon-checker.json"
+_CONFIG_FILE = "pyrightconfig.json"
+_IDLE_TIMEOUT_SEC = 600.0
+_CHECK_TIMEOUT_SEC = 120.0
+_STARTUP_TIMEOUT_SEC = 30.0
+_SETTLE_QUIET_SEC = 0.1
+
+_SEVERITY_NAMES = {
+    types.DiagnosticSeverity.Error: "error",
+    types.DiagnosticSeverity.Warning: "warning",
+    types.DiagnosticSeverity.Information: "info",
+}
+
+
+def _config_signature(root: Path) -> list[int]:
+    try:
+        stat = (root / _CONFIG_FILE).stat()
+    except FileNotFoundError:
+        return [0, 0]
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _target_files(target: Path) -> list[Path]:
+    if target.is_file():
+        return [target.resolve()]
+    return sorted(
+        file.resolve()
+        for file in target.rglob("*.py")
+        if "__pycache__" not in file.parts
+    )
+
+
+class _PyrightDaemon:
+    def __init__(self, root: Path, idle_timeout: float):
+        # Imported here because the LanguageServer package imports the Driver.
+        from ..LanguageServer.client.pyright import create_pyright_client
+
+        self.root = root.resolve()
+        self.idle_timeout = idle_timeout
+        self.token = secrets.token_hex(16)
+        self.config_signature = _config_signature(self.root)
+        self.client: LanguageClient = create_pyright_client()
+        self.versions: dict[str, int] = {}
+        self.paths: dict[str, Path] = {}
+        self.published: dict[str, types.PublishDiagnosticsParams] = {}
+        self.published_event = asyncio.Event()
+        # Diagnostics published during the analysis can be empty placeholders.
+        self.analyzing = False
+        self.check_lock = asyncio.Lock()
+        self.stop_event = asyncio.Event()
+        self.last_used = time.monotonic()
+
+        @self.client.feature(types.TEXT_DOCUMENT_PUBLISH_DIAGNOSTICS)  # type: ignore
+        def _on_publish_diagnostics(
+            ls_client: LanguageClient, params: types.PublishDiagnosticsParams
+        ):
+            self.published[params.uri] = params
+            self.published_event.set()
+
+        @self.client.feature("pyright/beginProgress")  # type: ignore
+        def _on_begin_progress(ls_client: LanguageClient, params: Any):
+            self.analyzing = True
+
+        @self.client.feature("pyright/endProgress")  # type: ignore
+        def _on_end_progress(ls_client: LanguageClient, params: Any):
+            self.analyzing = False
+            self.published_event.set()
+
+        @self.client.feature("pyright/reportProgress")  # type: ignore
+        def _on_report_progress(ls_client: LanguageClient, params: Any):
+            pass
+
+        @self.client.feature(types.WORKSPACE_CONFIGURATION)  # type: ignore
+        def _on_workspace_configuration(
+            ls_client: LanguageClient, params: types.ConfigurationParams
+        ):
+            # pyrightconfig.json in the root has all the settings.
+            return [None] * len(params.items)
+
+        @self.client.feature(types.WINDOW_LOG_MESSAGE)  # type: ignore
+        def _on_log_message(ls_client: LanguageClient, params: types.LogMessageParams):
+            debug_print(lambda: f"[Checker daemon backend] {params.message}")
+
+    async def start(self) -> None:
+        from ..LanguageServer.client.pyright import start_pyright_client
+
+        await start_pyright_client(self.client)
+        root_uri = self.root.as_uri()
+        await self.client.initialize_async(
+            types.InitializeParams(
+                process_id=os.getpid(),
+                root_uri=root_uri,
+                workspace_folders=[
+                    types.WorkspaceFolder(uri=root_uri, name=self.root.name)
+                ],
+                capabilities=types.ClientCapabilities(),
+            )
+        )
+        self.client.initialized(types.InitializedParams())
+
+    async def stop(self) -> None:
+        try:
+            await self.client.shutdown_async(None)
+            self.client.exit(None)
+            await self.client.stop()
+        except Exception as e:
+            debug_print(lambda: f"Error while stopping checker daemon backend: {e}")
+
+    def _sync_document(self, file: Path) -> tuple[str, int]:
+        uri = file.as_uri()
+        text = file.read_text(encoding="utf-8")
+        version = self.versions.get(uri, 0) + 1
+        if version == 1:
+            self.client.text_document_did_open(
+                types.DidOpenTextDocumentParams(
+                    text_document=types.TextDocumentItem(
+                        uri=uri, language_id="python", version=version, text=text
+                    )
+                )
+            )
+        else:
+            # Always bump the version even if unchanged, so that the diagnostics
+            # affected by the other files are published again.
+            self.client.text_document_did_change(
+                types.DidChangeTextDocumentParams(
+                    text_document=types.VersionedTextDocumentIdentifier(
+                        uri=uri, version=version
+                    ),
+                    content_changes=[
+                        types.TextDocumentContentChangeWholeDocument(text=text)
+                    ],
+                )
+            )
+        self.versions[uri] = version
+        self.paths[uri] = file
+        return uri, version
+
+    def _close_removed_documents(self) -> None:
+        for uri, path in list(self.paths.items()):
+            if not path.exists():
+                self.client.text_document_did_close(
+                    types.DidCloseTextDocumentParams(
+                        text_document=types.TextDocumentIdentifier(uri=uri)
+                    )
+                )
+                del self.versions[uri]
+                del self.paths[uri]
+                self.published.pop(uri, None)
+
+    def _is_settled(self, expected: dict[str, int]) -> bool:
+        if self.analyzing:
+            return False
+        for uri, version in expected.items():
+            published = self.published.get(uri)
+            if published is None or published.version != version:
+                return False
+        return True
+
+    async def check(self, target: Path, files: list[Path] | None) -> dict[str, Any]:
+        begin = time.perf_counter()
+        self._close_removed_documents()
+        targets = [file.resolve() for file in files] if files else _target_files(target)
+        expected = dict(self._sync_document(file) for file in targets)
+        async with asyncio.timeout(_CHECK_TIMEOUT_SEC):
+            while True:
+                while not self._is_settled(expected):
+                    self.published_event.clear()
+                    await self.published_event.wait()
+                # Placeholders can be followed by the analyzed ones shortly after.
+                self.published_event.clear()
+                try:
+                    async with asyncio.timeout(_SETTLE_QUIET_SEC):
+                        await self.published_event.wait()
+                except TimeoutError:
+                    break
+        general_diagnostics: list[dict[str, Any]] = []
+        counts = {"error": 0, "warning": 0, "info": 0}
+        for uri in expected:
+            file_path = str(self.paths[uri])
+            for diag in self.published[uri].diagnostics:
+                severity = _SEVERITY_NAMES.get(
+                    diag.severity or types.DiagnosticSeverity.Error
+                )
+                if severity is None:  # Hints such as unreachable code.
+                    continue
+                counts[severity] += 1
+                general_diagnostics.append(
+                    {
+                        "file": file_path,
+                        "severity": severity,
+                        "message": diag.message,
+                        "range": {
+                            "start": {
+                                "line": diag.range.start.line,
+                                "character": diag.range.start.character,
+                            },
+                            "end": {
+                                "line": diag.range.end.line,
+                                "character": diag.range.end.character,
+                            },
+                        },
+                        "rule": str(diag.code) if diag.code is not None else "",
+                    }
+                )
+        # Same shape as `basedpyright --outputjson`.
+        return {
+            "generalDiagnostics": general_diagnostics,
+            "summary": {
+                "filesAnalyzed": len(expected),
+                "errorCount": counts["error"],
+                "warningCount": counts["warning"],
+                "informationCount": counts["info"],
+                "timeInSec": time.perf_counter() - begin,
+            },
+        }
+
+    async def _handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request.get("token") != self.token:
+            return {"error": "invalid token"}
+        # Only the authorized requests keep the daemon alive.
+        self.last_used = time.monotonic()
+        command = request.get("command")
+        if command == "stop":
+            self.stop_event.set()
+            return {"stopped": True}
+        if command == "check":
+            if _config_signature(self.root) != self.config_signature:
+                # Restart to apply the new configuration.
+                self.stop_event.set()
+                return {"error": "configuration changed"}
+            async with self.check_lock:
+                files = [Path(file) for file in request.get("files", [])]
+                result = await self.check(Path(request["target"]), files)
+            self.last_used = time.monotonic()
+            return {"result": result}
+        return {"error": f"unknown command: {command}"}
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                response = await self._handle_request(request)
+            except Exception as e:
+                debug_print(lambda: f"Checker daemon request failed: {e}")
+                response = {"error": str(e)}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _watch_idle(self) -> None:
+        while not self.stop_event.is_set():
+            await asyncio.sleep(min(self.idle_timeout, 10.0))
+            if time.monotonic() - self.last_used > self.idle_timeout:
+                debug_print(lambda: f"Checker daemon for {self.root} is idle, exit.")
+                self.stop_event.set()
+
+    async def serve(self) -> None:
+        await self.start()
+        server = await asyncio.start_server(
+            self._handle_connection, host="127.0.0.1", port=0
+        )
+        port = server.sockets[0].getsockname()[1]
+        state_file = self.root / DAEMON_STATE_FILE
+        _write_state(
+            state_file, {"pid": os.getpid(), "port": port, "token": self.token}
+        )
+        idle_watcher = asyncio.create_task(self._watch_idle())
+        try:
+            await self.stop_event.wait()
+        finally:
+            idle_watcher.cancel()
+            server.close()
+            if _read_state(self.root).get("pid") == os.getpid():
+                state_file.unlink(missing_ok=True)
+            await self.stop()
+
+
+def _write_state(state_file: Path, state: dict[str, Any]) -> None:
+    # Readable only by the owner, as the state holds the token of the socket.
+    temp_file = state_file.with_name(f"{state_file.name}.{os.getpid()}.tmp")
+    temp_file.unlink(missing_ok=True)
+    fd = os.open(temp_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(json.dumps(state))
+    os.replace(temp_file, state_file)
+
+
+def _read_state(root: Path) -> dict[str, Any]:
+    try:
+        return json.loads((root / DAEMON_STATE_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def serve_pyright_daemon(root: Path, idle_timeout: float = _IDLE_TIMEOUT_SEC) -> None:
+    asyncio.run(_PyrightDaemon(root, idle_timeout).serve())
+
+
+def _send_request(
+    state: dict[str, Any], request: dict[str, Any], timeout: float
+) -> dict[str, Any]:
+    with socket.create_connection(
+        ("127.0.0.1", state["port"]), timeout=timeout
+    ) as conn:
+        conn.sendall(json.dumps({**request, "token": state["token"]}).encode() + b"\n")
+        with conn.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def spawn_pyright_daemon(root: Path) -> None:
+    args = [sys.executable, "-m", "Typhon", "checker_daemon", "serve", str(root)]
+    if sys.platform == "win32":
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+            | subprocess.DETACHED_PROCESS,
+        )
+    else:
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def _wait_daemon_state(root: Path, old_state: dict[str, Any]) -> dict[str, Any]:
+    deadline = time.monotonic() + _STARTUP_TIMEOUT_SEC
+    while time.monotonic() < deadline:
+        state = _read_state(root)
+        if state and state != old_state:
+            return state
+        time.sleep(0.05)
+    return {}
+
+
+def run_pyright_daemon(
+    py_file_or_dir: Path, files: list[Path] | None = None
+) -> TypeCheckResult | None:
+    """
+    Type check through the daemon for the directory containing the target.
+    Only the given files are reported if any.
+    Start the daemon if not running. Return None if the daemon is not available.
+    """
+    root = (
+        py_file_or_dir.parent if py_file_or_dir.is_file() else py_file_or_dir
+    ).resolve()
+    request = {
+        "command": "check",
+        "target": str(py_file_or_dir.resolve()),
+        "files": [str(file.resolve()) for file in files or []],
+    }
+    state = _read_state(root)
+    response: dict[str, Any] = {}
+    if state:
+        try:
+            response = _send_request(state, request, _CHECK_TIMEOUT_SEC)
+        except OSError as e:
+            debug_print(lambda: f"Checker daemon for {root} is not reachable: {e}")
+    if not response:
+        spawn_pyright_daemon(root)
+        state = _wait_daemon_state(root, state)
+        if not state:
+            debug_print(lambda: f"Checker daemon for {root} did not start.")
+            return None
+        try:
+            response = _send_request(state, request, _CHECK_TIMEOUT_SEC)
+        except OSError as e:
+            debug_print(lambda: f"Checker daemon for {root} is not reachable: {e}")
+            return None
+    if "result" not in response:
+        debug_print(lambda: f"Checker daemon for {root} failed: {response}")
+        return None
+    result = response["result"]
+    return filter_ignore_diagnostics(
+        parse_json_output(
+            json.dumps(result),
+            1 if result["summary"]["errorCount"] else 0,
+            "",
+        )
+    )
+
+
+def stop_pyright_daemon(root: Path) -> bool:
+    state = _read_state(root)
+    if not state:
+        return False
+    try:
+        _send_request(state, {"command": "stop"}, _STARTUP_TIMEOUT_SEC)
+    except OSError:
+        # Already dead. Remove the stale state.
+        (root / DAEMON_STATE_FILE).unlink(missing_ok=True)
+        return False
+    return True
@@ -54,7 +54,7 @@ class Diagnostic:
             file_path = source_map.source_file
             if origin_pos := source_map.unparsed_range_to_origin_range(self.pos):
                 pos = origin_pos
-            source_lines = source_map.source_code.splitlines()
+            source_lines = source_map.source_text.lines
         return Diagnostic(
             file_path=file_path,
             severity=self.severity,
@@ -147,5 +147,4 @@ def source_position_diagnostic(
     range_in_source = source_map.unparsed_range_to_origin_range(diag.pos)
     if range_in_source is None:
         return ""
-    source_lines = source_map.source_code.splitlines()
-    return positioned_source_code(source_lines, range_in_source)
+    return positioned_source_code(source_map.source_text.lines, range_in_source)
@@ -5,6 +5,8 @@ import os
 TYPHON_EXT = ".typh"
 TYPHON_TEMP_DIR = ".typhon"
 TYPHON_SERVER_TEMP_DIR = ".typhon-server"
+# Translation cache directory placed next to the translated files.
+TYPHON_CACHE_DIR = "__typhon_cache__"
 
 
 def default_output_dir(source: str) -> Path:
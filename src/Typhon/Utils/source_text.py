@@ -0,0 +1,78 @@
+import bisect
+import io
+from pathlib import Path
+from typing import Callable
+
+
+class SourceText:
+    """
+    Immutable source code shared by the tokenizer, parser, source map and
+    diagnostics, so that one translation reads and splits the file only once.
+    """
+
+    __slots__ = ("text", "path", "_line_starts", "_lines")
+
+    def __init__(self, text: str, path: str | None = None):
+        self.text = text
+        self.path = path
+        self._line_starts: list[int] | None = None
+        self._lines: list[str] | None = None
+
+    @staticmethod
+    def from_bytes(data: bytes, path: str | None = None) -> "SourceText":
+        text = data.decode("utf-8")
+        if "\r" in text:
+            # Universal newlines, as reading in text mode.
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return SourceText(text, path)
+
+    @staticmethod
+    def from_file(path: Path) -> "SourceText":
+        return SourceText.from_bytes(path.read_bytes(), path.as_posix())
+
+    @staticmethod
+    def of(source: "str | SourceText") -> "SourceText":
+        return source if isinstance(source, SourceText) else SourceText(source)
+
+    # Only the text is pickled. Lines are computed again on demand.
+    def __reduce__(self):
+        return (SourceText, (self.text, self.path))
+
+    @property
+    def line_starts(self) -> list[int]:
+        # Offsets of the start of each line delimited by "\n", as the tokenizer.
+        if self._line_starts is None:
+            starts = [0]
+            find = self.text.find
+            index = find("\n")
+            while index >= 0:
+                starts.append(index + 1)
+                index = find("\n", index + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    @property
+    def lines(self) -> list[str]:
+        # Same as text.splitlines(). Shared, must not be modified.
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    def line_with_ending(self, line: int) -> str:
+        # 0-based line including the line break.
+        starts = self.line_starts
+        if line + 1 < len(starts):
+            return self.text[starts[line] : starts[line + 1]]
+        return self.text[starts[line] :]
+
+    def offset(self, line: int, column: int) -> int:
+        # 0-based line and column to the offset in text.
+        return self.line_starts[line] + column
+
+    def position(self, offset: int) -> tuple[int, int]:
+        # Offset in text to 0-based line and column.
+        line = bisect.bisect_right(self.line_starts, offset) - 1
+        return line, offset - self.line_starts[line]
+
+    def line_reader(self) -> Callable[[], str]:
+        return io.StringIO(self.text).readline
@@ -8,9 +8,16 @@ from .Driver.debugging import (
     set_debug_first_error,
     set_debug_log_file,
 )
-from .Driver.run import run
-from .Driver.type_check import type_check
+from .Driver.run import run, run_many
+from .Driver.type_check import type_check, checker_daemon
+from .Driver.watch import watch
 from .Driver.language_server import language_server
+from .Driver.configs import (
+    set_translate_cache_enabled,
+    set_profile_format,
+    set_type_check_daemon_enabled,
+)
+from .Driver.profiling import print_profile_report, start_profiling
 
 
 def _setup_debug_mode():
@@ -37,15 +44,34 @@ def _setup_debug_mode():
             sys.argv.pop(index)  # Remove log file path
 
 
+def _setup_driver_options():
+    if "--no-cache" in sys.argv:
+        set_translate_cache_enabled(False)
+        sys.argv.remove("--no-cache")
+    if "--checker-daemon" in sys.argv:
+        set_type_check_daemon_enabled(True)
+        sys.argv.remove("--checker-daemon")
+    for arg in ("--profile", "--profile=text", "--profile=json"):
+        if arg in sys.argv:
+            set_profile_format("json" if arg.endswith("json") else "text")
+            # Trace the allocations from the start.
+            start_profiling()
+            sys.argv.remove(arg)
+
+
 def main():
     try:
         _setup_debug_mode()
+        _setup_driver_options()
         fire.Fire(
             {
                 "translate": translate,
                 "tr": tr,
                 "run": run,
+                "run_many": run_many,
                 "type_check": type_check,
+                "checker_daemon": checker_daemon,
+                "watch": watch,
                 "lsp": language_server,
             },
             name="typhon",
@@ -54,6 +80,8 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        print_profile_report()
 
 
 if __name__ == "__main__":
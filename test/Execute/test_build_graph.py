@@ -0,0 +1,101 @@
+import ast
+from dataclasses import replace
+from pathlib import Path
+import pytest
+
+from Typhon.Driver import translate as translate_module
+from Typhon.Driver.build_graph import BuildGraph, ModuleNode, extract_imports
+from Typhon.Driver.translate import translate_and_run_type_check_directory
+
+
+def test_extract_imports():
+    module = ast.parse(
+        "import os.path\nfrom .sub import a\nfrom ..up import b\nfrom . import c\n"
+    )
+    imports = extract_imports(module, "pkg.inner.mod", is_package=False)
+    assert {"os", "os.path"} <= imports
+    assert {"pkg.inner.sub", "pkg.inner.sub.a"} <= imports
+    assert {"pkg.up", "pkg.up.b"} <= imports
+    assert "pkg.inner.c" in imports
+
+
+def test_affected_sources_are_reverse_dependents():
+    graph = BuildGraph(
+        nodes={
+            "a": ModuleNode(key="1", imports=set(), diagnostics=[]),
+            "b": ModuleNode(key="1", imports={"pkg.a"}, diagnostics=[]),
+            "c": ModuleNode(key="1", imports={"pkg.b"}, diagnostics=[]),
+            "d": ModuleNode(key="1", imports=set(), diagnostics=[]),
+        },
+        module_names={"a": "pkg.a", "b": "pkg.b", "c": "pkg.c", "d": "pkg.d"},
+    )
+    module_names = {"a": "pkg.a", "b": "pkg.b", "c": "pkg.c", "d": "pkg.d"}
+    unchanged = {"a": "1", "b": "1", "c": "1", "d": "1"}
+    assert graph.affected_sources(unchanged, module_names) == set()
+    assert graph.affected_sources({**unchanged, "a": "2"}, module_names) == {
+        "a",
+        "b",
+        "c",
+    }
+    # Removed module affects its dependents.
+    del unchanged["a"]
+    assert graph.affected_sources(unchanged, module_names) == {"b", "c"}
+
+
+def test_rebuild_only_affected_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source_dir = tmp_path / "proj"
+    (source_dir / "sub").mkdir(parents=True)
+    (source_dir / "sub" / "a.typh").write_text(
+        "def f() -> int {\n    return 1\n}\n", encoding="utf-8"
+    )
+    (source_dir / "b.typh").write_text(
+        "from .sub.a import f\nlet x: int = f()\n", encoding="utf-8"
+    )
+    (source_dir / "c.typh").write_text("let y = 1\n", encoding="utf-8")
+    checked: list[list[str] | None] = []
+    original = translate_module.run_type_check
+
+    def run_type_check_spy(*args, **kwargs):
+        files = kwargs.get("files")
+        checked.append(sorted(f.name for f in files) if files else None)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(translate_module, "run_type_check", run_type_check_spy)
+    output_dir = tmp_path / ".typhon" / "proj"
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    (source_dir / "sub" / "a.typh").write_text(
+        "def f() -> int {\n    return 2\n}\n", encoding="utf-8"
+    )
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    # Whole directory at first, nothing when unchanged, then a.py and dependent b.py.
+    assert checked == [None, ["a.py", "b.py"]]
+
+
+def test_checker_failure_keeps_modules_to_check(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source_dir = tmp_path / "proj"
+    source_dir.mkdir()
+    (source_dir / "a.typh").write_text("let x = 1\n", encoding="utf-8")
+    (source_dir / "b.typh").write_text("let y = 1\n", encoding="utf-8")
+    checked: list[list[str] | None] = []
+    original = translate_module.run_type_check
+    crash = False
+
+    def run_type_check_spy(*args, **kwargs):
+        files = kwargs.get("files")
+        checked.append(sorted(f.name for f in files) if files else None)
+        result = original(*args, **kwargs)
+        return replace(result, returncode=2, diagnostics=[]) if crash else result
+
+    monkeypatch.setattr(translate_module, "run_type_check", run_type_check_spy)
+    output_dir = tmp_path / ".typhon" / "proj"
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    (source_dir / "a.typh").write_text("let x = 2\n", encoding="utf-8")
+    crash = True
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    crash = False
+    translate_and_run_type_check_directory(source_dir, output_dir)
+    # a.py is checked again after the checker failed on it.
+    assert checked == [None, ["a.py"], ["a.py"]]
@@ -0,0 +1,63 @@
+import json
+import socket
+import stat
+import sys
+from pathlib import Path
+
+from Typhon.Driver.configs import set_type_check_daemon_enabled
+from Typhon.Driver.translate import translate_and_run_type_check_file
+from Typhon.Driver.type_check import type_check
+from Typhon.Typing.pyright_daemon import DAEMON_STATE_FILE, stop_pyright_daemon
+
+
+def test_checker_daemon_type_check(tmp_path: Path):
+    source = tmp_path / "daemon_check.typh"
+    source.write_text('let user_id: int = "A"\n', encoding="utf-8")
+    output = tmp_path / ".typhon" / "daemon_check.py"
+    output.parent.mkdir()
+    set_type_check_daemon_enabled(True)
+    try:
+        first = translate_and_run_type_check_file(source, output)
+        state_file = output.parent / DAEMON_STATE_FILE
+        assert state_file.exists()
+        if sys.platform != "win32":
+            assert stat.S_IMODE(state_file.stat().st_mode) == 0o600
+        assert first.num_errors == 1
+        assert first.diagnostics[0].rule == "reportAssignmentType"
+        # Warm check reflects the changed source.
+        source.write_text("let user_id: int = 1\n", encoding="utf-8")
+        second = translate_and_run_type_check_file(source, output)
+        assert second.is_successful()
+    finally:
+        set_type_check_daemon_enabled(False)
+        stop_pyright_daemon(output.parent)
+
+
+def test_checker_daemon_type_check_command(tmp_path: Path):
+    checked = tmp_path / "checked.py"
+    checked.write_text("user_id: int = 1\n", encoding="utf-8")
+    set_type_check_daemon_enabled(True)
+    try:
+        type_check(checked.as_posix())
+        assert (tmp_path / DAEMON_STATE_FILE).exists()
+        assert not (tmp_path / "pyrightconfig.json").exists()
+    finally:
+        set_type_check_daemon_enabled(False)
+        stop_pyright_daemon(tmp_path)
+
+
+def test_checker_daemon_rejects_bad_request(tmp_path: Path):
+    checked = tmp_path / "checked.py"
+    checked.write_text("user_id: int = 1\n", encoding="utf-8")
+    set_type_check_daemon_enabled(True)
+    try:
+        type_check(checked.as_posix())
+        state = json.loads((tmp_path / DAEMON_STATE_FILE).read_text())
+        for line in [b"not json\n", b"\n", b'{"command": "check"}\n']:
+            with socket.create_connection(("127.0.0.1", state["port"])) as conn:
+                conn.sendall(line)
+                with conn.makefile("rb") as response:
+                    assert "error" in json.loads(response.readline())
+    finally:
+        set_type_check_daemon_enabled(False)
+        stop_pyright_daemon(tmp_path)
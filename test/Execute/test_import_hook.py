@@ -0,0 +1,62 @@
+import importlib
+import sys
+from pathlib import Path
+import pytest
+
+from Typhon.Driver.import_hook import (
+    install_import_hook,
+    typhon_cache_from_source,
+    uninstall_import_hook,
+)
+
+
+@pytest.fixture
+def typhon_import_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    install_import_hook()
+    yield tmp_path
+    uninstall_import_hook()
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("typh_pkg", "typh_mod", "shadowed"):
+            del sys.modules[name]
+
+
+def test_import_typhon_modules(typhon_import_dir: Path):
+    package = typhon_import_dir / "typh_pkg"
+    package.mkdir()
+    (package / "__init__.typh").write_text('let NAME = "pkg"\n', encoding="utf-8")
+    (package / "sub.typh").write_text(
+        "def double(x: int) -> int {\n    return x * 2\n}\n", encoding="utf-8"
+    )
+    (typhon_import_dir / "typh_mod.typh").write_text(
+        "from typh_pkg.sub import double\nlet VALUE = double(21)\n", encoding="utf-8"
+    )
+    typh_mod = importlib.import_module("typh_mod")
+    typh_pkg = importlib.import_module("typh_pkg")
+    assert typh_mod.VALUE == 42
+    assert typh_pkg.NAME == "pkg"
+    assert Path(typhon_cache_from_source(str(package / "sub.typh"))).exists()
+
+
+def test_bytecode_invalidated_by_source_change(typhon_import_dir: Path):
+    source = typhon_import_dir / "typh_mod.typh"
+    source.write_text("let VALUE = 1\n", encoding="utf-8")
+    assert importlib.import_module("typh_mod").VALUE == 1
+    pyc = Path(typhon_cache_from_source(str(source)))
+    first_pyc = pyc.read_bytes()
+    del sys.modules["typh_mod"]
+    # Same size in the same mtime tick, which timestamp-based pyc would miss.
+    source.write_text("let VALUE = 2\n", encoding="utf-8")
+    assert importlib.import_module("typh_mod").VALUE == 2
+    assert pyc.read_bytes() != first_pyc
+
+
+def test_python_module_precedes_typhon_module(typhon_import_dir: Path):
+    (typhon_import_dir / "shadowed.typh").write_text(
+        'let KIND = "typhon"\n', encoding="utf-8"
+    )
+    (typhon_import_dir / "shadowed.py").write_text(
+        'KIND = "python"\n', encoding="utf-8"
+    )
+    assert importlib.import_module("shadowed").KIND == "python"
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+import pytest
+
+from Typhon.Driver.configs import set_profile_format, set_translate_cache_enabled
+from Typhon.Driver.profiling import (
+    format_profile_report,
+    profile_phase,
+    take_profile_records,
+)
+from Typhon.Driver.translate import translate_file
+
+
+@pytest.fixture
+def profile_enabled():
+    take_profile_records()
+    set_profile_format("json")
+    yield
+    set_profile_format(None)
+    take_profile_records()
+
+
+def test_profile_translate_phases(tmp_path: Path, profile_enabled: None):
+    source = tmp_path / "a.typh"
+    source.write_text("let x = [1, 2, 3]\nprint(x)\n", encoding="utf-8")
+    set_translate_cache_enabled(False)
+    try:
+        translate_file(source, tmp_path / "a.py")
+    finally:
+        set_translate_cache_enabled(True)
+    records = take_profile_records()
+    assert [r.phase for r in records] == [
+        "read",
+        "cache_load",
+        "parse",
+        "transform",
+        "unparse",
+        "map",
+        "write",
+        "cache_store",
+    ]
+    assert all(r.file == source.as_posix() for r in records)
+    # No Typhon specific syntax to transform.
+    transform_record = records[3]
+    assert "record_to_dataclass" in transform_record.skipped
+    assert "func_literal_to_def" in transform_record.skipped
+    report = json.loads(format_profile_report(records, "json"))
+    assert len(report["phases"]) == len(records)
+    assert report["totals"]["parse"]["wall_sec"] >= 0
+
+
+def test_profile_nested_peak(profile_enabled: None):
+    with profile_phase("outer"):
+        with profile_phase("inner"):
+            data = bytearray(1 << 20)
+            del data
+        small = bytearray(1 << 10)
+        del small
+    inner, outer = take_profile_records()
+    assert inner.phase == "inner" and outer.phase == "outer"
+    # Peak of the inner phase is kept for the outer phase.
+    assert inner.peak_bytes >= 1 << 20
+    assert outer.peak_bytes >= inner.peak_bytes
+
+
+def test_profile_disabled_records_nothing():
+    take_profile_records()
+    with profile_phase("parse"):
+        pass
+    assert take_profile_records() == []
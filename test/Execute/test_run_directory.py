@@ -2,6 +2,7 @@ from pathlib import Path
 
 from Typhon.Driver.debugging import debug_print, set_debug_mode
 from Typhon.Driver.run import run_directory
+from Typhon.Driver.translate import translate_directory
 
 from .file_check_util import assert_file_stderr, assert_file_stdout
 
@@ -12,3 +13,28 @@ def test_typh_directory():
     debug_print(lambda: f"Test directory: {test_dir} result:\n{result}")
     assert_file_stdout(test_dir / "__main__.typh", result.stdout)
     assert_file_stderr(test_dir / "__main__.typh", result.stderr)
+
+
+def test_typh_directory_in_process():
+    test_dir = Path(__file__).parent / "RunDirTest" / "test_module"
+    result = run_directory(test_dir, True, in_process=True)
+    debug_print(lambda: f"Test directory: {test_dir} result:\n{result}")
+    assert result.returncode == 0
+    assert_file_stdout(test_dir / "__main__.typh", result.stdout)
+    assert_file_stderr(test_dir / "__main__.typh", result.stderr)
+
+
+def test_translate_directory_parallel(tmp_path: Path):
+    test_dir = Path(__file__).parent / "RunDirTest" / "test_module"
+    serial = translate_directory(test_dir, tmp_path / "serial" / "test_module")
+    parallel = translate_directory(
+        test_dir, tmp_path / "parallel" / "test_module", jobs=2
+    )
+    assert list(parallel.keys()) == list(serial.keys())
+    for source, result in parallel.items():
+        assert result.translated_code == serial[source].translated_code
+        assert result.source_map is not None
+        assert result.syntax_error is None
+        assert Path(result.output_path_canonical).read_text() == (
+            result.translated_code
+        )
@@ -2,7 +2,8 @@ from pathlib import Path
 import pytest
 
 from Typhon.Driver.debugging import debug_print
-from Typhon.Driver.run import run_file
+from Typhon.Driver import translate as translate_module
+from Typhon.Driver.run import run_file, run_files, run_many
 
 from .file_check_util import assert_file_stderr, assert_file_stdout
 
@@ -19,3 +20,37 @@ def test_typh_files(test_file: Path):
     assert result.returncode == 0
     assert_file_stdout(test_file, result.stdout)
     assert_file_stderr(test_file, result.stderr)
+
+
+@pytest.mark.parametrize("test_file", RUN_FILE_TESTS, ids=lambda p: p.name)
+def test_typh_files_in_process(test_file: Path):
+    result = run_file(test_file, True, in_process=True)
+    debug_print(lambda: f"Test file: {test_file} result:\n{result}")
+    assert result.returncode == 0
+    assert_file_stdout(test_file, result.stdout)
+    assert_file_stderr(test_file, result.stderr)
+
+
+def test_typh_files_batch(monkeypatch: pytest.MonkeyPatch):
+    checked: list[list[Path]] = []
+    original = translate_module.run_type_check_files
+
+    def run_type_check_files_spy(files: list[Path], *args, **kwargs):
+        checked.append(files)
+        return original(files, *args, **kwargs)
+
+    monkeypatch.setattr(
+        translate_module, "run_type_check_files", run_type_check_files_spy
+    )
+    results = run_files(RUN_FILE_TESTS, True, in_process=True)
+    # All the files are type checked in one checker run.
+    assert len(checked) == 1 and len(checked[0]) == len(RUN_FILE_TESTS)
+    for test_file in RUN_FILE_TESTS:
+        result = results[test_file]
+        assert result.returncode == 0
+        assert_file_stdout(test_file, result.stdout)
+        assert_file_stderr(test_file, result.stderr)
+
+
+def test_run_many_one_file():
+    run_many(RUN_FILE_TESTS[0].as_posix(), in_process=True)
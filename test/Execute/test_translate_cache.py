@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Any
+import shutil
+import pytest
+
+from Typhon.Driver import run as run_module
+from Typhon.Driver import translate as translate_module
+from Typhon.Driver.configs import set_translate_cache_enabled
+from Typhon.Driver.run import run_file
+from Typhon.Driver.translate import translate_file
+from Typhon.Utils.path import prepare_default_output_file
+from Typhon.Driver.translate_cache import (
+    code_cache_file,
+    translate_cache_file,
+    translate_cache_key,
+    load_code_cache,
+    load_translate_cache,
+)
+
+RUN_FILE_TEST_DIR = Path(__file__).parent / "RunFileTest"
+SYNTAX_ERROR_TEST_DIR = Path(__file__).parent / "SyntaxErrorTest"
+
+
+def _copy_source(source: Path, tmp_path: Path) -> tuple[Path, Path]:
+    copied = tmp_path / source.name
+    shutil.copy(source, copied)
+    return copied, tmp_path / (source.stem + ".py")
+
+
+def test_translate_cache_hit(tmp_path: Path):
+    source, output = _copy_source(RUN_FILE_TEST_DIR / "comprehension.typh", tmp_path)
+    first = translate_file(source, output)
+    assert first.translated_code is not None
+    assert translate_cache_file(output).exists()
+    key = translate_cache_key(source, source.read_bytes(), recover=True)
+    assert load_translate_cache(output, key) is not None
+
+    output.unlink()
+    second = translate_file(source, output)
+    assert second.translated_code == first.translated_code
+    assert output.read_text() == first.translated_code
+    assert second.source_map is not None
+    assert second.module is not None
+
+
+def test_translate_cache_invalidated_by_source_change(tmp_path: Path):
+    source, output = _copy_source(RUN_FILE_TEST_DIR / "hello.typh", tmp_path)
+    first = translate_file(source, output)
+    source.write_text(
+        source.read_text(encoding="utf-8") + '\nprint("changed")\n', encoding="utf-8"
+    )
+    second = translate_file(source, output)
+    assert second.translated_code != first.translated_code
+    assert second.translated_code is not None
+    assert 'print("changed")' in second.translated_code.replace("'", '"')
+
+
+def test_translate_cache_keeps_syntax_errors(tmp_path: Path):
+    source, output = _copy_source(SYNTAX_ERROR_TEST_DIR / "scope_errors.typh", tmp_path)
+    first = translate_file(source, output)
+    second = translate_file(source, output)
+    assert first.syntax_error is not None
+    assert second.syntax_error is not None
+    assert str(second.syntax_error) == str(first.syntax_error)
+
+
+def test_code_cache_for_in_process_run(tmp_path: Path):
+    source, _ = _copy_source(RUN_FILE_TEST_DIR / "hello.typh", tmp_path)
+    first = run_file(source, True, in_process=True)
+    output = prepare_default_output_file(source)
+    assert code_cache_file(output).exists()
+    key = translate_cache_key(source, source.read_bytes(), recover=True)
+    assert load_code_cache(output, key) is not None
+    second = run_file(source, True, in_process=True)
+    assert second == first
+    assert second.returncode == 0
+
+
+def test_in_process_run_translates_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source, _ = _copy_source(RUN_FILE_TEST_DIR / "hello.typh", tmp_path)
+    translated: list[Path] = []
+
+    def translate_file_spy(source: Path, output: Path, **kwargs: Any):
+        translated.append(source)
+        return translate_file(source, output, **kwargs)
+
+    monkeypatch.setattr(run_module, "translate_file", translate_file_spy)
+    monkeypatch.setattr(translate_module, "translate_file", translate_file_spy)
+    set_translate_cache_enabled(False)
+    try:
+        result = run_file(source, True, in_process=True)
+    finally:
+        set_translate_cache_enabled(True)
+    assert result.returncode == 0
+    assert translated == [source]
+
+
+def test_code_cache_for_source_changed_after_translation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source = tmp_path / "changed.typh"
+    source.write_text('print("A")\n', encoding="utf-8")
+
+    def translate_file_then_edit(source: Path, output: Path, **kwargs: Any):
+        result = translate_file(source, output, **kwargs)
+        # Saved between the translation and the compilation.
+        source.write_text('print("B")\n', encoding="utf-8")
+        return result
+
+    with monkeypatch.context() as patch:
+        patch.setattr(run_module, "translate_file", translate_file_then_edit)
+        first = run_file(source, True, in_process=True)
+    assert first.stdout == "A\n"
+    second = run_file(source, True, in_process=True)
+    assert second.stdout == "B\n"
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from Typhon.Driver.type_check import type_check
+
+
+def test_type_check_level_off(tmp_path: Path):
+    checked = tmp_path / "checked.py"
+    checked.write_text("user_id: int = 1\n", encoding="utf-8")
+    type_check(checked.as_posix(), level="off")
+    assert not (tmp_path / "pyrightconfig.json").exists()
+
+
+def test_type_check_writes_no_config(tmp_path: Path):
+    checked = tmp_path / "checked.py"
+    checked.write_text("user_id: int = 1\n", encoding="utf-8")
+    type_check(checked.as_posix())
+    assert not (tmp_path / "pyrightconfig.json").exists()
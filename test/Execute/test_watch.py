@@ -0,0 +1,68 @@
+import threading
+import time
+from pathlib import Path
+import pytest
+
+from Typhon.Driver.watch import watch_loop
+
+
+def test_watch_rebuilds_on_change(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    source_dir = tmp_path / "proj"
+    source_dir.mkdir()
+    source = source_dir / "a.typh"
+    source.write_text("let x = 1\n", encoding="utf-8")
+    output = tmp_path / ".typhon" / "proj"
+    watcher = threading.Thread(
+        target=watch_loop,
+        args=(source_dir, output),
+        kwargs={"interval": 0.05, "debounce": 0.05, "max_batches": 1},
+    )
+    watcher.start()
+    deadline = time.monotonic() + 60
+    while not (output / "a.py").exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    # Two writes in a burst are built as one batch.
+    source.write_text("let x = 2\n", encoding="utf-8")
+    source.write_text("let x = 30\n", encoding="utf-8")
+    watcher.join(timeout=120)
+    assert not watcher.is_alive()
+    assert "= 30" in (output / "a.py").read_text(encoding="utf-8")
+    out = capsys.readouterr().out
+    assert "[watch] Build succeeded for initial build" in out
+    assert "[watch] Build succeeded for 1 changed file(s)" in out
+
+
+def test_watch_survives_undecodable_file(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    source_dir = tmp_path / "proj"
+    source_dir.mkdir()
+    source = source_dir / "a.typh"
+    source.write_text("let x = 1\n", encoding="utf-8")
+    output = tmp_path / ".typhon" / "proj"
+    watcher = threading.Thread(
+        target=watch_loop,
+        args=(source_dir, output),
+        kwargs={"interval": 0.05, "debounce": 0.05, "max_batches": 2},
+    )
+    watcher.start()
+    deadline = time.monotonic() + 60
+    while not (output / "a.py").exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    broken = source_dir / "b.typh"
+    broken.write_bytes(b"let y = 1\xff\n")
+    deadline = time.monotonic() + 60
+    while (
+        "[watch] Build failed for 1 changed file(s)" not in capsys.readouterr().out
+        and time.monotonic() < deadline
+        and watcher.is_alive()
+    ):
+        time.sleep(0.05)
+    assert watcher.is_alive()
+    broken.write_text("let y = 2\n", encoding="utf-8")
+    watcher.join(timeout=120)
+    assert not watcher.is_alive()
+    assert "= 2" in (output / "b.py").read_text(encoding="utf-8")
+    assert "[watch] Build succeeded for 1 changed file(s)" in capsys.readouterr().out
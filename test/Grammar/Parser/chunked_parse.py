@@ -0,0 +1,124 @@
+import ast
+from pathlib import Path
+import pytest
+from Typhon.Grammar.parser import parse_file
+from Typhon.Grammar import chunked_parse
+from Typhon.Grammar.chunked_parse import (
+    parse_file_chunked,
+    split_chunks,
+    top_level_boundaries,
+)
+from Typhon.Grammar.syntax_errors import get_syntax_error_in_module
+from Typhon.Grammar.typhon_ast import get_anonymous_name_id
+from Typhon.Utils.source_text import SourceText
+
+_EXECUTE_DIR = Path(__file__).parents[2] / "Execute"
+CHUNKED_TEST_FILES = sorted(
+    [
+        *(_EXECUTE_DIR / "Syntax").rglob("*.typh"),
+        *(_EXECUTE_DIR / "RunFileTest").glob("*.typh"),
+        *(_EXECUTE_DIR / "SyntaxErrorTest").glob("*.typh"),
+    ]
+)
+
+
+def _dump(module: ast.Module) -> str:
+    errors = [(e.msg, e.lineno, e.offset) for e in get_syntax_error_in_module(module)]
+    dumped = ast.dump(module, include_attributes=True)
+    return f"{dumped}\n{errors}"
+
+
+@pytest.mark.parametrize("test_file", CHUNKED_TEST_FILES, ids=lambda p: p.name)
+def test_chunked_parse_same_as_normal(test_file: Path):
+    # Split at every boundary.
+    chunked = parse_file_chunked(test_file.as_posix(), jobs=1, chunk_lines=1)
+    assert _dump(chunked) == _dump(parse_file(test_file.as_posix()))
+
+
+top_level_boundaries_code = """@decorator
+def f(x: int) {
+    return x
+}
+# comment
+let s = \"\"\"
+multi
+\"\"\"
+var y = f(
+    1
+)
+"""
+
+
+def test_top_level_boundaries():
+    source_text = SourceText(top_level_boundaries_code)
+    assert top_level_boundaries(source_text) == [4, 8]
+    assert split_chunks([4, 8], 12, 1) == [(0, 4), (4, 8), (8, 12)]
+    assert split_chunks([4, 8], 12, 5) == [(0, 12)]
+    assert split_chunks([4, 8], 14, 5) == [(0, 8), (8, 14)]
+    assert top_level_boundaries(SourceText("def f() {\n}\n}\nlet x = 1\n")) == []
+
+
+def test_chunked_parse_in_processes(tmp_path: Path):
+    source = tmp_path / "chunks.typh"
+    source.write_text(top_level_boundaries_code * 3)
+    chunked = parse_file_chunked(source.as_posix(), jobs=2, chunk_lines=4)
+    assert _dump(chunked) == _dump(parse_file(source.as_posix()))
+
+
+anonymous_names_code = """let pairs = [(1, 2), (3, 4)]
+for (let (a, b) in pairs) {
+    print(a + b)
+}
+for (let (c, d) in pairs) {
+    for (let (e, f) in pairs) {
+        print(c + d + e + f)
+    }
+}
+"""
+
+
+def _anonymous_ids(stmt: ast.stmt) -> set[int]:
+    return {
+        anon_id
+        for node in ast.walk(stmt)
+        if isinstance(node, ast.Name)
+        and (anon_id := get_anonymous_name_id(node)) is not None
+    }
+
+
+def test_chunked_parse_anonymous_names(tmp_path: Path):
+    # Anonymous names are numbered in each chunk and then shifted.
+    source = tmp_path / "anonymous.typh"
+    source.write_text(anonymous_names_code)
+    chunked = parse_file_chunked(source.as_posix(), jobs=1, chunk_lines=1)
+    ids = [_anonymous_ids(stmt) for stmt in chunked.body]
+    assert ids == [set(), {0}, {1, 2}]
+    normal = parse_file(source.as_posix())
+    assert ids == [_anonymous_ids(stmt) for stmt in normal.body]
+
+
+def test_chunked_parse_late_chunk_positions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Each chunk is tokenized without the lines before it.
+    source = tmp_path / "late.typh"
+    source.write_text(
+        "".join(f"let x{i} = {i} #(block {i})# + f'{{x{i}}}'\n" for i in range(30))
+    )
+    source_text = SourceText.from_file(source)
+    chunk_texts: list[str] = []
+
+    def record_source_text(text: str, path: str | None = None) -> SourceText:
+        chunk_texts.append(text)
+        return SourceText(text, path)
+
+    monkeypatch.setattr(chunked_parse, "SourceText", record_source_text)
+    chunked = parse_file_chunked(
+        source.as_posix(), jobs=1, source_text=source_text, chunk_lines=10
+    )
+    assert [len(text.splitlines()) for text in chunk_texts] == [10, 10, 10]
+    assert [stmt.lineno for stmt in chunked.body] == list(range(1, 31))
+    last = chunked.body[-1]
+    assert isinstance(last, ast.Assign)
+    assert (last.value.lineno, last.value.col_offset) == (30, 10)
+    assert _dump(chunked) == _dump(parse_file(source.as_posix()))
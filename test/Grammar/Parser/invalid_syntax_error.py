@@ -1,10 +1,14 @@
+import ast
 from ..assertion_utils import (
+    first_error_test,
     assert_parse_first_error,
     with_parser_verbose,
     assert_parse_error_recovery,
     Range,
     Pos,
 )
+from Typhon.Grammar.parser import parse_string
+from Typhon.Grammar.syntax_errors import get_syntax_error_in_module
 
 
 invalid_as_pattern_code = """
@@ -504,3 +508,14 @@ def test_class_pattern_keyword_close_paren_recovery():
             ("expected ')'", Range(Pos(2, 28), Pos(2, 29))),
         ],
     )
+
+
+def test_syntax_error_registry():
+    with first_error_test(False):
+        valid = parse_string("let x = 1\nprint(x)\n")
+        invalid = parse_string("def f(x) {\n    return x\n}\nlet y = f(1\n")
+    assert isinstance(valid, ast.Module) and isinstance(invalid, ast.Module)
+    assert get_syntax_error_in_module(valid) == []
+    invalid_errors = get_syntax_error_in_module(invalid)
+    assert invalid_errors
+    assert invalid_errors == sorted(invalid_errors, key=lambda e: (e.lineno, e.offset))
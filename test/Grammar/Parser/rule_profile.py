@@ -0,0 +1,32 @@
+import ast
+import json
+from pathlib import Path
+from Typhon.Grammar.parser import parse_file
+from Typhon.Grammar.rule_profile import RuleProfiler
+
+_SOURCE = Path(__file__).parents[2] / "Execute" / "RunFileTest" / "comprehension.typh"
+
+
+def test_rule_profile_counts():
+    profiler = RuleProfiler()
+    profiled = parse_file(_SOURCE.as_posix(), rule_profiler=profiler)
+    assert ast.dump(profiled) == ast.dump(parse_file(_SOURCE.as_posix()))
+    stats = profiler.stats
+    assert stats["file"].calls == 1
+    assert stats["statement"].calls > 0
+    for rule_stats in stats.values():
+        assert rule_stats.memo_hits <= rule_stats.calls
+        assert rule_stats.failures <= rule_stats.calls - rule_stats.memo_hits
+        assert 0 <= rule_stats.self_sec
+    assert stats["file"].cumulative_sec >= stats["statement"].cumulative_sec
+
+
+def test_rule_profile_report():
+    profiler = RuleProfiler()
+    parse_file(_SOURCE.as_posix(), rule_profiler=profiler)
+    report = profiler.format_report("calls", limit=3)
+    assert len(report.splitlines()) == 4
+    records = json.loads(profiler.to_json("calls"))
+    assert [r["calls"] for r in records] == sorted(
+        (r["calls"] for r in records), reverse=True
+    )
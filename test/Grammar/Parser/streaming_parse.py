@@ -0,0 +1,27 @@
+import ast
+from pathlib import Path
+import pytest
+from Typhon.Grammar.parser import parse_file
+from Typhon.Grammar.syntax_errors import get_syntax_error_in_module
+
+_EXECUTE_DIR = Path(__file__).parents[2] / "Execute"
+STREAMING_TEST_FILES = sorted(
+    [
+        *(_EXECUTE_DIR / "Syntax").rglob("*.typh"),
+        *(_EXECUTE_DIR / "RunFileTest").glob("*.typh"),
+        *(_EXECUTE_DIR / "SyntaxErrorTest").glob("*.typh"),
+    ]
+)
+
+
+def _parse_result(file: Path, streaming: bool) -> str:
+    module = parse_file(file.as_posix(), streaming=streaming)
+    errors = [(e.msg, e.lineno, e.offset) for e in get_syntax_error_in_module(module)]
+    return f"{ast.dump(module, include_attributes=True)}\n{errors}"
+
+
+@pytest.mark.parametrize("test_file", STREAMING_TEST_FILES, ids=lambda p: p.name)
+def test_streaming_parse_same_as_normal(test_file: Path):
+    assert _parse_result(test_file, streaming=True) == _parse_result(
+        test_file, streaming=False
+    )
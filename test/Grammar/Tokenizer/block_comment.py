@@ -17,6 +17,8 @@ from tokenize import (
     FSTRING_END,
 )
 from Typhon.Driver.debugging import set_debug_verbose
+from Typhon.Grammar.tokenizer_custom import tokenizer_for_string
+from Typhon.Grammar.parser import parse_tokenizer
 
 block_comment_code = """
 let x = 10 #(comment in line)#
@@ -311,3 +313,55 @@ def test_string_inside_block_comment():
     aa.next(STRING, '" "', (2, 56), (2, 59))
     aa.next(NEWLINE, "\n", (2, 59), (2, 60))
     aa.next(ENDMARKER, "")
+
+
+block_comment_after_line_comment_code = """
+let x = 10 ## line comment
+let y = 20 ##(comment)## + x
+"""
+block_comment_after_line_comment_result = """
+x = 10
+y = 20 + x
+"""
+
+
+def test_block_comment_after_line_comment():
+    show_token(block_comment_after_line_comment_code)
+    ta = RawTokenStreamAsserter(block_comment_after_line_comment_code)
+    ta.next(NEWLINE, "\n")
+    ta.next(NAME, "let")
+    ta.next(NAME, "x")
+    ta.next(OP, "=")
+    ta.next(NUMBER, "10", (2, 8), (2, 10))
+    ta.next(COMMENT, "## line comment", (2, 11), (2, 26))
+    ta.next(NEWLINE, "\n", (2, 26), (2, 27))
+    ta.next(NAME, "let")
+    ta.next(NAME, "y")
+    ta.next(OP, "=")
+    ta.next(NUMBER, "20", (3, 8), (3, 10))
+    ta.next(COMMENT, "##(comment)##", (3, 11), (3, 24))
+    ta.next(OP, "+", (3, 25), (3, 26))
+    ta.next(NAME, "x")
+    ta.next(NEWLINE, "\n")
+    ta.next(ENDMARKER, "")
+    assert_parse(
+        block_comment_after_line_comment_code, block_comment_after_line_comment_result
+    )
+
+
+def test_block_comment_ranges_after_parse():
+    tokenizer = tokenizer_for_string(block_comment_after_line_comment_code)
+    parse_tokenizer(tokenizer)
+    comments = tokenizer.comment_tokens()
+    assert [(c.string, c.start, c.end) for c in comments] == [
+        ("## line comment", (2, 11), (2, 26)),
+        ("##(comment)##", (3, 11), (3, 24)),
+    ]
+    assert tokenizer.all_token_count() == len(tokenizer.read_all_tokens())
+
+
+def test_block_comment_multiline_ranges_after_parse():
+    tokenizer = tokenizer_for_string(block_comment_multiline_code)
+    parse_tokenizer(tokenizer)
+    comments = tokenizer.comment_tokens()
+    assert [(c.start, c.end) for c in comments] == [((2, 11), (5, 9))]
@@ -0,0 +1,42 @@
+from tokenize import NAME, OP, NEWLINE, COMMENT, TokenInfo
+from Typhon.Grammar.token_store import TokenStore
+
+token_store_tokens = [
+    TokenInfo(NAME, "let", (1, 0), (1, 3), "let x = y # c\n"),
+    TokenInfo(NAME, "x", (1, 4), (1, 5), "let x = y # c\n"),
+    TokenInfo(OP, "=", (1, 6), (1, 7), "let x = y # c\n"),
+    TokenInfo(NAME, "y", (1, 8), (1, 9), "let x = y # c\n"),
+    TokenInfo(COMMENT, "# c", (1, 10), (1, 13), "let x = y # c\n"),
+    TokenInfo(NEWLINE, "\n", (1, 13), (1, 14), "let x = y # c\n"),
+    TokenInfo(NAME, "x", (2, 0), (2, 1), "x\n"),
+]
+
+
+def test_token_store():
+    store = TokenStore()
+    for tok in token_store_tokens:
+        store.append(tok)
+    assert len(store) == len(token_store_tokens)
+    assert list(store) == token_store_tokens
+    assert store[3] == token_store_tokens[3]
+    assert store[-1] == token_store_tokens[-1]
+    assert store.type_at(4) == COMMENT
+    assert store.start_at(5) == (1, 13)
+    # Same names share the string.
+    assert store[1].string is store[6].string
+
+
+def test_token_store_evict():
+    store = TokenStore()
+    for tok in token_store_tokens:
+        store.append(tok)
+    store.evict_before(6)
+    assert store.first_index() == 6
+    assert len(store) == len(token_store_tokens)
+    assert store[6] == token_store_tokens[6]
+    assert list(store) == token_store_tokens[6:]
+    try:
+        store[5]
+        assert False, "evicted token must not be accessible"
+    except IndexError:
+        pass
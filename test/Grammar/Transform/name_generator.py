@@ -0,0 +1,32 @@
+import ast
+import base64
+import hashlib
+import pytest
+from Typhon.Transform.name_generator import NameKind, UniqueNameGenerator
+
+
+@pytest.mark.parametrize("original_name", ["", "x", "あ"])
+def test_short_hash_same_as_base32(original_name: str):
+    module = ast.parse("")
+    generator = UniqueNameGenerator(module)
+    with generator.name_scope(module):
+        name = generator.new_name_anonymous(
+            NameKind.VARIABLE, pretty_name=original_name
+        )
+    seed = f"VARIABLE$m${original_name}|VARIABLE_0${original_name}"
+    digest = hashlib.blake2b(seed.encode("utf-8"), digest_size=5).digest()
+    expected = base64.b32encode(digest).decode("ascii").rstrip("=").lower()
+    assert name == f"_typh_v_{expected}"
+
+
+def test_names_stable():
+    module = ast.parse("def f(a, b):\n    pass\n")
+    func = module.body[0]
+    generator = UniqueNameGenerator(module)
+    with generator.name_scope(module):
+        names = [generator.new_name_decl(NameKind.CONST, original_name="top")]
+        with generator.name_scope(func):
+            names.append(generator.new_name_decl(NameKind.VARIABLE, original_name="x0"))
+            names.append(generator.new_name_anonymous(NameKind.VARIABLE))
+    # Pinned, since the names are kept in caches across versions.
+    assert names == ["_typh_c_kmyo4o43_top", "_typh_v_tmkdj6ms_x0", "_typh_v_cohjml4u"]
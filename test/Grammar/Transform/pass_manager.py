@@ -0,0 +1,85 @@
+import ast
+from pathlib import Path
+import pytest
+from Typhon.Grammar.parser import parse_file, parse_string
+from Typhon.Grammar.syntax_errors import get_syntax_error_in_module
+from Typhon.Grammar.typhon_ast import (
+    SyntaxFeature,
+    get_generated_name_original_map,
+    get_syntax_features,
+)
+from Typhon.Grammar.unparse_custom import unparse_custom
+from Typhon.Transform.pass_manager import fuse_passes
+from Typhon.Transform.transform import TRANSFORM_PASSES, transform
+
+_EXECUTE_DIR = Path(__file__).parents[2] / "Execute"
+PASS_MANAGER_TEST_FILES = sorted(
+    [
+        *(_EXECUTE_DIR / "Syntax").rglob("*.typh"),
+        *(_EXECUTE_DIR / "RunFileTest").glob("*.typh"),
+        *(_EXECUTE_DIR / "SyntaxErrorTest").glob("*.typh"),
+    ]
+)
+
+
+def _transformed(test_file: Path | str, fused: bool) -> tuple[str, list, list]:
+    if isinstance(test_file, str):
+        module = parse_string(test_file)
+    else:
+        module = parse_file(test_file.as_posix())
+    assert isinstance(module, ast.Module)
+    try:
+        transform(module, ignore_error=True, fused=fused)
+    except SyntaxError as e:
+        # Some errors are raised even when ignored.
+        return repr(e), [], []
+    errors = [(e.msg, e.lineno, e.offset) for e in get_syntax_error_in_module(module)]
+    names = sorted(get_generated_name_original_map(module).items())
+    return unparse_custom(module), errors, names
+
+
+@pytest.mark.parametrize("test_file", PASS_MANAGER_TEST_FILES, ids=lambda p: p.name)
+def test_fused_same_as_sequential(test_file: Path):
+    assert _transformed(test_file, True) == _transformed(test_file, False)
+
+
+# Passes without the syntax are skipped and the rest fused differently.
+fused_same_as_sequential_codes = [
+    "{|x = 1, y = '2'|}\n",
+    "class C {\n    def f(xs: list[int]) {\n        return (for (let x in xs) yield x)\n    }\n}\n",
+    "class C {\n    def f() {\n        return (x: int) -> int => x + 1\n    }\n}\n",
+]
+
+
+@pytest.mark.parametrize("code", fused_same_as_sequential_codes)
+def test_fused_same_as_sequential_code(code: str):
+    assert _transformed(code, True) == _transformed(code, False)
+
+
+def test_fuse_passes():
+    groups = [[p.name for p in group] for group in fuse_passes(TRANSFORM_PASSES)]
+    assert groups[0] == ["check_forbidden_statements", "record_to_dataclass"]
+    assert ["insert_self_to_method", "comprehension_to_function"] in groups
+    # The comprehension rewrite moves the statements func_literal_to_def reads.
+    assert ["func_literal_to_def"] in groups
+    assert sum(len(group) for group in groups) == len(TRANSFORM_PASSES)
+
+
+syntax_features_code = """
+let r = {|a = 1, b = x?.y|}
+let f = (x: int) -> int => _ + x
+"""
+
+
+def test_syntax_features():
+    module = parse_string(syntax_features_code)
+    assert module is not None
+    assert get_syntax_features(module) == (
+        SyntaxFeature.RECORD
+        | SyntaxFeature.OPTIONAL_OPERATOR
+        | SyntaxFeature.FUNCTION_LITERAL
+        | SyntaxFeature.PLACEHOLDER
+    )
+    plain = parse_string("let x = [1, 2]\nprint(x)\n")
+    assert plain is not None
+    assert get_syntax_features(plain) == SyntaxFeature(0)
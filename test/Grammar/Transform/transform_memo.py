@@ -0,0 +1,132 @@
+import ast
+from pathlib import Path
+import pytest
+from Typhon.Grammar.parser import parse_file, parse_string
+from Typhon.Grammar.syntax_errors import get_syntax_error_in_module
+from Typhon.Grammar.typhon_ast import get_generated_name_original_map
+from Typhon.Grammar.unparse_custom import unparse_custom
+from Typhon.Transform.pass_manager import run_passes
+from Typhon.Transform.transform import TRANSFORM_PASSES, transform
+from Typhon.Transform.transform_memo import TransformMemo
+
+_EXECUTE_DIR = Path(__file__).parents[2] / "Execute"
+TRANSFORM_MEMO_TEST_FILES = sorted(
+    [
+        *(_EXECUTE_DIR / "Syntax").rglob("*.typh"),
+        *(_EXECUTE_DIR / "RunFileTest").glob("*.typh"),
+        *(_EXECUTE_DIR / "SyntaxErrorTest").glob("*.typh"),
+    ]
+)
+
+
+def _transformed(
+    test_file: Path | str, memo: TransformMemo | None = None
+) -> tuple[str, list, list, str]:
+    if isinstance(test_file, str):
+        module = parse_string(test_file)
+    else:
+        module = parse_file(test_file.as_posix())
+    assert isinstance(module, ast.Module)
+    try:
+        transform(module, ignore_error=True, memo=memo)
+    except SyntaxError as e:
+        # Some errors are raised even when ignored.
+        return repr(e), [], [], ""
+    errors = [(e.msg, e.lineno, e.offset) for e in get_syntax_error_in_module(module)]
+    names = sorted(get_generated_name_original_map(module).items())
+    dumped = ast.dump(module, include_attributes=True)
+    return unparse_custom(module), errors, names, dumped
+
+
+@pytest.mark.parametrize("test_file", TRANSFORM_MEMO_TEST_FILES, ids=lambda p: p.name)
+def test_memo_same_as_transform(test_file: Path):
+    expected = _transformed(test_file)
+    memo = TransformMemo()
+    assert _transformed(test_file, memo) == expected
+    # Reused functions.
+    assert _transformed(test_file, memo) == expected
+
+
+memo_code = """
+let scale = 3
+
+def double(x: int) -> int {
+    let y = x * 2
+    return y
+}
+
+def triple(x: int) -> int {
+    return x * scale
+}
+
+def both(xs: [int]) {
+    return (for (let x in xs) yield double(triple(x)))
+}
+
+print(list(both([1, 2])))
+"""
+
+
+def _hits(memo: TransformMemo, code: str) -> int:
+    module = parse_string(code)
+    assert isinstance(module, ast.Module)
+    return memo.transform(module, lambda: run_passes(module, TRANSFORM_PASSES))
+
+
+final_only_in_function_code = """
+def f(x: int) -> int {
+    let y = x
+    return y
+}
+
+def g() {
+}
+"""
+
+generic_function_code = """
+def first[T, *Ts, **P](x: T) -> T {
+    return x
+}
+
+def g() {
+}
+"""
+
+memo_edit_codes = [
+    # Lines shifted.
+    (memo_code, "# comment\n\n" + memo_code, 3),
+    # One function changed.
+    (memo_code, memo_code.replace("x * 2", "x * 4"), 2),
+    # Local name shadows the new declaration.
+    (memo_code, "let y = 1\n" + memo_code, 0),
+    # Referenced declaration changed.
+    (memo_code, memo_code.replace("let scale = 3", "var scale = 3"), 0),
+    # Declared twice.
+    (
+        memo_code,
+        memo_code.replace("let scale", "def double(x: int) {\n}\nlet scale"),
+        0,
+    ),
+    # Final is imported for the reused function.
+    (
+        final_only_in_function_code,
+        final_only_in_function_code.replace("{\n}", "{\n    print(1)\n}"),
+        1,
+    ),
+    # Stub of the generic function has the type parameters.
+    (
+        generic_function_code,
+        generic_function_code.replace("{\n}", "{\n    print(1)\n}"),
+        1,
+    ),
+]
+
+
+@pytest.mark.parametrize("base, code, hits", memo_edit_codes)
+def test_memo_edited(base: str, code: str, hits: int):
+    memo = TransformMemo()
+    assert _hits(memo, base) == 0
+    assert _hits(memo, code) == hits
+    memo = TransformMemo()
+    _transformed(base, memo)
+    assert _transformed(code, memo) == _transformed(code)
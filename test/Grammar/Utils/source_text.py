@@ -0,0 +1,32 @@
+import pickle
+from Typhon.Utils.source_text import SourceText
+
+crlf_source = b"let x = 1\r\nlet y = 2\r\n\r\nprint(x + y)"
+
+
+def test_source_text_from_bytes():
+    text = SourceText.from_bytes(crlf_source, "a.typh")
+    assert text.text == "let x = 1\nlet y = 2\n\nprint(x + y)"
+    assert text.lines == ["let x = 1", "let y = 2", "", "print(x + y)"]
+    assert text.line_starts == [0, 10, 20, 21]
+    assert text.line_with_ending(0) == "let x = 1\n"
+    assert text.line_with_ending(3) == "print(x + y)"
+
+
+def test_source_text_offset_position():
+    text = SourceText.from_bytes(crlf_source)
+    for offset in range(len(text.text)):
+        line, column = text.position(offset)
+        assert text.offset(line, column) == offset
+    assert text.position(text.offset(3, 6)) == (3, 6)
+    assert text.text[text.offset(1, 4)] == "y"
+
+
+def test_source_text_pickle():
+    text = SourceText.from_bytes(crlf_source, "a.typh")
+    assert text.lines
+    loaded = pickle.loads(pickle.dumps(text))
+    assert loaded.text == text.text
+    assert loaded.path == "a.typh"
+    assert loaded.lines == text.lines
+    assert SourceText.of(loaded) is loaded
@@ -169,6 +169,14 @@ def assert_tokens(
     assert_semantic_token(lines, next_token(), "function", "fun", 10, 4)
     assert_semantic_token(lines, next_token(), "parameter", "file", 10, 8)
     assert_semantic_token(lines, next_token(), "class", "Path", 10, 14)
+    assert_semantic_token(
+        lines,
+        next_token(),
+        "comment",
+        "#(Note this is executed in .typhon directory)#",
+        11,
+        4,
+    )
     assert_semantic_token(lines, next_token(), "variable", "f", 12, 14)
     assert_semantic_token(lines, next_token(), "function", "open", 12, 18)
     assert_semantic_token(lines, next_token(), "class", "str", 12, 23)
@@ -189,6 +197,7 @@ def assert_tokens(
     assert_semantic_token(lines, next_token(), "variable", "__file__", 18, 24)
     assert_semantic_token(lines, next_token(), "property", "parent", 18, 34)
     assert_semantic_token(lines, next_token(), "property", "parent", 18, 41)
+    assert_semantic_token(lines, next_token(), "comment", "# RunFileTest", 18, 48)
     assert_semantic_token(lines, next_token(), "variable", "my_dir", 19, 4)
     assert_semantic_token(lines, next_token(), "method", "exists", 19, 11)
     assert_semantic_token(lines, next_token(), "variable", "typh_path", 20, 8)
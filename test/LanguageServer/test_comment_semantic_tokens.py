@@ -0,0 +1,23 @@
+from Typhon.Grammar.parser import parse_tokenizer
+from Typhon.Grammar.tokenizer_custom import tokenizer_for_string
+from Typhon.LanguageServer.semantic_tokens import comment_semantic_tokens
+from Typhon.Utils.source_text import SourceText
+
+comment_code = """let x = 10 ## line comment
+let y = 20 #(block
+comment)# + x
+"""
+
+
+def test_comment_semantic_tokens() -> None:
+    tokenizer = tokenizer_for_string(comment_code)
+    parse_tokenizer(tokenizer)
+    tokens = comment_semantic_tokens(
+        tokenizer.comment_tokens(), SourceText(comment_code)
+    )
+    assert [(t.line, t.start_col, t.end_col, t.text) for t in tokens] == [
+        (0, 11, 26, "## line comment"),
+        (1, 11, 18, "#(block"),
+        (2, 0, 9, "comment)#"),
+    ]
+    assert all(t.tok_type == "comment" for t in tokens)